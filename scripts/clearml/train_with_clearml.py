@@ -3,25 +3,11 @@
 import argparse
 import json
 import os
-import pickle  # nosec B403
 import re
 import sys
 from pathlib import Path
-from typing import Any
 
-import pandas as pd
 import yaml
-from sklearn.base import BaseEstimator
-from sklearn.ensemble import (
-    AdaBoostRegressor,
-    GradientBoostingRegressor,
-    RandomForestRegressor,
-)
-from sklearn.linear_model import ElasticNet, Lasso, LinearRegression, Ridge
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-from sklearn.neighbors import KNeighborsRegressor
-from sklearn.svm import SVR
-from sklearn.tree import DecisionTreeRegressor
 
 # Загружаем credentials из конфигурационного файла, если переменные окружения не установлены
 if "CLEARML_API_ACCESS_KEY" not in os.environ:
@@ -57,6 +43,11 @@ sys.path.insert(0, str(project_root))
 
 from src.data_science_project.clearml_tracker import ClearMLTracker  # noqa: E402
 from src.data_science_project.config_models import TrainingConfig  # noqa: E402
+from src.data_science_project.data_io import load_xy  # noqa: E402
+from src.data_science_project.fit_cache import FitCache  # noqa: E402
+from src.data_science_project.metrics import regression_metrics  # noqa: E402
+from src.data_science_project.model_registry import get_model  # noqa: E402
+from src.data_science_project.model_store import save_model  # noqa: E402
 
 # Пути
 TRAIN_DATA = Path("data/processed/train.csv")
@@ -68,44 +59,11 @@ MODELS_DIR.mkdir(parents=True, exist_ok=True)
 (REPORTS_DIR / "metrics").mkdir(parents=True, exist_ok=True)
 
 
-def get_model(model_type: str, params: dict[str, Any]) -> BaseEstimator:
-    """
-    Создать модель по типу.
-
-    Args:
-        model_type: Тип модели
-        params: Параметры модели
-
-    Returns:
-        Объект модели scikit-learn
-    """
-    models = {
-        "linear": LinearRegression,
-        "ridge": Ridge,
-        "lasso": Lasso,
-        "elasticnet": ElasticNet,
-        "knn": KNeighborsRegressor,
-        "svr": SVR,
-        "dt": DecisionTreeRegressor,
-        "rf": RandomForestRegressor,
-        "ada": AdaBoostRegressor,
-        "gb": GradientBoostingRegressor,
-    }
-
-    if model_type not in models:
-        raise ValueError(f"Unknown model type: {model_type}")
-
-    model = models[model_type](**params)
-    if "random_state" in model.get_params() and "random_state" not in params:
-        model.set_params(random_state=42)
-
-    return model
-
-
 def train_with_clearml(
     config_file: Path,
     model_type: str | None = None,
     experiment_name: str | None = None,
+    use_cache: bool = True,
 ) -> None:
     """
     Обучить модель с трекингом в ClearML.
@@ -114,6 +72,7 @@ def train_with_clearml(
         config_file: Путь к файлу конфигурации
         model_type: Тип модели (переопределяет конфигурацию)
         experiment_name: Название эксперимента в ClearML
+        use_cache: Брать обученную модель из кэша обучения, если она там есть
     """
     # Загружаем конфигурацию
     with open(config_file) as f:
@@ -171,22 +130,19 @@ def train_with_clearml(
 
     # Загружаем данные
     print("📊 Загрузка данных для обучения...")
-    train_df = pd.read_csv(TRAIN_DATA)
-    test_df = pd.read_csv(TEST_DATA)
-
     data_config = training_config.data
-    target_col = data_config.target_column
-    feature_cols = data_config.feature_columns
-
-    X_train = train_df[feature_cols]
-    y_train = train_df[target_col]
-    X_test = test_df[feature_cols]
-    y_test = test_df[target_col]
+    X_train, y_train = load_xy(TRAIN_DATA, data_config)
+    X_test, y_test = load_xy(TEST_DATA, data_config)
 
     # Обучение модели
     print(f"🤖 Обучение модели: {model_type_final}...")
     model = get_model(model_type_final, model_params)
-    model.fit(X_train, y_train)
+    if use_cache:
+        fit_cache = FitCache(MODELS_DIR / "fit_cache")
+        model, _ = fit_cache.fit(model, X_train, y_train)
+        print(f"♻️  {fit_cache.summary()}")
+    else:
+        model.fit(X_train, y_train)
 
     # Предсказания
     y_pred_train = model.predict(X_train)
@@ -194,17 +150,13 @@ def train_with_clearml(
 
     # Метрики
     train_metrics = {
-        "train_mse": float(mean_squared_error(y_train, y_pred_train)),
-        "train_rmse": float(mean_squared_error(y_train, y_pred_train) ** 0.5),
-        "train_mae": float(mean_absolute_error(y_train, y_pred_train)),
-        "train_r2": float(r2_score(y_train, y_pred_train)),
+        f"train_{name}": value
+        for name, value in regression_metrics(y_train, y_pred_train).items()
     }
 
     test_metrics = {
-        "test_mse": float(mean_squared_error(y_test, y_pred_test)),
-        "test_rmse": float(mean_squared_error(y_test, y_pred_test) ** 0.5),
-        "test_mae": float(mean_absolute_error(y_test, y_pred_test)),
-        "test_r2": float(r2_score(y_test, y_pred_test)),
+        f"test_{name}": value
+        for name, value in regression_metrics(y_test, y_pred_test).items()
     }
 
     # Логируем метрики в ClearML
@@ -213,8 +165,7 @@ def train_with_clearml(
 
     # Сохраняем модель
     model_path = MODELS_DIR / f"{exp_name}_model.pkl"
-    with open(model_path, "wb") as f:
-        pickle.dump(model, f)  # nosec B301
+    model_format = save_model(model, model_path)
 
     # Регистрируем модель в ClearML
     tracker.log_model(
@@ -225,6 +176,7 @@ def train_with_clearml(
             "train_metrics": train_metrics,
             "test_metrics": test_metrics,
             "model_params": model_params,
+            "model_format": model_format,
         },
     )
 
@@ -265,6 +217,9 @@ def main() -> None:
     parser.add_argument("--config", type=str, default="config/train_params.yaml")
     parser.add_argument("--model-type", type=str, help="Тип модели")
     parser.add_argument("--experiment-name", type=str, help="Название эксперимента")
+    parser.add_argument(
+        "--no-fit-cache", action="store_true", help="Не использовать кэш обучения"
+    )
     args = parser.parse_args()
 
     config_file = Path(args.config)
@@ -275,6 +230,7 @@ def main() -> None:
         config_file=config_file,
         model_type=args.model_type,
         experiment_name=args.experiment_name,
+        use_cache=not args.no_fit_cache,
     )
 
 
@@ -0,0 +1,101 @@
+"""Бенчмарк загрузки выборок: CSV против бинарного колоночного формата."""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+from tabulate import tabulate
+
+# Добавляем корневую директорию в путь
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data_science_project.data_io import (  # noqa: E402
+    binary_paths,
+    load_binary,
+    save_split,
+)
+
+RAW_DATA = Path("data/raw/WineQT.csv")
+
+
+def _best_of(func: Any, repeats: int) -> float:
+    """Лучшее время выполнения функции из нескольких запусков (секунды)."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(scales: list[int], repeats: int = 3) -> list[dict[str, Any]]:
+    """
+    Измерить время загрузки CSV и бинарного формата.
+
+    Args:
+        scales: Множители размера относительно WineQT.csv
+        repeats: Количество повторов (берется лучшее время)
+
+    Returns:
+        Список результатов по каждому масштабу
+    """
+    base_df = pd.read_csv(RAW_DATA)
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for scale in scales:
+            df = pd.concat([base_df] * scale, ignore_index=True)
+            csv_path = Path(tmp_dir) / f"split_x{scale}.csv"
+            save_split(df, csv_path)
+            npz_path, _ = binary_paths(csv_path)
+
+            csv_time = _best_of(lambda p=csv_path: pd.read_csv(p), repeats)
+            binary_time = _best_of(lambda p=csv_path: load_binary(p), repeats)
+
+            results.append(
+                {
+                    "scale": scale,
+                    "rows": len(df),
+                    "csv_mb": csv_path.stat().st_size / 1024**2,
+                    "npz_mb": npz_path.stat().st_size / 1024**2,
+                    "csv_load_s": csv_time,
+                    "npz_load_s": binary_time,
+                    "speedup": csv_time / binary_time if binary_time > 0 else 0.0,
+                }
+            )
+            print(f"✅ x{scale}: CSV {csv_time:.4f}с, NPZ {binary_time:.4f}с")
+
+    return results
+
+
+def main() -> None:
+    """Главная функция."""
+    parser = argparse.ArgumentParser(
+        description="Бенчмарк загрузки выборок: CSV против NPZ"
+    )
+    parser.add_argument(
+        "--scales", type=int, nargs="+", default=[10, 100, 1000], help="Масштабы"
+    )
+    parser.add_argument("--repeats", type=int, default=3, help="Количество повторов")
+    parser.add_argument("--output", type=str, help="Путь для сохранения JSON")
+    args = parser.parse_args()
+
+    results = benchmark(args.scales, args.repeats)
+    print(tabulate(results, headers="keys", tablefmt="pipe", floatfmt=".4f"))
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"📊 Результаты сохранены: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
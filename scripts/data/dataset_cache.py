@@ -0,0 +1,86 @@
+"""CLI для локального кэша подготовленных данных."""
+
+import argparse
+import sys
+from pathlib import Path
+
+import yaml
+
+# Добавляем корневую директорию в путь
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data_science_project.config_models import TrainingConfig  # noqa: E402
+from src.data_science_project.dataset_cache import (  # noqa: E402
+    DatasetCache,
+    dataset_cache_key,
+)
+
+RAW_DATA = Path("data/raw/WineQT.csv")
+
+
+def cache_key(config_file: Path, raw_path: Path, streaming: bool = False) -> str:
+    """
+    Посчитать ключ кэша подготовки данных.
+
+    Args:
+        config_file: Путь к файлу конфигурации
+        raw_path: Путь к сырым данным
+        streaming: Ключ для потокового режима (всегда hash-разбиение)
+
+    Returns:
+        Ключ кэша
+    """
+    with open(config_file) as f:
+        config_dict = yaml.safe_load(f)
+
+    training_config = TrainingConfig(data=config_dict["data"])
+    data_config = training_config.data
+    if streaming:
+        data_config = data_config.model_copy(update={"split_method": "hash"})
+
+    return dataset_cache_key(raw_path, data_config)
+
+
+def main() -> None:
+    """Главная функция."""
+    parser = argparse.ArgumentParser(description="Кэш подготовленных данных")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    key_parser = subparsers.add_parser("key", help="Вывести ключ кэша")
+    key_parser.add_argument("--config", type=str, default="config/train_params.yaml")
+    key_parser.add_argument("--raw", type=str, default=str(RAW_DATA))
+    key_parser.add_argument(
+        "--streaming", action="store_true", help="Ключ для потокового режима"
+    )
+
+    status_parser = subparsers.add_parser("status", help="Проверить наличие в кэше")
+    status_parser.add_argument("--config", type=str, default="config/train_params.yaml")
+    status_parser.add_argument("--raw", type=str, default=str(RAW_DATA))
+    status_parser.add_argument("--streaming", action="store_true")
+
+    subparsers.add_parser("clear", help="Очистить кэш")
+    args = parser.parse_args()
+
+    cache = DatasetCache()
+    if args.command == "clear":
+        cache.clear()
+        print(f"🗑️  Кэш очищен: {cache.cache_dir}")
+        return
+
+    config_file = Path(args.config)
+    if not config_file.exists():
+        raise FileNotFoundError(f"Конфигурационный файл не найден: {config_file}")
+
+    key = cache_key(config_file, Path(args.raw), args.streaming)
+    if args.command == "key":
+        # Только ключ в stdout, чтобы его можно было использовать в других утилитах
+        print(key)
+    else:
+        status = "hit" if cache.has(key) else "miss"
+        print(f"{key} {status}")
+        sys.exit(0 if status == "hit" else 1)
+
+
+if __name__ == "__main__":
+    main()
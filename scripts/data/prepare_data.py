@@ -1,28 +1,496 @@
 """Скрипт для подготовки данных."""
 
 import argparse
+import hashlib
 import json
+import os
+from collections import Counter
+from collections.abc import Iterable
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
+import numpy as np
 import pandas as pd
 import yaml
-from sklearn.model_selection import train_test_split
 
-from src.data_science_project.config_models import TrainingConfig
+from src.data_science_project.config_models import DataConfig, TrainingConfig
+from src.data_science_project.data_io import (
+    SplitWriter,
+    append_checkpoint,
+    binary_paths,
+    load_matrix,
+    matrix_paths,
+    memory_per_row,
+    rollback_append,
+    save_matrix,
+    save_split,
+    split_columns,
+)
+from src.data_science_project.dataset_cache import DatasetCache, dataset_cache_key
+from src.data_science_project.profiler import ColumnProfiler
+from src.data_science_project.splitting import (
+    RowHashIndex,
+    hash_test_mask,
+    key_hashes,
+    row_hashes,
+)
 
 # Пути к данным
 RAW_DATA = Path("data/raw/WineQT.csv")
 PROCESSED_DIR = Path("data/processed")
 REPORTS_DIR = Path("reports")
 
+# Состояние последней подготовки (для инкрементального режима)
+STATE_FILE = PROCESSED_DIR / "prepare_state.json"
+ROW_HASHES_FILE = PROCESSED_DIR / "row_hashes.bin"
+TAIL_BYTES = 64 * 1024
 
-def prepare_data(config_file: Path) -> None:
+# Незавершенное инкрементальное дописывание: снимок выборок до него и
+# журнал добавленных в индекс хешей (удаляются после сохранения состояния)
+PENDING_FILE = PROCESSED_DIR / "prepare_pending.json"
+PENDING_HASHES_FILE = PROCESSED_DIR / "row_hashes.pending"
+
+# Кэш подготовленных данных вне DVC
+DATASET_CACHE = DatasetCache()
+
+
+def _output_files() -> dict[str, Path]:
+    """Все артефакты подготовки данных (для сохранения и восстановления из кэша)."""
+    files: dict[str, Path] = {}
+    for split in ("train", "test"):
+        csv_path = PROCESSED_DIR / f"{split}.csv"
+        for path in (csv_path, *binary_paths(csv_path), *matrix_paths(csv_path)):
+            files[path.name] = path
+    for path in (
+        STATE_FILE,
+        ROW_HASHES_FILE,
+        REPORTS_DIR / "metrics" / "data_stats.json",
+        REPORTS_DIR / "plots" / "data_distribution.json",
+    ):
+        files[path.name] = path
+    return files
+
+
+def _split_settings(data_config: DataConfig) -> dict[str, Any]:
+    """Параметры, от которых зависит сторона разбиения каждой строки."""
+    return {
+        "split_method": data_config.split_method,
+        "split_key": data_config.split_key,
+        "test_size": data_config.test_size,
+        "random_state": data_config.random_state,
+    }
+
+
+def _raw_tail_hash(offset: int) -> str:
+    """SHA-256 последних TAIL_BYTES байт сырого файла перед offset."""
+    start = max(0, offset - TAIL_BYTES)
+    with open(RAW_DATA, "rb") as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+def _save_state(data_config: DataConfig, summary: dict[str, Any], offset: int) -> None:
+    """
+    Сохранить состояние подготовки для последующих инкрементальных запусков.
+
+    Args:
+        data_config: Конфигурация данных
+        summary: Сводка подготовки
+        offset: Количество обработанных байт сырого файла
+    """
+    counts = summary["target_counts"]
+    state = {
+        "raw_path": str(RAW_DATA),
+        "offset": offset,
+        "tail_sha256": _raw_tail_hash(offset),
+        "split": _split_settings(data_config),
+        "columns": summary["columns"],
+        "train_size": summary["train_size"],
+        "test_size": summary["test_size"],
+        "total_size": summary["total_size"],
+        "target_counts": list(counts.items()) if counts is not None else None,
+        "bytes_per_row": summary["bytes_per_row"],
+        "profile": summary["profile"].state_dict(),
+    }
+    # Состояние заменяется атомарно: это точка фиксации инкрементального запуска
+    tmp_path = STATE_FILE.with_name(f".{STATE_FILE.name}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, STATE_FILE)
+
+
+def _begin_append(offset: int) -> None:
+    """
+    Записать снимок выборок до инкрементального дописывания.
+
+    Args:
+        offset: Смещение сырого файла в сохраненном состоянии
+    """
+    pending = {
+        "offset": offset,
+        "splits": {
+            split: append_checkpoint(PROCESSED_DIR / f"{split}.csv")
+            for split in ("train", "test")
+        },
+    }
+    PENDING_HASHES_FILE.write_bytes(b"")
+    tmp_path = PENDING_FILE.with_name(f".{PENDING_FILE.name}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(pending, f)
+    os.replace(tmp_path, PENDING_FILE)
+
+
+def _discard_pending() -> None:
+    """Удалить снимок и журнал дописывания (запуск зафиксирован или отменен)."""
+    PENDING_FILE.unlink(missing_ok=True)
+    PENDING_HASHES_FILE.unlink(missing_ok=True)
+
+
+def _recover_append() -> None:
+    """
+    Откатить дописывание, прерванное до сохранения состояния.
+
+    Если состояние еще указывает на смещение из снимка, выборки и матрицы
+    возвращаются к снимку, а добавленные хеши удаляются из индекса, поэтому
+    повторный запуск обработает те же строки заново. Если состояние уже
+    сохранено, запуск завершился и снимок просто удаляется.
+    """
+    if not PENDING_FILE.exists():
+        return
+    with open(PENDING_FILE) as f:
+        pending = json.load(f)
+    state_offset = None
+    if STATE_FILE.exists():
+        with open(STATE_FILE) as f:
+            state_offset = json.load(f)["offset"]
+    if state_offset == pending["offset"]:
+        print("⚠️  Откат прерванного инкрементального запуска")
+        for split, checkpoint in pending["splits"].items():
+            rollback_append(PROCESSED_DIR / f"{split}.csv", checkpoint)
+        if PENDING_HASHES_FILE.exists() and ROW_HASHES_FILE.exists():
+            RowHashIndex(ROW_HASHES_FILE).discard(
+                np.fromfile(PENDING_HASHES_FILE, dtype=np.uint64)
+            )
+    _discard_pending()
+
+
+def _stream_chunks(
+    chunks: Iterable[pd.DataFrame],
+    data_config: DataConfig,
+    train_writer: SplitWriter,
+    test_writer: SplitWriter,
+    hash_index: RowHashIndex,
+    profiler: ColumnProfiler | None = None,
+    journal: IO[bytes] | None = None,
+) -> tuple[list[str], Counter[Any], int, dict[str, float], ColumnProfiler]:
+    """
+    Разделить поток чанков на train/test с удалением дубликатов.
+
+    Дубликаты ищутся в индексе хешей строк, куда добавляются новые строки,
+    поэтому проверка чанка стоит O(размер чанка) независимо от числа
+    обработанных ранее строк.
+
+    Args:
+        chunks: Чанки сырых данных
+        data_config: Конфигурация данных
+        train_writer: Writer обучающей выборки
+        test_writer: Writer тестовой выборки
+        hash_index: Хеши строк, обработанных ранее (дополняется новыми)
+        profiler: Профиль предыдущих запусков, дополняемый новыми строками
+        journal: Файл, куда новые хеши записываются до добавления в индекс
+
+    Returns:
+        Кортеж (колонки, распределение целевой переменной, число новых строк,
+        память на строку при полном и компактном чтении, профиль колонок)
+    """
+    new_rows = 0
+    columns: list[str] = []
+    target_counts: Counter[Any] = Counter()
+    bytes_per_row = {"full": 0.0, "compact": 0.0}
+
+    for chunk in chunks:
+        if not columns:
+            columns = list(chunk.columns)
+            bytes_per_row = memory_per_row(chunk, data_config)
+        if profiler is None:
+            profiler = ColumnProfiler(list(chunk.select_dtypes("number").columns))
+
+        # Удаляем дубликаты внутри чанка и уже встреченные ранее
+        hashes = row_hashes(chunk)
+        keep = ~pd.Series(hashes).duplicated().to_numpy()
+        keep &= ~hash_index.contains(hashes)
+        chunk, hashes = chunk[keep], hashes[keep]
+        if journal is not None:
+            journal.write(hashes.tobytes())
+            journal.flush()
+        hash_index.add(hashes)
+        new_rows += len(hashes)
+
+        split_hashes = (
+            hashes
+            if data_config.split_key is None
+            else key_hashes(chunk, data_config.split_key)
+        )
+        test_mask = hash_test_mask(
+            split_hashes, data_config.test_size, data_config.random_state
+        )
+        train_writer.append(chunk[~test_mask])
+        test_writer.append(chunk[test_mask])
+        profiler.update_frame(chunk)
+
+        if data_config.target_column in chunk.columns:
+            target_counts.update(
+                chunk[data_config.target_column].value_counts().to_dict()
+            )
+
+    if profiler is None:
+        profiler = ColumnProfiler([])
+    hash_index.flush()
+    return columns, target_counts, new_rows, bytes_per_row, profiler
+
+
+def _prepare_in_memory(data_config: DataConfig) -> dict[str, Any]:
+    """
+    Подготовить данные целиком в памяти.
+
+    Args:
+        data_config: Конфигурация данных
+
+    Returns:
+        Сводка: размеры выборок, колонки и распределение целевой переменной
+    """
+    # Загружаем данные
+    print("📊 Загрузка данных...")
+    df = pd.read_csv(RAW_DATA)
+
+    # Базовая предобработка
+    print("🔧 Предобработка данных...")
+    # Удаляем дубликаты, если есть
+    df = df.drop_duplicates()
+    hashes = row_hashes(df)
+
+    # Разделяем на train/test
+    if data_config.split_method == "hash":
+        split_hashes = (
+            hashes
+            if data_config.split_key is None
+            else key_hashes(df, data_config.split_key)
+        )
+        test_mask = hash_test_mask(
+            split_hashes, data_config.test_size, data_config.random_state
+        )
+        train_df, test_df = df[~test_mask], df[test_mask]
+    else:
+        # Импорт sklearn занимает больше секунды, поэтому он выполняется только
+        # здесь: попадание в кэш и hash-разбиение обходятся без него
+        from sklearn.model_selection import train_test_split
+
+        train_df, test_df = train_test_split(
+            df,
+            test_size=data_config.test_size,
+            random_state=data_config.random_state,
+            stratify=(
+                df[data_config.target_column]
+                if data_config.stratify and data_config.target_column in df.columns
+                else None
+            ),
+        )
+
+    # Сохраняем обработанные данные
+    print("💾 Сохранение обработанных данных...")
+    save_split(train_df, PROCESSED_DIR / "train.csv")
+    save_split(test_df, PROCESSED_DIR / "test.csv")
+    RowHashIndex.create(ROW_HASHES_FILE, hashes).flush()
+
+    target_counts = None
+    if data_config.target_column in df.columns:
+        target_counts = df[data_config.target_column].value_counts().to_dict()
+
+    profiler = ColumnProfiler(list(df.select_dtypes("number").columns))
+    profiler.update_frame(df)
+
+    return {
+        "train_size": len(train_df),
+        "test_size": len(test_df),
+        "total_size": len(df),
+        "columns": list(df.columns),
+        "target_counts": target_counts,
+        "bytes_per_row": memory_per_row(df, data_config),
+        "profile": profiler,
+    }
+
+
+def _prepare_streaming(data_config: DataConfig, chunksize: int) -> dict[str, Any]:
+    """
+    Подготовить данные потоково, чанками по chunksize строк.
+
+    Дубликаты отбрасываются по индексу хешей строк, а сторона разбиения
+    определяется хешем строки (как split_method="hash" в памяти), поэтому
+    результат совпадает с in-memory путем для hash-разбиения.
+
+    Args:
+        data_config: Конфигурация данных (split_method="hash")
+        chunksize: Количество строк в чанке
+
+    Returns:
+        Сводка: размеры выборок, колонки и распределение целевой переменной
+    """
+    print(f"📊 Потоковая обработка данных (chunksize={chunksize})...")
+    train_writer = SplitWriter(PROCESSED_DIR / "train.csv")
+    test_writer = SplitWriter(PROCESSED_DIR / "test.csv")
+    try:
+        columns, target_counts, total_size, bytes_per_row, profiler = _stream_chunks(
+            pd.read_csv(RAW_DATA, chunksize=chunksize),
+            data_config,
+            train_writer,
+            test_writer,
+            RowHashIndex.create(ROW_HASHES_FILE),
+        )
+    finally:
+        train_writer.close()
+        test_writer.close()
+
+    return {
+        "train_size": train_writer.n_rows,
+        "test_size": test_writer.n_rows,
+        "total_size": total_size,
+        "columns": columns,
+        "target_counts": (
+            dict(target_counts) if data_config.target_column in columns else None
+        ),
+        "bytes_per_row": bytes_per_row,
+        "profile": profiler,
+    }
+
+
+def _prepare_incremental(data_config: DataConfig, chunksize: int) -> dict[str, Any]:
+    """
+    Обработать только строки, дописанные в сырой файл с прошлого запуска.
+
+    Новые строки дописываются к существующим train/test; сторона каждой
+    строки определяется только ее ключом, поэтому результат совпадает с
+    полной подготовкой с тем же hash-разбиением. Проверка дубликатов, запись
+    CSV, частей .npz и строк матриц признаков пропорциональны числу новых
+    строк; от размера выборок зависит только хеш содержимого CSV в их
+    отпечатках (последовательное чтение без разбора).
+
+    Args:
+        data_config: Конфигурация данных
+        chunksize: Количество строк в чанке
+
+    Returns:
+        Сводка: размеры выборок, колонки и распределение целевой переменной
+    """
+    outputs = (
+        STATE_FILE,
+        ROW_HASHES_FILE,
+        PROCESSED_DIR / "train.csv",
+        PROCESSED_DIR / "test.csv",
+    )
+    if not all(path.exists() for path in outputs):
+        raise ValueError(
+            "Нет состояния предыдущей подготовки: запустите без --incremental"
+        )
+    with open(STATE_FILE) as f:
+        state = json.load(f)
+
+    if "profile" not in state:
+        raise ValueError("Состояние устарело: запустите без --incremental")
+    if data_config.split_method != "hash":
+        raise ValueError("Инкрементальный режим требует split_method=hash")
+    if state["split"] != _split_settings(data_config):
+        raise ValueError("Параметры разбиения изменились: запустите без --incremental")
+
+    offset = state["offset"]
+    raw_size = RAW_DATA.stat().st_size
+    if raw_size < offset or _raw_tail_hash(offset) != state["tail_sha256"]:
+        raise ValueError(
+            "Сырые данные изменены не только дописыванием: запустите без "
+            "--incremental"
+        )
+
+    target_counts: Counter[Any] = Counter()
+    if state["target_counts"] is not None:
+        target_counts.update(dict(map(tuple, state["target_counts"])))
+    summary = {
+        "train_size": state["train_size"],
+        "test_size": state["test_size"],
+        "total_size": state["total_size"],
+        "columns": state["columns"],
+        "target_counts": (
+            dict(target_counts) if state["target_counts"] is not None else None
+        ),
+        "bytes_per_row": state["bytes_per_row"],
+        "profile": ColumnProfiler.from_state_dict(state["profile"]),
+    }
+    if raw_size == offset:
+        print("✅ Новых строк нет")
+        return summary
+
+    try:
+        hash_index = RowHashIndex(ROW_HASHES_FILE)
+    except ValueError:
+        raise ValueError("Состояние устарело: запустите без --incremental") from None
+
+    print(f"📊 Инкрементальная обработка {raw_size - offset} новых байт...")
+    matrix_config = (
+        data_config
+        if set(split_columns(data_config)) <= set(state["columns"])
+        else None
+    )
+    # Снимок до первой записи: при сбое до сохранения состояния следующий
+    # запуск откатит выборки и индекс (_recover_append)
+    _begin_append(offset)
+    train_writer = SplitWriter(
+        PROCESSED_DIR / "train.csv", append=True, matrix_config=matrix_config
+    )
+    test_writer = SplitWriter(
+        PROCESSED_DIR / "test.csv", append=True, matrix_config=matrix_config
+    )
+    try:
+        with open(RAW_DATA, "rb") as raw, open(PENDING_HASHES_FILE, "ab") as journal:
+            raw.seek(offset)
+            _, new_counts, new_rows, _, _ = _stream_chunks(
+                pd.read_csv(
+                    raw, header=None, names=state["columns"], chunksize=chunksize
+                ),
+                data_config,
+                train_writer,
+                test_writer,
+                hash_index,
+                profiler=summary["profile"],
+                journal=journal,
+            )
+    finally:
+        train_writer.close()
+        test_writer.close()
+
+    if summary["target_counts"] is not None:
+        target_counts.update(new_counts)
+        summary["target_counts"] = dict(target_counts)
+    summary["train_size"] += train_writer.n_rows
+    summary["test_size"] += test_writer.n_rows
+    summary["total_size"] += new_rows
+    print(f"  Добавлено уникальных строк: {new_rows}")
+    return summary
+
+
+def prepare_data(
+    config_file: Path,
+    streaming: bool = False,
+    chunksize: int = 100_000,
+    incremental: bool = False,
+    use_cache: bool = True,
+) -> None:
     """
     Подготовить данные.
 
     Args:
         config_file: Путь к файлу конфигурации
+        streaming: Потоковая обработка с ограниченной памятью
+        chunksize: Количество строк в чанке для потоковой обработки
+        incremental: Обработать только новые строки сырого файла
+        use_cache: Использовать локальный кэш подготовленных данных
     """
     # Создаем директории
     PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
@@ -44,40 +512,61 @@ def prepare_data(config_file: Path) -> None:
     training_config = TrainingConfig(**training_config_dict)
 
     data_config = training_config.data
+    if streaming and not incremental and data_config.split_method != "hash":
+        # До ключа кэша: он должен описывать фактическое разбиение
+        print("⚠️  Потоковый режим использует hash-разбиение (split_method=hash)")
+        data_config = data_config.model_copy(update={"split_method": "hash"})
 
-    # Загружаем данные
-    print("📊 Загрузка данных...")
-    df = pd.read_csv(RAW_DATA)
+    if incremental:
+        _recover_append()
+    else:
+        # Полный запуск перезаписывает все; без состояния прерванный полный
+        # запуск не станет основой для --incremental
+        _discard_pending()
+        STATE_FILE.unlink(missing_ok=True)
 
-    # Базовая предобработка
-    print("🔧 Предобработка данных...")
-    # Удаляем дубликаты, если есть
-    df = df.drop_duplicates()
+    # Инкрементальный режим не хеширует весь сырой файл и не использует кэш
+    cache_key = None
+    if use_cache and not incremental:
+        cache_key = dataset_cache_key(RAW_DATA, data_config)
+        if DATASET_CACHE.restore(cache_key, _output_files()):
+            print(f"⚡ Данные восстановлены из кэша: {cache_key}")
+            return
 
-    # Разделяем на train/test
-    train_df, test_df = train_test_split(
-        df,
-        test_size=data_config.test_size,
-        random_state=data_config.random_state,
-        stratify=(
-            df[data_config.target_column]
-            if data_config.stratify and data_config.target_column in df.columns
-            else None
-        ),
-    )
+    offset = RAW_DATA.stat().st_size
+    if incremental:
+        summary = _prepare_incremental(data_config, chunksize)
+    elif streaming:
+        summary = _prepare_streaming(data_config, chunksize)
+    else:
+        summary = _prepare_in_memory(data_config)
+    _save_state(data_config, summary, offset)
+    _discard_pending()
 
-    # Сохраняем обработанные данные
-    print("💾 Сохранение обработанных данных...")
-    train_df.to_csv(PROCESSED_DIR / "train.csv", index=False)
-    test_df.to_csv(PROCESSED_DIR / "test.csv", index=False)
+    # Матрицы признаков для memory-map загрузки в стадиях обучения
+    # (инкрементальный режим дописывает строки в актуальные матрицы сам)
+    if set(split_columns(data_config)) <= set(summary["columns"]):
+        for split in ("train", "test"):
+            csv_path = PROCESSED_DIR / f"{split}.csv"
+            if not incremental or load_matrix(csv_path, data_config) is None:
+                save_matrix(csv_path, data_config)
 
     # Сохраняем статистику
+    full_bytes = summary["bytes_per_row"]["full"] * summary["total_size"]
+    compact_bytes = summary["bytes_per_row"]["compact"] * summary["total_size"]
     stats = {
-        "train_size": len(train_df),
-        "test_size": len(test_df),
-        "total_size": len(df),
-        "features": list(df.columns),
+        "train_size": summary["train_size"],
+        "test_size": summary["test_size"],
+        "total_size": summary["total_size"],
+        "features": summary["columns"],
         "target": data_config.target_column,
+        "memory": {
+            "feature_dtype": data_config.feature_dtype,
+            "full_bytes": int(full_bytes),
+            "compact_bytes": int(compact_bytes),
+            "reduction": 1 - compact_bytes / full_bytes if full_bytes else 0.0,
+        },
+        "profile": summary["profile"].to_dict(),
     }
 
     with open(REPORTS_DIR / "metrics" / "data_stats.json", "w") as f:
@@ -85,10 +574,8 @@ def prepare_data(config_file: Path) -> None:
 
     # Создаем данные для графика распределения
     distribution_data: dict[str, Any]
-    if data_config.target_column in df.columns:
-        distribution = (
-            df[data_config.target_column].value_counts().sort_index().to_dict()
-        )
+    if summary["target_counts"] is not None:
+        distribution = dict(sorted(summary["target_counts"].items()))
         distribution_data = {
             data_config.target_column: list(distribution.keys()),
             "count": list(distribution.values()),
@@ -101,22 +588,47 @@ def prepare_data(config_file: Path) -> None:
     with open(REPORTS_DIR / "plots" / "data_distribution.json", "w") as f:
         json.dump(distribution_data, f, indent=2)
 
+    if cache_key is not None:
+        DATASET_CACHE.store(cache_key, _output_files())
+
     print("✅ Данные подготовлены!")
-    print(f"  Train: {len(train_df)} записей")
-    print(f"  Test: {len(test_df)} записей")
+    print(f"  Train: {summary['train_size']} записей")
+    print(f"  Test: {summary['test_size']} записей")
 
 
 def main() -> None:
     """Главная функция."""
     parser = argparse.ArgumentParser(description="Подготовка данных")
     parser.add_argument("--config", type=str, default="config/train_params.yaml")
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Потоковая обработка чанками (для файлов больше памяти)",
+    )
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Строк в чанке")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Обработать только строки, дописанные в сырой файл с прошлого запуска",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Не использовать локальный кэш подготовленных данных",
+    )
     args = parser.parse_args()
 
     config_file = Path(args.config)
     if not config_file.exists():
         raise FileNotFoundError(f"Конфигурационный файл не найден: {config_file}")
 
-    prepare_data(config_file)
+    prepare_data(
+        config_file,
+        streaming=args.streaming,
+        chunksize=args.chunksize,
+        incremental=args.incremental,
+        use_cache=not args.no_cache,
+    )
 
 
 if __name__ == "__main__":
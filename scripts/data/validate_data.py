@@ -1,21 +1,35 @@
 """Скрипт для валидации данных."""
 
 import argparse
+import copy
 import json
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
-import numpy as np
 import pandas as pd
 import yaml
 
-from src.data_science_project.config_models import TrainingConfig
+from src.data_science_project.config_models import DataConfig, TrainingConfig
+from src.data_science_project.data_io import load_split
+from src.data_science_project.dataset_cache import DatasetCache
+from src.data_science_project.drift import drift_report
 from src.data_science_project.pipeline_monitor import PipelineMonitor
+from src.data_science_project.profiler import ColumnProfiler, load_profile
+from src.data_science_project.validation import (
+    validate_chunks,
+    validate_frame,
+    validation_cache_key,
+)
 
 # Пути
 TRAIN_DATA = Path("data/processed/train.csv")
 TEST_DATA = Path("data/processed/test.csv")
 REPORTS_DIR = Path("reports")
+VALIDATION_FILE = REPORTS_DIR / "metrics" / "data_validation.json"
+
+# Кэш результатов валидации: повторная проверка тех же данных не нужна
+VALIDATION_CACHE = DatasetCache("data/interim/validation_cache")
 
 # Создаем директории
 (REPORTS_DIR / "metrics").mkdir(parents=True, exist_ok=True)
@@ -24,12 +38,125 @@ REPORTS_DIR = Path("reports")
 monitor = PipelineMonitor()
 
 
-def validate_data(config_file: Path) -> dict[str, bool]:
+def _validate_split(
+    csv_path: Path, data_config: DataConfig
+) -> tuple[dict[str, bool], dict[str, Any], ColumnProfiler]:
+    """
+    Проверить выборку, загрузив ее целиком.
+
+    Args:
+        csv_path: Путь к CSV файлу выборки
+        data_config: Конфигурация данных
+
+    Returns:
+        Кортеж (базовые проверки, отчет по правилам, профиль признаков)
+    """
+    # Все колонки: правила могут касаться Id и дубликатов целых строк
+    df = load_split(csv_path)
+    checks = {
+        "has_target": data_config.target_column in df.columns,
+        "has_features": all(col in df.columns for col in data_config.feature_columns),
+        "no_nulls": bool(df[data_config.feature_columns].isnull().sum().sum() == 0),
+        "size_valid": len(df) > 0,
+    }
+    profiler = ColumnProfiler(_profile_columns(df, data_config))
+    profiler.update_frame(df)
+    return checks, validate_frame(df, data_config), profiler
+
+
+def _validate_split_streaming(
+    csv_path: Path, data_config: DataConfig, chunksize: int
+) -> tuple[dict[str, bool], dict[str, Any], ColumnProfiler]:
+    """
+    Проверить выборку по чанкам с остановкой на первом жестком нарушении.
+
+    Память ограничена размером чанка: повторы для правил уникальности
+    считаются по временным индексам хешей на диске рядом с выборкой, базовые
+    проверки накапливаются по прочитанной части выборки.
+
+    Args:
+        csv_path: Путь к CSV файлу выборки
+        data_config: Конфигурация данных
+        chunksize: Количество строк в чанке
+
+    Returns:
+        Кортеж (базовые проверки, отчет по правилам, профиль признаков)
+    """
+    columns: list[str] = []
+    feature_nulls = 0
+    profiler: ColumnProfiler | None = None
+
+    def chunks() -> Iterator[pd.DataFrame]:
+        nonlocal columns, feature_nulls, profiler
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+            columns = list(chunk.columns)
+            present = [col for col in data_config.feature_columns if col in columns]
+            feature_nulls += int(chunk[present].isnull().sum().sum())
+            if profiler is None:
+                profiler = ColumnProfiler(_profile_columns(chunk, data_config))
+            profiler.update_frame(chunk)
+            yield chunk
+
+    report = validate_chunks(chunks(), data_config, hash_dir=csv_path.parent)
+    checks = {
+        "has_target": data_config.target_column in columns,
+        "has_features": all(col in columns for col in data_config.feature_columns),
+        "no_nulls": feature_nulls == 0,
+        "size_valid": report["rows"] > 0,
+    }
+    return checks, report, profiler or ColumnProfiler([])
+
+
+def _profile_columns(df: pd.DataFrame, data_config: DataConfig) -> list[str]:
+    """Числовые признаки выборки, для которых считается сдвиг распределений."""
+    numeric = set(df.select_dtypes(include="number").columns)
+    return [col for col in data_config.feature_columns if col in numeric]
+
+
+def _drift_reports(
+    profiles: dict[str, ColumnProfiler], data_config: DataConfig
+) -> dict[str, Any]:
+    """
+    Посчитать сдвиг train/test и, если задан, относительно эталонного профиля.
+
+    Args:
+        profiles: Профили признаков выборок train и test
+        data_config: Конфигурация данных с порогами сдвига
+
+    Returns:
+        Словарь отчетов drift_report по сравнениям
+    """
+    rules = data_config.validation.drift
+    train, test = profiles["train"], profiles["test"]
+    common = [col for col in train.columns if col in test.columns]
+    reports = {
+        "train_test": drift_report(train.select(common), test.select(common), rules)
+    }
+
+    if rules.reference_profile is not None:
+        reference = load_profile(rules.reference_profile)
+        current = copy.deepcopy(train.select(common)).merge(test.select(common))
+        shared = [col for col in common if col in reference.columns]
+        reports["reference"] = drift_report(
+            reference.select(shared), current.select(shared), rules
+        )
+    return reports
+
+
+def validate_data(
+    config_file: Path,
+    streaming: bool = False,
+    chunksize: int = 100_000,
+    use_cache: bool = True,
+) -> dict[str, bool]:
     """
     Валидировать данные.
 
     Args:
         config_file: Путь к файлу конфигурации
+        streaming: Проверять по чанкам с остановкой на первом нарушении
+        chunksize: Количество строк в чанке для потоковой проверки
+        use_cache: Использовать кэш результатов валидации
 
     Returns:
         Словарь с результатами валидации
@@ -52,28 +179,86 @@ def validate_data(config_file: Path) -> dict[str, bool]:
 
         data_config = training_config.data
 
-        # Загружаем данные
+        cache_key = None
+        if use_cache:
+            options: dict[str, Any] = {"streaming": streaming}
+            if streaming:
+                options["chunksize"] = chunksize
+            cache_key = validation_cache_key(
+                [TRAIN_DATA, TEST_DATA], data_config, options
+            )
+            cache_files = {VALIDATION_FILE.name: VALIDATION_FILE}
+            if VALIDATION_CACHE.restore(cache_key, cache_files):
+                with open(VALIDATION_FILE) as f:
+                    cached = json.load(f)
+                cached_results = {
+                    k: v for k, v in cached.items() if k not in ("rules", "drift")
+                }
+                failed = [k for k, v in cached_results.items() if not v]
+                if failed:
+                    print(
+                        f"❌ Валидация не пройдена (кэш). Ошибки: {', '.join(failed)}"
+                    )
+                else:
+                    print("✅ Валидация данных пройдена успешно (кэш)")
+                monitor.skip_stage(
+                    "validate_data",
+                    {
+                        "reason": "cached",
+                        "valid": all(cached_results.values()),
+                        "cache_key": cache_key,
+                        **cached_results,
+                    },
+                )
+                return cached_results
+
+        # Загружаем и проверяем данные
         print("📊 Загрузка данных для валидации...")
-        train_df = pd.read_csv(TRAIN_DATA)
-        test_df = pd.read_csv(TEST_DATA)
+        split_checks: dict[str, dict[str, bool]] = {}
+        rule_reports: dict[str, dict[str, Any]] = {}
+        profiles: dict[str, ColumnProfiler] = {}
+        for split, csv_path in (("train", TRAIN_DATA), ("test", TEST_DATA)):
+            if streaming:
+                result = _validate_split_streaming(csv_path, data_config, chunksize)
+            else:
+                result = _validate_split(csv_path, data_config)
+            split_checks[split], rule_reports[split], profiles[split] = result
 
         validation_results = {
-            "train_has_target": data_config.target_column in train_df.columns,
-            "test_has_target": data_config.target_column in test_df.columns,
-            "train_has_features": all(
-                col in train_df.columns for col in data_config.feature_columns
-            ),
-            "test_has_features": all(
-                col in test_df.columns for col in data_config.feature_columns
-            ),
-            "train_no_nulls": train_df[data_config.feature_columns].isnull().sum().sum()
-            == 0,
-            "test_no_nulls": test_df[data_config.feature_columns].isnull().sum().sum()
-            == 0,
-            "train_size_valid": len(train_df) > 0,
-            "test_size_valid": len(test_df) > 0,
+            f"{split}_{check}": split_checks[split][check]
+            for check in ("has_target", "has_features", "no_nulls", "size_valid")
+            for split in ("train", "test")
         }
 
+        # Декларативные правила из data_config.validation
+        for split, report in rule_reports.items():
+            validation_results[f"{split}_rules_valid"] = report["passed"]
+            failed_rules = [r["name"] for r in report["rules"] if not r["passed"]]
+            print(
+                f"  {split}: правил пройдено {report['n_passed']}/{report['n_rules']}"
+                + (f" (не пройдены: {', '.join(failed_rules)})" if failed_rules else "")
+            )
+            if report.get("stopped_early"):
+                validation_results[f"{split}_rules_valid"] = False
+                print(
+                    f"  {split}: проверка остановлена после {report['rows']} строк: "
+                    f"{report['first_violation']}"
+                )
+
+        # Сдвиг распределений признаков; после досрочной остановки профиль
+        # выборки частичный, поэтому сдвиг не считается
+        drift: dict[str, Any] = {}
+        stopped = [split for split, r in rule_reports.items() if r.get("stopped_early")]
+        if data_config.validation.drift.enabled and stopped:
+            drift = {"skipped": f"проверка остановлена досрочно: {', '.join(stopped)}"}
+            print(f"  Сдвиг не считается: {drift['skipped']}")
+        elif data_config.validation.drift.enabled:
+            drift = _drift_reports(profiles, data_config)
+            for name, report in drift.items():
+                validation_results[f"{name}_no_drift"] = report["passed"]
+                if report["drifted"]:
+                    print(f"  Сдвиг ({name}): {', '.join(report['drifted'])}")
+
         all_valid = all(validation_results.values())
 
         if all_valid:
@@ -82,18 +267,16 @@ def validate_data(config_file: Path) -> dict[str, bool]:
             failed = [k for k, v in validation_results.items() if not v]
             print(f"❌ Валидация не пройдена. Ошибки: {', '.join(failed)}")
 
-        # Сохраняем результаты (конвертируем numpy типы в Python типы)
-        validation_results_serializable: dict[str, Any] = {}
-        for k, v in validation_results.items():
-            if isinstance(v, np.bool_):
-                validation_results_serializable[k] = bool(v)
-            elif isinstance(v, bool):
-                validation_results_serializable[k] = v
-            else:
-                validation_results_serializable[k] = v
+        # Сохраняем результаты
+        with open(VALIDATION_FILE, "w") as f:
+            json.dump(
+                {**validation_results, "rules": rule_reports, "drift": drift},
+                f,
+                indent=2,
+            )
 
-        with open(REPORTS_DIR / "metrics" / "data_validation.json", "w") as f:
-            json.dump(validation_results_serializable, f, indent=2)
+        if cache_key is not None:
+            VALIDATION_CACHE.store(cache_key, {VALIDATION_FILE.name: VALIDATION_FILE})
 
         monitor.complete_stage(
             "validate_data", {"valid": all_valid, **validation_results}
@@ -109,13 +292,29 @@ def main() -> None:
     """Главная функция."""
     parser = argparse.ArgumentParser(description="Валидация данных")
     parser.add_argument("--config", type=str, default="config/train_params.yaml")
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Проверка по чанкам с остановкой на первом нарушении",
+    )
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Строк в чанке")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Не использовать кэш результатов валидации",
+    )
     args = parser.parse_args()
 
     config_file = Path(args.config)
     if not config_file.exists():
         raise FileNotFoundError(f"Конфигурационный файл не найден: {config_file}")
 
-    validate_data(config_file)
+    validate_data(
+        config_file,
+        streaming=args.streaming,
+        chunksize=args.chunksize,
+        use_cache=not args.no_cache,
+    )
 
 
 if __name__ == "__main__":
@@ -1,49 +1,464 @@
 """Скрипт для запуска всех экспериментов."""
 
-import subprocess  # nosec B404
+import argparse
 import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import yaml
 
 # Добавляем корневую директорию в путь
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from scripts.experiments.generate_experiments import EXPERIMENTS  # noqa: E402
+from scripts.experiments.run_experiment import (  # noqa: E402
+    FIT_CACHE,
+    REPORTS_DIR,
+    artifact_paths,
+    build_model,
+    evaluate,
+    evaluate_and_save,
+    evaluate_batch,
+    fit_model,
+    load_data,
+)
+from src.data_science_project.fit_cache import FitCache, array_digest  # noqa: E402
+from src.data_science_project.resource_usage import UsageMeter  # noqa: E402
+from src.data_science_project.run_manifest import (  # noqa: E402
+    RunManifest,
+    config_hash,
+)
+from src.data_science_project.sweeps import (  # noqa: E402
+    SWEEP_PARAMS,
+    fit_sweep,
+    plan_sweeps,
+    predict_sweep,
+    sweep_key,
+)
+from src.data_science_project.thread_budget import (  # noqa: E402
+    limit_threads,
+    plan_threads,
+)
+
+if TYPE_CHECKING:
+    from sklearn.base import BaseEstimator
 
 CONFIG_DIR = Path("config/experiments")
 
+# Журнал выполнения экспериментов (для --resume)
+MANIFEST_PATH = REPORTS_DIR / "experiments" / "manifest.jsonl"
+
+# Данные, загруженные один раз, и бюджет потоков, переданные воркерам
+_DATA: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray] | None = None
+_BUDGET: dict[str, int] | None = None
+
+
+def _init_worker(
+    data: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    budget: dict[str, int] | None = None,
+) -> None:
+    """Сохранить общие данные и ограничить потоки в процессе-воркере."""
+    global _DATA, _BUDGET
+    _DATA, _BUDGET = data, budget
+    if budget is not None:
+        limit_threads(budget["threads_per_fit"])
+
+
+def _n_jobs(budget: dict[str, int] | None) -> int | None:
+    """Потоки одного обучения из бюджета потоков."""
+    return budget["threads_per_fit"] if budget is not None else None
+
+
+def _evaluate(
+    model: "BaseEstimator",
+    exp: dict[str, Any],
+    data: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    save: bool,
+    predictions: tuple[np.ndarray, np.ndarray] | None = None,
+    budget: dict[str, int] | None = None,
+    usage: UsageMeter | None = None,
+    metrics: dict[str, float] | None = None,
+) -> dict[str, float]:
+    """Метрики обученной модели эксперимента; при save - с сохранением артефактов."""
+    if save:
+        metrics, _ = evaluate_and_save(
+            model,
+            exp["model"],
+            exp["params"],
+            exp["id"],
+            data,
+            predictions,
+            budget,
+            usage,
+            metrics,
+        )
+        return metrics
+    return metrics if metrics is not None else evaluate(model, data, predictions)
+
+
+def _cache_fields(
+    fit_cache: FitCache | None, hit: bool, saved_before: float, n_models: int = 1
+) -> dict[str, Any]:
+    """Поля результата об обращении к кэшу обучения."""
+    if fit_cache is None:
+        return {}
+    saved = (fit_cache.saved_seconds - saved_before) / n_models
+    return {"fit_cache": "hit" if hit else "miss", "fit_saved_seconds": saved}
+
+
+def _run_experiment(
+    exp: dict[str, Any],
+    data: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    save: bool,
+    fit_cache: FitCache | None = None,
+    data_digest: str | None = None,
+    budget: dict[str, int] | None = None,
+) -> dict[str, Any]:
+    """
+    Выполнить один эксперимент, не пропуская исключения наружу.
+
+    Args:
+        exp: Описание эксперимента (id, model, params)
+        data: (X_train, X_test, y_train, y_test)
+        save: Сохранять модель, метрики и параметры
+        fit_cache: Кэш обучения; None - всегда обучать
+        data_digest: array_digest обучающих данных для ключа кэша
+        budget: Бюджет потоков (plan_threads) для n_jobs и файла метрик
+
+    Returns:
+        Результат: id, статус, метрики или текст ошибки, время выполнения
+    """
+    start = time.perf_counter()
+    try:
+        model = build_model(exp["model"], exp["params"], _n_jobs(budget))
+        print(f"🤖 Обучение {exp['model']}...")
+        saved_before = fit_cache.saved_seconds if fit_cache else 0.0
+        usage = UsageMeter()
+        model, hit = fit_model(model, data[0], data[2], usage, fit_cache, data_digest)
+        return {
+            "id": exp["id"],
+            "status": "completed",
+            "metrics": _evaluate(model, exp, data, save, None, budget, usage),
+            "duration": time.perf_counter() - start,
+            **_cache_fields(fit_cache, hit, saved_before),
+        }
+    except Exception:
+        return {
+            "id": exp["id"],
+            "status": "failed",
+            "error": traceback.format_exc(),
+            "duration": time.perf_counter() - start,
+        }
+
+
+def _run_sweep(
+    group: list[dict[str, Any]],
+    kind: str,
+    data: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    save: bool,
+    fit_cache: FitCache | None = None,
+    data_digest: str | None = None,
+    budget: dict[str, int] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Обучить группу экспериментов, отличающихся одним параметром, совместно.
+
+    Время (и замер стоимости) совместного обучения и общих предсказаний
+    делится поровну между экспериментами группы. Группа берется из кэша
+    обучения, только если в нем есть все ее модели.
+
+    Args:
+        group: Эксперименты группы (id, model, params)
+        kind: Вид группы (первый элемент sweep_key)
+        data: (X_train, X_test, y_train, y_test)
+        save: Сохранять модели, метрики и параметры
+        fit_cache: Кэш обучения; None - всегда обучать
+        data_digest: array_digest обучающих данных для ключа кэша
+        budget: Бюджет потоков (plan_threads) для n_jobs и файла метрик
+
+    Returns:
+        Результаты экспериментов группы
+    """
+    start = time.perf_counter()
+    param = SWEEP_PARAMS[kind]
+    values = [exp["params"][param] for exp in group]
+    model_name = group[0]["model"]
+    hit, saved_before = False, fit_cache.saved_seconds if fit_cache else 0.0
+    cpu_before = fit_cache.saved_cpu_seconds if fit_cache else 0.0
+    usage = UsageMeter()
+
+    def fit_all() -> list["BaseEstimator"]:
+        model = build_model(model_name, group[0]["params"], _n_jobs(budget))
+        return fit_sweep(kind, model_name, model, values, data[0], data[2])
+
+    try:
+        print(f"🤖 Обучение {model_name} ({param}: {values})...")
+        with usage.phase("fit"):
+            if fit_cache is not None and data_digest is not None:
+                models, hit = fit_cache.fit_group(
+                    [
+                        build_model(model_name, exp["params"], _n_jobs(budget))
+                        for exp in group
+                    ],
+                    fit_all,
+                    data_digest,
+                )
+            else:
+                models = fit_all()
+    except Exception:
+        error = traceback.format_exc()
+        duration = time.perf_counter() - start
+        return [
+            {"id": exp["id"], "status": "failed", "error": error, "duration": duration}
+            for exp in group
+        ]
+    fit_share = (time.perf_counter() - start) / len(group)
+    cache_fields = _cache_fields(fit_cache, hit, saved_before, len(group))
+    if fit_cache is not None and hit:
+        # Стоимость моделей - исходное обучение, а не загрузка из кэша
+        usage.charge_cached_fit(
+            fit_cache.saved_seconds - saved_before,
+            fit_cache.saved_cpu_seconds - cpu_before,
+        )
+
+    # Общие предсказания группы (например, один запрос соседей для всех k)
+    try:
+        start = time.perf_counter()
+        with usage.phase("predict"):
+            train_predictions = predict_sweep(kind, models, data[0], data[2])
+            test_predictions = predict_sweep(kind, models, data[1], data[2])
+        fit_share += (time.perf_counter() - start) / len(group)
+    except Exception:
+        # Ошибку покажет predict отдельной модели в _evaluate
+        train_predictions = test_predictions = None
+
+    # Метрики всей группы по общим предсказаниям - одним вызовом
+    group_metrics = None
+    if train_predictions is not None and test_predictions is not None:
+        group_metrics = evaluate_batch(
+            data, (np.asarray(train_predictions), np.asarray(test_predictions))
+        )
+
+    results = []
+    for i, (exp, model) in enumerate(zip(group, models, strict=True)):
+        start = time.perf_counter()
+        predictions = metrics = None
+        if train_predictions is not None and test_predictions is not None:
+            predictions = (train_predictions[i], test_predictions[i])
+        if group_metrics is not None:
+            metrics = group_metrics[i]
+        try:
+            metrics = _evaluate(
+                model,
+                exp,
+                data,
+                save,
+                predictions,
+                budget,
+                usage.split(len(group)),
+                metrics,
+            )
+            result = {"id": exp["id"], "status": "completed", "metrics": metrics}
+        except Exception:
+            result = {
+                "id": exp["id"],
+                "status": "failed",
+                "error": traceback.format_exc(),
+            }
+        result["duration"] = time.perf_counter() - start + fit_share
+        result.update(cache_fields)
+        results.append(result)
+    return results
+
+
+def run_group(
+    group: list[dict[str, Any]],
+    data: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    save: bool = True,
+    fit_cache: FitCache | None = None,
+    budget: dict[str, int] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Выполнить группу экспериментов из plan_sweeps: совместно или по одному.
+
+    Args:
+        group: Эксперименты группы (id, model, params)
+        data: (X_train, X_test, y_train, y_test)
+        save: Сохранять модели, метрики и параметры экспериментов
+        fit_cache: Кэш обучения; None - всегда обучать
+        budget: Бюджет потоков (plan_threads); None - n_jobs из параметров
 
-def run_all_experiments() -> None:
-    """Запустить все эксперименты."""
-    print(f"🚀 Запуск {len(EXPERIMENTS)} экспериментов...\n")
+    Returns:
+        Результаты экспериментов группы
+    """
+    data_digest = array_digest(data[0], data[2]) if fit_cache is not None else None
+    key = sweep_key(group[0])
+    if len(group) > 1 and key is not None:
+        return _run_sweep(group, key[0], data, save, fit_cache, data_digest, budget)
+    return [
+        _run_experiment(exp, data, save, fit_cache, data_digest, budget)
+        for exp in group
+    ]
 
-    for i, exp in enumerate(EXPERIMENTS, 1):
-        exp_id = exp["id"]
-        config_file = CONFIG_DIR / f"{exp_id}.yaml"
 
+def cache_totals(results: list[dict[str, Any]]) -> FitCache | None:
+    """Сводная статистика кэша обучения по результатам (в том числе из воркеров)."""
+    cached = [result for result in results if "fit_cache" in result]
+    if not cached:
+        return None
+    totals = FitCache(FIT_CACHE.cache_dir)
+    for result in cached:
+        totals.record(result["fit_cache"] == "hit", result["fit_saved_seconds"])
+    return totals
+
+
+def _run_group(group: list[dict[str, Any]], use_cache: bool) -> list[dict[str, Any]]:
+    """Выполнить группу экспериментов на общих данных процесса."""
+    data = _DATA if _DATA is not None else load_data()
+    return run_group(
+        group, data, fit_cache=FIT_CACHE if use_cache else None, budget=_BUDGET
+    )
+
+
+def _record_results(
+    manifest: RunManifest, results: list[dict[str, Any]], hashes: dict[str, str]
+) -> None:
+    """Дописать в журнал статусы экспериментов и хеши их артефактов."""
+    for result in results:
+        extra = {"duration": result.get("duration")}
+        if result["status"] == "completed":
+            artifacts: tuple[Path, ...] = artifact_paths(result["id"])
+        else:
+            artifacts = ()
+            extra["error"] = result["error"].strip().splitlines()[-1]
+        manifest.record(
+            result["id"], result["status"], hashes[result["id"]], artifacts, **extra
+        )
+
+
+def load_experiments() -> list[dict[str, Any]]:
+    """Собрать эксперименты с параметрами из их конфигов."""
+    experiments = []
+    for exp in EXPERIMENTS:
+        config_file = CONFIG_DIR / f"{exp['id']}.yaml"
         if not config_file.exists():
             print(f"⚠️  Конфиг не найден: {config_file}, пропускаем")
             continue
+        with open(config_file) as f:
+            config = yaml.safe_load(f)
+        experiments.append(
+            {
+                "id": config.get("experiment_id", exp["id"]),
+                "model": str(exp["model"]),
+                "params": config.get("params", {}),
+            }
+        )
+    return experiments
 
-        print(f"[{i}/{len(EXPERIMENTS)}] Запуск {exp_id}...")
 
-        # Запускаем эксперимент
-        cmd: list[str] = [
-            "python",
-            "scripts/experiments/run_experiment.py",
-            "--model",
-            str(exp["model"]),
-            "--config",
-            str(config_file),
-        ]
+def run_all_experiments(
+    jobs: int | None = None,
+    sweep: bool = True,
+    use_cache: bool = True,
+    resume: bool = False,
+) -> list[dict[str, Any]]:
+    """
+    Запустить все эксперименты.
 
-        try:
-            subprocess.run(cmd, check=True)  # nosec B603, B607
-            print(f"✅ {exp_id} завершен\n")
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Ошибка в {exp_id}: {e}\n")
+    Данные загружаются один раз, эксперименты выполняются в пуле процессов.
+    Эксперименты, отличающиеся одним параметром, обучаются одной задачей:
+    ансамбли по n_estimators - префиксами наибольшего ансамбля, ridge, lasso
+    и elasticnet по alpha - одним путем регуляризации, KNN по n_neighbors -
+    одним запросом соседей. Модели, уже обученные на тех же данных с теми же
+    параметрами, берутся из кэша обучения.
+    Ядра делятся между процессами и потоками обучения (BLAS/OpenMP и n_jobs
+    модели), выбранное разделение записывается в файлы метрик.
+    Ошибка одного эксперимента не прерывает остальные.
+
+    Статус, хеш конфигурации и хеши артефактов каждого эксперимента
+    дописываются в журнал MANIFEST_PATH сразу по завершении его группы.
+    При resume эксперименты, завершенные с той же конфигурацией на тех же
+    данных и с неизмененными артефактами, пропускаются.
+
+    Args:
+        jobs: Количество процессов (None - по числу ядер, 1 - в текущем процессе)
+        sweep: Обучать группы экспериментов совместно
+        use_cache: Использовать кэш обучения
+        resume: Пропустить эксперименты, уже завершенные по журналу
+
+    Returns:
+        Результаты выполненных экспериментов
+    """
+    global _DATA, _BUDGET
+    start = time.perf_counter()
+    experiments = load_experiments()
+    data = load_data()
+    data_digest = array_digest(*data)
+    hashes = {exp["id"]: config_hash(exp, data_digest) for exp in experiments}
+    manifest = RunManifest(MANIFEST_PATH)
+    if resume:
+        done = manifest.completed(hashes)
+        experiments = [exp for exp in experiments if exp["id"] not in done]
+        print(f"⏭️  Уже завершены, пропускаем: {len(done)}")
+        if not experiments:
+            return []
 
-    print("✅ Все эксперименты завершены!")
+    groups = plan_sweeps(experiments) if sweep else [[exp] for exp in experiments]
+    budget = plan_threads(len(groups), jobs)
+    print(
+        f"🚀 Запуск {len(experiments)} экспериментов "
+        f"(задач: {len(groups)}, процессов: {budget['workers']}, "
+        f"потоков на обучение: {budget['threads_per_fit']})...\n"
+    )
+
+    results: list[dict[str, Any]] = []
+
+    if budget["workers"] == 1:
+        _DATA, _BUDGET = data, budget
+        with limit_threads(budget["threads_per_fit"]):
+            for i, group in enumerate(groups, 1):
+                ids = ", ".join(exp["id"] for exp in group)
+                print(f"[{i}/{len(groups)}] Запуск {ids}...")
+                group_results = _run_group(group, use_cache)
+                _record_results(manifest, group_results, hashes)
+                results.extend(group_results)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=budget["workers"],
+            initializer=_init_worker,
+            initargs=(data, budget),
+        ) as pool:
+            futures = {
+                pool.submit(_run_group, group, use_cache): group for group in groups
+            }
+            for future in as_completed(futures):
+                group = futures[future]
+                try:
+                    group_results = future.result()
+                except BrokenProcessPool as e:
+                    # Воркер аварийно завершился (например, нехватка памяти)
+                    group_results = [
+                        {"id": exp["id"], "status": "failed", "error": repr(e)}
+                        for exp in group
+                    ]
+                _record_results(manifest, group_results, hashes)
+                results.extend(group_results)
+
+    failed = [result for result in results if result["status"] == "failed"]
+    for result in failed:
+        print(f"❌ Ошибка в {result['id']}:\n{result['error']}")
+    print(
+        f"✅ Все эксперименты завершены: успешно {len(results) - len(failed)}, "
+        f"с ошибкой {len(failed)} (время: {time.perf_counter() - start:.1f}с)"
+    )
+    if totals := cache_totals(results):
+        print(f"♻️  {totals.summary()}")
 
     # Генерируем отчет об экспериментах
     try:
@@ -53,11 +468,11 @@ def run_all_experiments() -> None:
             load_all_experiments,
         )
 
-        experiments = load_all_experiments()
-        if experiments:
+        all_experiments = load_all_experiments()
+        if all_experiments:
             report_path = Path("reports/experiments/latest.md")
             generate_markdown_report(
-                experiments, report_path, include_visualizations=True
+                all_experiments, report_path, include_visualizations=True
             )
             print(f"✅ Отчет сохранен: {report_path}")
         else:
@@ -65,6 +480,40 @@ def run_all_experiments() -> None:
     except Exception as e:
         print(f"⚠️  Ошибка при генерации отчета: {e}")
 
+    return results
+
+
+def main() -> None:
+    """Главная функция."""
+    parser = argparse.ArgumentParser(description="Запуск всех экспериментов")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Количество процессов (по умолчанию - число ядер, 1 - без пула)",
+    )
+    parser.add_argument(
+        "--no-sweep",
+        action="store_true",
+        help="Обучать каждый эксперимент отдельно, без групповых прогонов",
+    )
+    parser.add_argument(
+        "--no-fit-cache", action="store_true", help="Не использовать кэш обучения"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Пропустить эксперименты, уже завершенные по журналу manifest.jsonl",
+    )
+    args = parser.parse_args()
+
+    run_all_experiments(
+        jobs=args.jobs,
+        sweep=not args.no_sweep,
+        use_cache=not args.no_fit_cache,
+        resume=args.resume,
+    )
+
 
 if __name__ == "__main__":
-    run_all_experiments()
+    main()
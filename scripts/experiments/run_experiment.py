@@ -2,22 +2,44 @@
 
 import argparse
 import json
-import pickle  # nosec B403
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import pandas as pd
+import numpy as np
 import yaml
-from sklearn.ensemble import (
-    AdaBoostRegressor,
-    GradientBoostingRegressor,
-    RandomForestRegressor,
+
+# Добавляем корневую директорию в путь
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data_science_project.config_models import DataConfig  # noqa: E402
+from src.data_science_project.cross_validation import (  # noqa: E402
+    FoldCache,
+    fold_cache_key,
+    fold_split,
+    load_folds,
+    summarize_folds,
+)
+from src.data_science_project.data_io import load_xy  # noqa: E402
+from src.data_science_project.fit_cache import FitCache, array_digest  # noqa: E402
+from src.data_science_project.metrics import (  # noqa: E402
+    regression_metrics,
+    regression_metrics_batch,
 )
-from sklearn.linear_model import ElasticNet, Lasso, LinearRegression, Ridge
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-from sklearn.neighbors import KNeighborsRegressor
-from sklearn.svm import SVR
-from sklearn.tree import DecisionTreeRegressor
+from src.data_science_project.model_registry import get_model  # noqa: E402
+from src.data_science_project.model_store import save_model  # noqa: E402
+from src.data_science_project.resource_usage import UsageMeter  # noqa: E402
+from src.data_science_project.run_manifest import write_atomic  # noqa: E402
+from src.data_science_project.thread_budget import (  # noqa: E402
+    limit_threads,
+    plan_threads,
+    set_n_jobs,
+)
+
+if TYPE_CHECKING:
+    from sklearn.base import BaseEstimator
 
 # Пути
 DATA_DIR = Path("data/processed")
@@ -30,12 +52,19 @@ MODELS_DIR.mkdir(parents=True, exist_ok=True)
 (REPORTS_DIR / "metrics").mkdir(parents=True, exist_ok=True)
 (REPORTS_DIR / "experiments").mkdir(parents=True, exist_ok=True)
 
+# Кэш обученных моделей: ключ - хеш данных, класс и параметры модели, версия sklearn
+FIT_CACHE = FitCache(MODELS_DIR / "fit_cache")
+
+# Разбиения на фолды (индексы, а не копии данных) и метрики по фолдам
+CV_FOLDS_DIR = Path("data/interim/cv_folds")
+CV_CACHE = FoldCache("data/interim/cv_cache")
+
+# Данные кросс-валидации, переданные воркерам при старте пула
+_CV_DATA: tuple[np.ndarray, np.ndarray] | None = None
 
-def load_data() -> tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:
-    """Загрузить данные для обучения."""
-    train_df = pd.read_csv(DATA_DIR / "train.csv")
-    test_df = pd.read_csv(DATA_DIR / "test.csv")
 
+def load_data() -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Загрузить данные для обучения."""
     feature_cols = [
         "fixed acidity",
         "volatile acidity",
@@ -50,90 +79,197 @@ def load_data() -> tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:
         "alcohol",
     ]
     target_col = "quality"
+    data_config = DataConfig(target_column=target_col, feature_columns=feature_cols)
 
-    X_train = train_df[feature_cols]
-    y_train = train_df[target_col]
-    X_test = test_df[feature_cols]
-    y_test = test_df[target_col]
+    X_train, y_train = load_xy(DATA_DIR / "train.csv", data_config)
+    X_test, y_test = load_xy(DATA_DIR / "test.csv", data_config)
 
     return X_train, X_test, y_train, y_test
 
 
-def get_model(model_name: str, **params: Any) -> Any:
-    """Создать модель по имени."""
-    models = {
-        "linear": LinearRegression,
-        "ridge": Ridge,
-        "lasso": Lasso,
-        "elasticnet": ElasticNet,
-        "knn": KNeighborsRegressor,
-        "svr": SVR,
-        "dt": DecisionTreeRegressor,
-        "rf": RandomForestRegressor,
-        "ada": AdaBoostRegressor,
-        "gb": GradientBoostingRegressor,
-    }
-
-    if model_name not in models:
-        raise ValueError(f"Unknown model: {model_name}")
-
-    return models[model_name](**params)
+def build_model(
+    model_name: str, params: dict[str, Any], n_jobs: int | None = None
+) -> "BaseEstimator":
+    """Создать модель эксперимента с фиксированным random_state.
 
-
-def train_and_evaluate(
-    model_name: str, params: dict[str, Any], experiment_id: str
-) -> tuple[dict[str, float], Path]:
-    """Обучить модель и оценить её."""
-    # Загружаем данные
-    X_train, X_test, y_train, y_test = load_data()
-
-    # Создаем модель
-    model = get_model(model_name, **params)
+    Args:
+        model_name: Тип модели
+        params: Параметры модели
+        n_jobs: Потоки обучения из бюджета потоков; None - как в параметрах
+    """
+    model = get_model(model_name, params)
 
     # Устанавливаем random_state только для моделей, которые его поддерживают
     if "random_state" in model.get_params():
         model.set_params(random_state=42)
-
-    # Обучаем
-    print(f"🤖 Обучение {model_name}...")
-    model.fit(X_train, y_train)
+    if n_jobs is not None:
+        set_n_jobs(model, n_jobs)
+    return model
+
+
+def fit_model(
+    model: "BaseEstimator",
+    X: np.ndarray,
+    y: np.ndarray,
+    usage: UsageMeter,
+    fit_cache: FitCache | None = None,
+    data_digest: str | None = None,
+) -> tuple["BaseEstimator", bool]:
+    """Обучить модель или взять ее из кэша обучения, замеряя фазу fit.
+
+    Args:
+        model: Необученная модель
+        X: Признаки обучающей выборки
+        y: Целевая переменная обучающей выборки
+        usage: Замер стоимости модели
+        fit_cache: Кэш обучения; None - всегда обучать
+        data_digest: array_digest обучающих данных для ключа кэша
+
+    Returns:
+        (обученная модель, попадание в кэш)
+    """
+    if fit_cache is None:
+        with usage.phase("fit"):
+            model.fit(X, y)
+        return model, False
+
+    saved_before = fit_cache.saved_seconds, fit_cache.saved_cpu_seconds
+    with usage.phase("fit"):
+        model, hit = fit_cache.fit(model, X, y, data_digest)
+    if hit:
+        # Стоимость модели - исходное обучение, а не загрузка из кэша
+        usage.charge_cached_fit(
+            fit_cache.saved_seconds - saved_before[0],
+            fit_cache.saved_cpu_seconds - saved_before[1],
+        )
+    return model, hit
+
+
+def evaluate(
+    model: "BaseEstimator",
+    data: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    predictions: tuple[np.ndarray, np.ndarray] | None = None,
+) -> dict[str, float]:
+    """Посчитать метрики обученной модели на train и test.
+
+    Args:
+        model: Обученная модель
+        data: (X_train, X_test, y_train, y_test)
+        predictions: Уже посчитанные предсказания (train, test); None - predict
+    """
+    X_train, X_test, y_train, y_test = data
 
     # Предсказания
-    y_pred_train = model.predict(X_train)
-    y_pred_test = model.predict(X_test)
+    if predictions is not None:
+        y_pred_train, y_pred_test = predictions
+    else:
+        y_pred_train = model.predict(X_train)
+        y_pred_test = model.predict(X_test)
 
     # Метрики
-    metrics = {
-        "train_mse": float(mean_squared_error(y_train, y_pred_train)),
-        "train_rmse": float(mean_squared_error(y_train, y_pred_train) ** 0.5),
-        "train_mae": float(mean_absolute_error(y_train, y_pred_train)),
-        "train_r2": float(r2_score(y_train, y_pred_train)),
-        "test_mse": float(mean_squared_error(y_test, y_pred_test)),
-        "test_rmse": float(mean_squared_error(y_test, y_pred_test) ** 0.5),
-        "test_mae": float(mean_absolute_error(y_test, y_pred_test)),
-        "test_r2": float(r2_score(y_test, y_pred_test)),
+    train_metrics = regression_metrics(y_train, y_pred_train)
+    test_metrics = regression_metrics(y_test, y_pred_test)
+    return {
+        **{f"train_{name}": value for name, value in train_metrics.items()},
+        **{f"test_{name}": value for name, value in test_metrics.items()},
     }
 
+
+def evaluate_batch(
+    data: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    predictions: tuple[np.ndarray, np.ndarray],
+) -> list[dict[str, float]]:
+    """Посчитать метрики группы моделей на train и test одним вызовом.
+
+    Args:
+        data: (X_train, X_test, y_train, y_test)
+        predictions: Предсказания группы (train, test), формы (n_models, n_rows)
+
+    Returns:
+        Метрики каждой модели в том же виде, что и evaluate
+    """
+    y_train, y_test = data[2], data[3]
+    batches = {
+        "train": regression_metrics_batch(y_train, predictions[0]),
+        "test": regression_metrics_batch(y_test, predictions[1]),
+    }
+    n_models = len(batches["train"]["mse"])
+    return [
+        {
+            f"{split}_{name}": float(values[i])
+            for split, metrics in batches.items()
+            for name, values in metrics.items()
+        }
+        for i in range(n_models)
+    ]
+
+
+def artifact_paths(experiment_id: str) -> tuple[Path, Path, Path]:
+    """Пути к модели, метрикам и параметрам эксперимента."""
+    return (
+        MODELS_DIR / f"{experiment_id}_model.pkl",
+        REPORTS_DIR / "metrics" / f"{experiment_id}_metrics.json",
+        REPORTS_DIR / "experiments" / f"{experiment_id}_params.json",
+    )
+
+
+def evaluate_and_save(
+    model: "BaseEstimator",
+    model_name: str,
+    params: dict[str, Any],
+    experiment_id: str,
+    data: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    predictions: tuple[np.ndarray, np.ndarray] | None = None,
+    extra: dict[str, Any] | None = None,
+    usage: UsageMeter | None = None,
+    metrics: dict[str, float] | None = None,
+) -> tuple[dict[str, float], Path]:
+    """Оценить обученную модель и сохранить модель, метрики и параметры.
+
+    Кроме метрик качества в файл метрик пишется стоимость модели: время
+    обучения и предсказания, задержка на строку, процессорное время, пик
+    памяти и размер сериализованной модели.
+
+    Args:
+        model: Обученная модель
+        model_name: Тип модели
+        params: Параметры модели
+        experiment_id: ID эксперимента
+        data: (X_train, X_test, y_train, y_test)
+        predictions: Уже посчитанные предсказания (train, test); None - predict
+        extra: Сведения о запуске для файла метрик (например, бюджет потоков)
+        usage: Замер с фазой fit; None - замерить только предсказание
+        metrics: Уже посчитанные метрики (evaluate_batch); None - evaluate
+    """
+    usage = usage if usage is not None else UsageMeter(reset_peak=False)
+    X_train, X_test = data[0], data[1]
+    if predictions is None:
+        with usage.phase("predict"):
+            predictions = (model.predict(X_train), model.predict(X_test))
+    if metrics is None:
+        metrics = evaluate(model, data, predictions)
+    model_path, metrics_path, params_path = artifact_paths(experiment_id)
+
+    # Артефакты пишутся атомарно: прерванный запуск не оставляет обрезанных файлов
     # Сохраняем модель
-    model_path = MODELS_DIR / f"{experiment_id}_model.pkl"
-    with open(model_path, "wb") as f:
-        pickle.dump(model, f)  # nosec B301
+    model_format = save_model(model, model_path)
+    saved_metrics = {
+        **metrics,
+        **usage.summary(len(X_train) + len(X_test), model_format["size_bytes"]),
+        **(extra or {}),
+    }
 
     # Сохраняем метрики
-    metrics_path = REPORTS_DIR / "metrics" / f"{experiment_id}_metrics.json"
-    with open(metrics_path, "w") as f:
-        json.dump(metrics, f, indent=2)
+    write_atomic(metrics_path, json.dumps(saved_metrics, indent=2).encode())
 
     # Сохраняем параметры
-    params_path = REPORTS_DIR / "experiments" / f"{experiment_id}_params.json"
     experiment_data = {
         "experiment_id": experiment_id,
         "model_name": model_name,
         "params": params,
-        "metrics": metrics,
+        "metrics": saved_metrics,
     }
-    with open(params_path, "w") as f:
-        json.dump(experiment_data, f, indent=2)
+    write_atomic(params_path, json.dumps(experiment_data, indent=2).encode())
 
     print(f"✅ Эксперимент {experiment_id} завершен")
     print(f"  Test R²: {metrics['test_r2']:.4f}")
@@ -142,6 +278,160 @@ def train_and_evaluate(
     return metrics, model_path
 
 
+def train_and_evaluate(
+    model_name: str,
+    params: dict[str, Any],
+    experiment_id: str,
+    data: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray] | None = None,
+    use_cache: bool = True,
+) -> tuple[dict[str, float], Path]:
+    """Обучить модель и оценить её.
+
+    Args:
+        model_name: Тип модели
+        params: Параметры модели
+        experiment_id: ID эксперимента
+        data: Уже загруженные (X_train, X_test, y_train, y_test); None - загрузить
+        use_cache: Брать обученную модель из кэша обучения, если она там есть
+    """
+    # Загружаем данные
+    data = data if data is not None else load_data()
+
+    # Одно обучение получает все доступные ядра
+    budget = plan_threads(1, jobs=1)
+    model = build_model(model_name, params, n_jobs=budget["threads_per_fit"])
+
+    # Обучаем
+    print(f"🤖 Обучение {model_name}...")
+    usage = UsageMeter()
+    with limit_threads(budget["threads_per_fit"]):
+        fit_cache = FIT_CACHE if use_cache else None
+        model, _ = fit_model(model, data[0], data[2], usage, fit_cache)
+        if fit_cache is not None:
+            print(f"♻️  {fit_cache.summary()}")
+
+        return evaluate_and_save(
+            model, model_name, params, experiment_id, data, extra=budget, usage=usage
+        )
+
+
+def load_cv_data() -> tuple[np.ndarray, np.ndarray]:
+    """Объединить train и test для кросс-валидации."""
+    X_train, X_test, y_train, y_test = load_data()
+    return np.vstack([X_train, X_test]), np.concatenate([y_train, y_test])
+
+
+def _init_cv_worker(X: np.ndarray, y: np.ndarray, threads: int) -> None:
+    """Сохранить данные кросс-валидации и ограничить потоки в процессе-воркере."""
+    global _CV_DATA
+    _CV_DATA = X, y
+    limit_threads(threads)
+
+
+def _fit_fold(
+    model_name: str,
+    params: dict[str, Any],
+    train_idx: np.ndarray,
+    test_idx: np.ndarray,
+    threads: int,
+) -> dict[str, float]:
+    """Обучить модель на фолде и посчитать метрики на его частях."""
+    X, y = _CV_DATA if _CV_DATA is not None else load_cv_data()
+    model = build_model(model_name, params, n_jobs=threads)
+    model.fit(X[train_idx], y[train_idx])
+    return evaluate(model, (X[train_idx], X[test_idx], y[train_idx], y[test_idx]))
+
+
+def cross_validate(
+    model_name: str,
+    params: dict[str, Any],
+    experiment_id: str,
+    k: int = 5,
+    repeats: int = 1,
+    jobs: int | None = None,
+    use_cache: bool = True,
+) -> dict[str, float]:
+    """Оценить модель повторной k-fold кросс-валидацией на train и test вместе.
+
+    Разбиения на фолды хранятся один раз как номера фолдов строк. Метрики
+    каждого фолда кэшируются по (фолд, конфигурация), поэтому при добавлении
+    повторов обучаются только недостающие фолды. Фолды обучаются в пуле
+    процессов, ядра делятся между процессами и потоками обучения.
+
+    Args:
+        model_name: Тип модели
+        params: Параметры модели
+        experiment_id: ID эксперимента
+        k: Количество фолдов
+        repeats: Количество повторов с разными разбиениями
+        jobs: Количество процессов (None - по числу ядер, 1 - в текущем процессе)
+        use_cache: Брать метрики фолдов из кэша, если они там есть
+
+    Returns:
+        Среднее и стандартное отклонение метрик по фолдам
+    """
+    global _CV_DATA
+    X, y = load_cv_data()
+    data_digest = array_digest(X, y)
+    folds = load_folds(CV_FOLDS_DIR / f"{data_digest}_k{k}.npz", len(X), k, repeats)
+
+    fold_metrics: dict[tuple[int, int], dict[str, float]] = {}
+    missing = []
+    for repeat, assignments in enumerate(folds):
+        for fold in range(k):
+            train_idx, test_idx = fold_split(assignments, fold)
+            key = fold_cache_key(data_digest, test_idx, model_name, params)
+            cached = CV_CACHE.load(key) if use_cache else None
+            if cached is not None:
+                fold_metrics[repeat, fold] = cached
+            else:
+                missing.append(((repeat, fold), key, train_idx, test_idx))
+
+    print(
+        f"🤖 Кросс-валидация {model_name}: {k} фолдов x {repeats} повторов, "
+        f"из кэша {len(fold_metrics)}, обучение {len(missing)}"
+    )
+    budget = plan_threads(len(missing), jobs)
+    threads = budget["threads_per_fit"]
+    args = [(model_name, params, train, test, threads) for _, _, train, test in missing]
+    if budget["workers"] == 1:
+        _CV_DATA = X, y
+        with limit_threads(threads):
+            computed = [_fit_fold(*task) for task in args]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=budget["workers"],
+            initializer=_init_cv_worker,
+            initargs=(X, y, threads),
+        ) as pool:
+            computed = list(pool.map(_fit_fold, *zip(*args, strict=True)))
+    for (fold_id, key, _, _), metrics in zip(missing, computed, strict=True):
+        CV_CACHE.store(key, metrics)
+        fold_metrics[fold_id] = metrics
+
+    summary = summarize_folds(
+        [fold_metrics[fold_id] for fold_id in sorted(fold_metrics)]
+    )
+    cv_data = {
+        "experiment_id": experiment_id,
+        "model_name": model_name,
+        "params": params,
+        "folds": k,
+        "repeats": repeats,
+        **budget,
+        "metrics": summary,
+    }
+    metrics_path = REPORTS_DIR / "metrics" / f"{experiment_id}_cv_metrics.json"
+    write_atomic(metrics_path, json.dumps(cv_data, indent=2).encode())
+
+    print(f"✅ Кросс-валидация {experiment_id} завершена")
+    print(f"  Test R²: {summary['test_r2_mean']:.4f} ± {summary['test_r2_std']:.4f}")
+    print(
+        f"  Test RMSE: {summary['test_rmse_mean']:.4f} ± {summary['test_rmse_std']:.4f}"
+    )
+    return summary
+
+
 def main() -> None:
     """Главная функция."""
     parser = argparse.ArgumentParser(description="Запуск ML эксперимента")
@@ -149,6 +439,21 @@ def main() -> None:
     parser.add_argument("--params", type=str, help="JSON строка с параметрами")
     parser.add_argument("--experiment-id", type=str, help="ID эксперимента")
     parser.add_argument("--config", type=str, help="Путь к YAML конфигу")
+    parser.add_argument(
+        "--no-fit-cache", action="store_true", help="Не использовать кэш обучения"
+    )
+    parser.add_argument(
+        "--cv", type=int, metavar="K", help="K-fold кросс-валидация вместо holdout"
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=1, help="Количество повторов кросс-валидации"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Процессов для фолдов (по умолчанию - число ядер, 1 - без пула)",
+    )
 
     args = parser.parse_args()
 
@@ -166,7 +471,20 @@ def main() -> None:
         experiment_id = args.experiment_id or "exp_1"
 
     # Запускаем эксперимент
-    train_and_evaluate(args.model, params, experiment_id)
+    if args.cv:
+        cross_validate(
+            args.model,
+            params,
+            experiment_id,
+            k=args.cv,
+            repeats=args.repeats,
+            jobs=args.jobs,
+            use_cache=not args.no_fit_cache,
+        )
+        return
+    train_and_evaluate(
+        args.model, params, experiment_id, use_cache=not args.no_fit_cache
+    )
 
 
 if __name__ == "__main__":
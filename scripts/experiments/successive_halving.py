@@ -0,0 +1,397 @@
+"""Отбор конфигураций экспериментов последовательным делением (successive halving)."""
+
+import argparse
+import json
+import math
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# Добавляем корневую директорию в путь
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.experiments.run_all_experiments import (  # noqa: E402
+    cache_totals,
+    load_experiments,
+    run_group,
+)
+from scripts.experiments.run_experiment import (  # noqa: E402
+    FIT_CACHE,
+    REPORTS_DIR,
+    load_data,
+)
+from src.data_science_project.sweeps import ENSEMBLE_MODELS, plan_sweeps  # noqa: E402
+from src.data_science_project.thread_budget import (  # noqa: E402
+    limit_threads,
+    plan_threads,
+)
+
+HALVING_DIR = REPORTS_DIR / "experiments" / "successive_halving"
+
+# Ресурсы: доля строк обучающей выборки, доля n_estimators ансамбля или
+# auto - n_estimators для ансамблей с этим параметром, строки для остальных
+RESOURCES = ("auto", "rows", "n_estimators")
+
+# Минимальное количество строк на ступени (KNN, CV внутри моделей и т.п.)
+MIN_ROWS = 50
+
+# Доля обучающей выборки, отложенная для ранжирования на ступенях: тестовая
+# выборка в отборе не участвует
+VALIDATION_FRACTION = 0.2
+
+# Данные и порядок подвыборки строк, переданные воркерам при старте пула
+_DATA: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray] | None = None
+_ORDER: np.ndarray | None = None
+
+
+def _init_worker(
+    data: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray], order: np.ndarray
+) -> None:
+    """Сохранить общие данные в процессе-воркере."""
+    global _DATA, _ORDER
+    _DATA, _ORDER = data, order
+
+
+def rung_budgets(rungs: int, eta: float) -> list[float]:
+    """
+    Доли ресурса на ступенях: каждая следующая в eta раз больше, последняя - 1.
+
+    Args:
+        rungs: Количество ступеней
+        eta: Коэффициент сокращения
+
+    Returns:
+        Доли ресурса по ступеням
+    """
+    if rungs < 1 or eta <= 1:
+        raise ValueError(f"Need rungs >= 1 and eta > 1, got {rungs}, {eta}")
+    return [eta ** (rung - rungs + 1) for rung in range(rungs)]
+
+
+def _has_n_estimators(exp: dict[str, Any]) -> bool:
+    """Ансамбль с явно заданным n_estimators."""
+    return exp["model"] in ENSEMBLE_MODELS and "n_estimators" in exp["params"]
+
+
+def _validation_split(order: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Разделить перестановку строк train на валидацию и пул обучения ступеней.
+
+    Args:
+        order: Случайная перестановка строк обучающей выборки
+
+    Returns:
+        (строки валидации по возрастанию, пул обучения в порядке перестановки)
+    """
+    n_val = max(1, math.ceil(VALIDATION_FRACTION * len(order)))
+    return np.sort(order[:n_val]), order[n_val:]
+
+
+def _score(metrics: dict[str, float], metric: str) -> float:
+    """Оценка для ранжирования: больше - лучше."""
+    return metrics[metric] if metric.endswith("r2") else -metrics[metric]
+
+
+def _evaluate_group(
+    group: list[dict[str, Any]],
+    budget: float,
+    resource: str,
+    final: bool,
+    use_cache: bool,
+    thread_budget: dict[str, int] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Обучить группу конфигураций из plan_sweeps на доле ресурса.
+
+    На ступенях модели обучаются на пуле обучения без валидационных строк
+    и оцениваются на валидации (метрики val_*). Финальная модель (final)
+    обучается на всей обучающей выборке, оценивается на тестовой и
+    сохраняется как обычный эксперимент.
+
+    Args:
+        group: Конфигурации группы (id, model, params)
+        budget: Доля ресурса
+        resource: Ресурс из RESOURCES
+        final: Обучение отобранной конфигурации на полных данных
+        use_cache: Использовать кэш обучения
+        thread_budget: Бюджет потоков ступени (plan_threads)
+
+    Returns:
+        Результаты конфигураций с использованным ресурсом
+    """
+    data = _DATA if _DATA is not None else load_data()
+    X_train, _, y_train, _ = data
+    if resource == "auto":
+        resource = "n_estimators" if _has_n_estimators(group[0]) else "rows"
+    used: dict[str, int] = {}
+    if not final:
+        order = _ORDER if _ORDER is not None else np.arange(len(X_train))
+        val_rows, fit_order = _validation_split(order)
+        if resource == "rows" and budget < 1:
+            n_rows = max(MIN_ROWS, math.ceil(budget * len(fit_order)))
+            fit_order = fit_order[:n_rows]
+            used["rows"] = len(fit_order)
+        rows = np.sort(fit_order)
+        data = (X_train[rows], X_train[val_rows], y_train[rows], y_train[val_rows])
+    if resource == "n_estimators":
+        group = [
+            {
+                **exp,
+                "params": {
+                    **exp["params"],
+                    "n_estimators": max(
+                        1, round(budget * int(exp["params"]["n_estimators"]))
+                    ),
+                },
+            }
+            for exp in group
+        ]
+
+    fit_cache = FIT_CACHE if use_cache else None
+    if thread_budget is None:
+        results = run_group(group, data, save=final, fit_cache=fit_cache)
+    else:
+        with limit_threads(thread_budget["threads_per_fit"]):
+            results = run_group(
+                group, data, save=final, fit_cache=fit_cache, budget=thread_budget
+            )
+    for exp, result in zip(group, results, strict=True):
+        result.update(used)
+        if resource == "n_estimators":
+            result["n_estimators"] = exp["params"]["n_estimators"]
+        if not final and result["status"] == "completed":
+            # Вторая выборка ступени - валидация, а не тестовая выборка
+            result["metrics"] = {
+                name.replace("test_", "val_", 1): value
+                for name, value in result["metrics"].items()
+            }
+    return results
+
+
+def successive_halving(
+    experiments: list[dict[str, Any]],
+    rungs: int = 4,
+    eta: float = 3.0,
+    resource: str = "auto",
+    metric: str = "val_r2",
+    jobs: int | None = None,
+    use_cache: bool = True,
+) -> dict[str, Any]:
+    """
+    Отобрать лучшую конфигурацию последовательным делением.
+
+    Все конфигурации обучаются на малой доле ресурса, на следующую ступень
+    переходит лучшая 1/eta часть, доля ресурса растет в eta раз; последняя
+    ступень - полный ресурс. Конфигурации ранжируются по валидационной
+    части обучающей выборки (VALIDATION_FRACTION), тестовая выборка в отборе
+    не участвует: на ней оценивается только лучшая конфигурация, обученная
+    на всей обучающей выборке и сохраненная как обычный эксперимент.
+    Подвыборки строк вложены: ступень берет префикс одной случайной
+    перестановки строк пула обучения. Внутри ступени серии конфигураций,
+    отличающихся одним параметром, обучаются совместно (plan_sweeps).
+    Ядра ступени делятся между ее задачами и потоками обучения, поэтому
+    на поздних ступенях с малым числом конфигураций обучение многопоточное.
+
+    Args:
+        experiments: Конфигурации (id, model, params)
+        rungs: Количество ступеней
+        eta: Коэффициент сокращения
+        resource: "rows" - доля строк, "n_estimators" - доля размера ансамбля,
+            "auto" - n_estimators для ансамблей, строки для остальных моделей
+        metric: Валидационная метрика ранжирования val_* (r2 - больше лучше,
+            остальные - меньше)
+        jobs: Количество процессов (None - по числу ядер, 1 - в текущем процессе)
+        use_cache: Использовать кэш обучения (повторный запуск не переобучает)
+
+    Returns:
+        Сводка: ступени, лучшая конфигурация и ее результат на тестовой
+        выборке, затраченная доля ресурса
+    """
+    global _DATA, _ORDER
+    if resource not in RESOURCES:
+        raise ValueError(f"Unknown resource: {resource}")
+    if not metric.startswith("val_"):
+        raise ValueError(f"Rank on validation metrics (val_*), got {metric}")
+    if resource == "n_estimators":
+        skipped = [exp["id"] for exp in experiments if not _has_n_estimators(exp)]
+        if skipped:
+            print(f"⚠️  Без n_estimators, пропускаем: {', '.join(skipped)}")
+        experiments = [exp for exp in experiments if exp["id"] not in skipped]
+    if not experiments:
+        raise ValueError("No experiments to schedule")
+
+    budgets = rung_budgets(rungs, eta)
+    jobs = plan_threads(len(plan_sweeps(experiments)), jobs)["workers"]
+    HALVING_DIR.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+
+    data = load_data()
+    order = np.random.default_rng(42).permutation(len(data[0]))
+    pool = None
+    best_result = None
+    if jobs == 1:
+        _DATA, _ORDER = data, order
+    else:
+        pool = ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker, initargs=(data, order)
+        )
+
+    alive = experiments
+    all_results: list[dict[str, Any]] = []
+    rung_summaries: list[dict[str, Any]] = []
+    spent = 0.0
+    try:
+        for rung, budget in enumerate(budgets):
+            final = rung == len(budgets) - 1
+            print(
+                f"🪜 Ступень {rung}: {len(alive)} конфигураций, "
+                f"{resource} x{budget:.3g}"
+            )
+            # Конфигурации одной серии (n_estimators, alpha, k) обучаются вместе
+            groups = plan_sweeps(alive)
+            thread_budget = plan_threads(len(groups), jobs)
+            tasks = [
+                (group, budget, resource, False, use_cache, thread_budget)
+                for group in groups
+            ]
+            if pool is None:
+                batches = [_evaluate_group(*task) for task in tasks]
+            else:
+                batches = list(pool.map(_evaluate_group, *zip(*tasks, strict=True)))
+            results = [result for batch in batches for result in batch]
+            all_results.extend(results)
+            spent += budget * len(alive)
+
+            ranked = sorted(
+                (r for r in results if r["status"] == "completed"),
+                key=lambda r: _score(r["metrics"], metric),
+                reverse=True,
+            )
+            n_keep = len(ranked) if final else max(1, math.ceil(len(alive) / eta))
+            promoted = [r["id"] for r in ranked[:n_keep]]
+            for r in results:
+                if r["status"] == "failed":
+                    print(f"❌ Ошибка в {r['id']}:\n{r['error']}")
+
+            rung_data = {
+                "rung": rung,
+                "resource": resource,
+                "budget": budget,
+                "metric": metric,
+                "results": results,
+                "promoted": promoted,
+            }
+            with open(HALVING_DIR / f"rung_{rung}.json", "w") as f:
+                json.dump(rung_data, f, indent=2)
+            rung_summaries.append(
+                {
+                    "rung": rung,
+                    "budget": budget,
+                    "configs": len(alive),
+                    "promoted": promoted,
+                }
+            )
+            if not promoted:
+                break
+            alive = [exp for exp in alive if exp["id"] in promoted]
+
+        best = (
+            rung_summaries[-1]["promoted"][0]
+            if rung_summaries[-1]["promoted"]
+            else None
+        )
+        if best is not None:
+            # Лучшая конфигурация - на всей обучающей выборке, оценка на тесте
+            task = (
+                [exp for exp in alive if exp["id"] == best],
+                1.0,
+                resource,
+                True,
+                use_cache,
+                plan_threads(1, jobs),
+            )
+            if pool is None:
+                [best_result] = _evaluate_group(*task)
+            else:
+                [best_result] = pool.submit(_evaluate_group, *task).result()
+            all_results.append(best_result)
+            spent += 1
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    summary = {
+        "rungs": rung_summaries,
+        "eta": eta,
+        "resource": resource,
+        "metric": metric,
+        "best": best,
+        "best_result": best_result,
+        "configs": len(experiments),
+        # Затраты в единицах полного обучения; полный перебор стоит configs
+        "budget_spent": spent,
+        "duration": time.perf_counter() - start,
+    }
+    totals = cache_totals(all_results)
+    if totals is not None:
+        summary["fit_cache"] = totals.stats()
+        print(f"♻️  {totals.summary()}")
+    with open(HALVING_DIR / "summary.json", "w") as f:
+        json.dump(summary, f, indent=2)
+
+    print(
+        f"🏆 Лучшая конфигурация: {best} "
+        f"(ресурс: {spent:.1f} из {len(experiments)} полных обучений, "
+        f"время: {summary['duration']:.1f}с)"
+    )
+    return summary
+
+
+def main() -> None:
+    """Главная функция."""
+    parser = argparse.ArgumentParser(
+        description="Отбор конфигураций экспериментов последовательным делением"
+    )
+    parser.add_argument("--rungs", type=int, default=4, help="Количество ступеней")
+    parser.add_argument("--eta", type=float, default=3.0, help="Коэффициент сокращения")
+    parser.add_argument(
+        "--resource",
+        choices=RESOURCES,
+        default="auto",
+        help="Ресурс ступени: доля строк, доля n_estimators или auto",
+    )
+    parser.add_argument(
+        "--metric",
+        type=str,
+        default="val_r2",
+        help="Валидационная метрика ранжирования (val_*)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Количество процессов (по умолчанию - число ядер, 1 - без пула)",
+    )
+    parser.add_argument(
+        "--no-fit-cache", action="store_true", help="Не использовать кэш обучения"
+    )
+    args = parser.parse_args()
+
+    successive_halving(
+        load_experiments(),
+        rungs=args.rungs,
+        eta=args.eta,
+        resource=args.resource,
+        metric=args.metric,
+        jobs=args.jobs,
+        use_cache=not args.no_fit_cache,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Бенчмарк кодеков хранилища моделей: размер, время сохранения и загрузки."""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from tabulate import tabulate
+
+# Добавляем корневую директорию в путь
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data_science_project.model_registry import get_model  # noqa: E402
+from src.data_science_project.model_store import (  # noqa: E402
+    MODEL_CODECS,
+    load_model,
+    save_model,
+)
+
+# Модели бенчмарка: тип модели -> параметры
+BENCHMARK_MODELS: dict[str, dict[str, Any]] = {
+    "ridge": {"alpha": 1.0},
+    "knn": {"n_neighbors": 5},
+    "dt": {"max_depth": 10},
+    "rf": {"n_estimators": 200, "max_depth": None},
+    "gb": {"n_estimators": 200, "max_depth": 5},
+}
+
+
+def _best_of(func: Any, repeats: int) -> float:
+    """Лучшее время выполнения функции из нескольких запусков (секунды)."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(
+    model_types: list[str], rows: int = 5000, repeats: int = 3
+) -> list[dict[str, Any]]:
+    """
+    Измерить размер файла, время сохранения и загрузки модели каждым кодеком.
+
+    Загрузка joblib замеряется дважды: с отображением массивов в память и без.
+
+    Args:
+        model_types: Типы моделей из BENCHMARK_MODELS
+        rows: Количество строк синтетических данных для обучения
+        repeats: Количество повторов (берется лучшее время)
+
+    Returns:
+        Список результатов по модели и кодеку
+    """
+    rng = np.random.default_rng(42)
+    X = rng.normal(size=(rows, 11))
+    y = X @ rng.normal(size=11) + rng.normal(scale=0.5, size=rows)
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for model_type in model_types:
+            model = get_model(model_type, BENCHMARK_MODELS[model_type]).fit(X, y)
+            expected = model.predict(X[:100])
+            for codec in MODEL_CODECS:
+                path = Path(tmp_dir) / f"{model_type}_{codec}.model"
+                save_time = _best_of(
+                    lambda m=model, p=path, c=codec: save_model(m, p, c), repeats
+                )
+                variants = [("joblib+mmap", True), ("joblib", False)]
+                for name, mmap in variants if codec == "joblib" else [(codec, False)]:
+                    loaded, _ = load_model(path, mmap)
+                    if not np.array_equal(loaded.predict(X[:100]), expected):
+                        raise RuntimeError(f"{model_type}/{name}: predictions differ")
+                    load_time = _best_of(
+                        lambda p=path, m=mmap: load_model(p, m), repeats
+                    )
+                    results.append(
+                        {
+                            "model": model_type,
+                            "codec": name,
+                            "size_mb": path.stat().st_size / 1024**2,
+                            "save_s": save_time,
+                            "load_s": load_time,
+                        }
+                    )
+                    print(f"✅ {model_type}/{name}: загрузка {load_time:.4f}с")
+
+    return results
+
+
+def main() -> None:
+    """Главная функция."""
+    parser = argparse.ArgumentParser(description="Бенчмарк кодеков хранения моделей")
+    parser.add_argument(
+        "--models",
+        nargs="+",
+        choices=list(BENCHMARK_MODELS),
+        default=list(BENCHMARK_MODELS),
+        help="Типы моделей",
+    )
+    parser.add_argument("--rows", type=int, default=5000, help="Строк для обучения")
+    parser.add_argument("--repeats", type=int, default=3, help="Количество повторов")
+    parser.add_argument("--output", type=str, help="Путь для сохранения JSON")
+    args = parser.parse_args()
+
+    results = benchmark(args.models, args.rows, args.repeats)
+    print(tabulate(results, headers="keys", tablefmt="pipe", floatfmt=".4f"))
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"📊 Результаты сохранены: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,15 @@
 
 import argparse
 import json
-import pickle  # nosec B403
 from pathlib import Path
 
-import pandas as pd
 import yaml
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 
 from src.data_science_project.config_models import TrainingConfig
+from src.data_science_project.data_io import load_xy
+from src.data_science_project.metrics import regression_metrics
+from src.data_science_project.model_store import load_model
+from src.data_science_project.resource_usage import UsageMeter
 
 # Пути
 MODEL_PATH = Path("models/model.pkl")
@@ -43,32 +44,30 @@ def evaluate_model(config_file: Path) -> None:
 
     data_config = training_config.data
 
-    # Загружаем модель
+    # Загружаем модель: массивы модели joblib отображаются в память
     print("🤖 Загрузка модели...")
-    with open(MODEL_PATH, "rb") as f:
-        model = pickle.load(f)  # nosec B301
+    usage = UsageMeter()
+    with usage.phase("load"):
+        model, model_format = load_model(MODEL_PATH)
 
     # Загружаем тестовые данные
     print("📊 Загрузка тестовых данных...")
-    test_df = pd.read_csv(TEST_DATA)
-
-    # Подготовка данных
-    feature_cols = data_config.feature_columns
-    target_col = data_config.target_column
-
-    X_test = test_df[feature_cols]
-    y_test = test_df[target_col]
+    X_test, y_test = load_xy(TEST_DATA, data_config)
 
     # Предсказания
     print("🔮 Предсказания...")
-    y_pred = model.predict(X_test)
+    with usage.phase("predict"):
+        y_pred = model.predict(X_test)
 
     # Метрики
     metrics = {
-        "test_mse": float(mean_squared_error(y_test, y_pred)),
-        "test_rmse": float(mean_squared_error(y_test, y_pred) ** 0.5),
-        "test_mae": float(mean_absolute_error(y_test, y_pred)),
-        "test_r2": float(r2_score(y_test, y_pred)),
+        **{
+            f"test_{name}": value
+            for name, value in regression_metrics(y_test, y_pred).items()
+        },
+        # Стоимость загрузки и предсказания, размер и кодек модели
+        **usage.summary(len(X_test), MODEL_PATH.stat().st_size),
+        "model_codec": model_format["codec"],
     }
 
     # Сохраняем метрики
@@ -93,6 +92,7 @@ def evaluate_model(config_file: Path) -> None:
     print("✅ Модель оценена!")
     print(f"  Test R²: {metrics['test_r2']:.4f}")
     print(f"  Test RMSE: {metrics['test_rmse']:.4f}")
+    print(f"  Predict latency: {metrics['predict_latency_us']:.1f}µs/row")
 
 
 def main() -> None:
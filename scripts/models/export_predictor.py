@@ -0,0 +1,130 @@
+"""Экспорт обученных моделей в скомпилированные предикторы на массивах numpy."""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import yaml
+from tabulate import tabulate
+
+# Добавляем корневую директорию в путь
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data_science_project.compiled_predictor import (  # noqa: E402
+    compile_model,
+    load_predictor,
+)
+from src.data_science_project.config_models import DataConfig  # noqa: E402
+from src.data_science_project.data_io import load_xy  # noqa: E402
+from src.data_science_project.model_store import load_model  # noqa: E402
+
+# Пути
+TEST_DATA = Path("data/processed/test.csv")
+COMPILED_DIR = Path("models/compiled")
+
+# Размеры пакетов для замера задержки
+BATCH_SIZES = (1, 10, 100)
+
+
+def _best_of(func: Any, repeats: int) -> float:
+    """Лучшее время выполнения функции из нескольких запусков (секунды)."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def export_predictor(
+    model_path: Path, X: np.ndarray, output_dir: Path = COMPILED_DIR, repeats: int = 20
+) -> dict[str, Any]:
+    """
+    Скомпилировать модель, проверить совпадение предсказаний и замерить задержку.
+
+    Args:
+        model_path: Путь к файлу модели (model_store или pickle)
+        X: Признаки для проверки и замера задержки
+        output_dir: Директория скомпилированных предикторов
+        repeats: Количество повторов замера (берется лучшее время)
+
+    Returns:
+        Путь к предиктору, расхождение с моделью и задержки в микросекундах
+    """
+    model, _ = load_model(model_path)
+    predictor_path = compile_model(model).save(output_dir / f"{model_path.stem}.npz")
+    # Проверяется загруженный с диска предиктор, как в сервисе
+    predictor = load_predictor(predictor_path)
+
+    compiled, expected = predictor.predict(X), model.predict(X)
+    max_abs_diff = float(np.abs(compiled - expected).max())
+    if not np.allclose(compiled, expected, rtol=1e-9, atol=1e-9):
+        raise ValueError(f"{model_path}: predictions differ by {max_abs_diff}")
+
+    result: dict[str, Any] = {
+        "model": model_path.stem,
+        "predictor": str(predictor_path),
+        "max_abs_diff": max_abs_diff,
+    }
+    for size in BATCH_SIZES:
+        batch = X[:size]
+        sklearn_time = _best_of(lambda b=batch: model.predict(b), repeats)
+        compiled_time = _best_of(lambda b=batch: predictor.predict(b), repeats)
+        result[f"sklearn_{size}_us"] = sklearn_time * 1e6
+        result[f"compiled_{size}_us"] = compiled_time * 1e6
+    print(f"✅ {model_path.name} -> {predictor_path}")
+    return result
+
+
+def main() -> None:
+    """Главная функция."""
+    parser = argparse.ArgumentParser(
+        description="Экспорт моделей в скомпилированные предикторы"
+    )
+    parser.add_argument(
+        "models",
+        nargs="*",
+        default=["models/model.pkl"],
+        help="Файлы моделей (линейные модели, dt, rf, gb, ada)",
+    )
+    parser.add_argument("--config", type=str, default="config/train_params.yaml")
+    parser.add_argument(
+        "--output-dir", type=str, default=str(COMPILED_DIR), help="Куда сохранить"
+    )
+    parser.add_argument("--repeats", type=int, default=20, help="Количество повторов")
+    parser.add_argument("--output", type=str, help="Путь для сохранения JSON")
+    args = parser.parse_args()
+
+    with open(args.config) as f:
+        data_config = DataConfig(**yaml.safe_load(f)["data"])
+    X_test, _ = load_xy(TEST_DATA, data_config)
+
+    results = []
+    for model_path in map(Path, args.models):
+        try:
+            results.append(
+                export_predictor(
+                    model_path, X_test, Path(args.output_dir), args.repeats
+                )
+            )
+        except ValueError as e:
+            # Неподдерживаемая модель (knn, svr) не мешает экспорту остальных
+            print(f"⚠️  {model_path.name}: {e}")
+
+    print(tabulate(results, headers="keys", tablefmt="pipe", floatfmt=".1f"))
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"📊 Результаты сохранены: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
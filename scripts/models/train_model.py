@@ -2,25 +2,22 @@
 
 import argparse
 import json
-import pickle  # nosec B403
 from pathlib import Path
-from typing import Any
 
-import pandas as pd
 import yaml
-from sklearn.base import BaseEstimator
-from sklearn.ensemble import (
-    AdaBoostRegressor,
-    GradientBoostingRegressor,
-    RandomForestRegressor,
-)
-from sklearn.linear_model import ElasticNet, Lasso, LinearRegression, Ridge
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-from sklearn.neighbors import KNeighborsRegressor
-from sklearn.svm import SVR
-from sklearn.tree import DecisionTreeRegressor
 
 from src.data_science_project.config_models import TrainingConfig
+from src.data_science_project.data_io import load_xy
+from src.data_science_project.fit_cache import FitCache
+from src.data_science_project.metrics import regression_metrics
+from src.data_science_project.model_registry import get_model
+from src.data_science_project.model_store import DEFAULT_CODEC, MODEL_CODECS, save_model
+from src.data_science_project.resource_usage import UsageMeter
+from src.data_science_project.thread_budget import (
+    limit_threads,
+    plan_threads,
+    set_n_jobs,
+)
 
 # Пути
 TRAIN_DATA = Path("data/processed/train.csv")
@@ -32,48 +29,22 @@ MODELS_DIR.mkdir(parents=True, exist_ok=True)
 (REPORTS_DIR / "metrics").mkdir(parents=True, exist_ok=True)
 
 
-def get_model(model_type: str, params: dict[str, Any]) -> BaseEstimator:
-    """
-    Создать модель по типу.
-
-    Args:
-        model_type: Тип модели
-        params: Параметры модели
-
-    Returns:
-        Объект модели scikit-learn
-    """
-    models = {
-        "linear": LinearRegression,
-        "ridge": Ridge,
-        "lasso": Lasso,
-        "elasticnet": ElasticNet,
-        "knn": KNeighborsRegressor,
-        "svr": SVR,
-        "dt": DecisionTreeRegressor,
-        "rf": RandomForestRegressor,
-        "ada": AdaBoostRegressor,
-        "gb": GradientBoostingRegressor,
-    }
-
-    if model_type not in models:
-        raise ValueError(f"Unknown model type: {model_type}")
-
-    # Устанавливаем random_state только для моделей, которые его поддерживают
-    model = models[model_type](**params)
-    if "random_state" in model.get_params() and "random_state" not in params:
-        model.set_params(random_state=42)
-
-    return model
-
-
-def train_model(config_file: Path, model_type: str | None = None) -> None:
+def train_model(
+    config_file: Path,
+    model_type: str | None = None,
+    use_cache: bool = True,
+    threads: int | None = None,
+    codec: str = DEFAULT_CODEC,
+) -> None:
     """
     Обучить модель.
 
     Args:
         config_file: Путь к файлу конфигурации
         model_type: Тип модели (переопределяет конфигурацию)
+        use_cache: Брать обученную модель из кэша обучения, если она там есть
+        threads: Потоки обучения (BLAS/OpenMP и n_jobs); None - все доступные ядра
+        codec: Кодек сохранения модели (model_store.MODEL_CODECS)
     """
     # Загружаем конфигурацию
     with open(config_file) as f:
@@ -131,37 +102,56 @@ def train_model(config_file: Path, model_type: str | None = None) -> None:
 
     # Загружаем данные
     print("📊 Загрузка данных для обучения...")
-    train_df = pd.read_csv(TRAIN_DATA)
-
-    # Подготовка данных
     data_config = training_config.data
-    target_col = data_config.target_column
-    feature_cols = data_config.feature_columns
-
-    X_train = train_df[feature_cols]
-    y_train = train_df[target_col]
-
-    # Обучение модели
-    print(f"🤖 Обучение модели: {model_type_final}...")
-    model = get_model(model_type_final, model_params)
-    model.fit(X_train, y_train)
-
-    # Предсказания на train
-    y_pred_train = model.predict(X_train)
+    X_train, y_train = load_xy(TRAIN_DATA, data_config)
+
+    # Обучение модели: одно обучение получает все выделенные ядра
+    budget = plan_threads(1, jobs=1, cores=threads)
+    print(
+        f"🤖 Обучение модели: {model_type_final} "
+        f"(потоков: {budget['threads_per_fit']})..."
+    )
+    model = set_n_jobs(
+        get_model(model_type_final, model_params), budget["threads_per_fit"]
+    )
+    usage = UsageMeter()
+    with limit_threads(budget["threads_per_fit"]):
+        fit_cache = FitCache(MODELS_DIR / "fit_cache") if use_cache else None
+        hit = False
+        with usage.phase("fit"):
+            if fit_cache is not None:
+                model, hit = fit_cache.fit(model, X_train, y_train)
+            else:
+                model.fit(X_train, y_train)
+        if fit_cache is not None:
+            print(f"♻️  {fit_cache.summary()}")
+            if hit:
+                # Стоимость модели - исходное обучение, а не загрузка из кэша
+                usage.charge_cached_fit(
+                    fit_cache.saved_seconds, fit_cache.saved_cpu_seconds
+                )
+
+        # Предсказания на train
+        with usage.phase("predict"):
+            y_pred_train = model.predict(X_train)
 
     # Метрики
     metrics = {
-        "train_mse": float(mean_squared_error(y_train, y_pred_train)),
-        "train_rmse": float(mean_squared_error(y_train, y_pred_train) ** 0.5),
-        "train_mae": float(mean_absolute_error(y_train, y_pred_train)),
-        "train_r2": float(r2_score(y_train, y_pred_train)),
+        **{
+            f"train_{name}": value
+            for name, value in regression_metrics(y_train, y_pred_train).items()
+        },
         "model_type": model_type_final,
     }
 
     # Сохраняем модель
     model_path = MODELS_DIR / "model.pkl"
-    with open(model_path, "wb") as f:
-        pickle.dump(model, f)  # nosec B301
+    model_format = save_model(model, model_path, codec)
+
+    # Стоимость модели, бюджет потоков и кодек сохранения
+    metrics.update(usage.summary(len(X_train), model_format["size_bytes"]))
+    metrics.update(budget)
+    metrics["model_codec"] = codec
 
     # Сохраняем метрики
     with open(REPORTS_DIR / "metrics" / "model_metrics.json", "w") as f:
@@ -171,6 +161,7 @@ def train_model(config_file: Path, model_type: str | None = None) -> None:
     print(f"  Model: {model_type_final}")
     print(f"  Train R²: {metrics['train_r2']:.4f}")
     print(f"  Train RMSE: {metrics['train_rmse']:.4f}")
+    print(f"  Fit: {metrics['fit_seconds']:.2f}s")
     print(f"  Модель сохранена: {model_path}")
 
 
@@ -179,13 +170,34 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="Обучение модели")
     parser.add_argument("--config", type=str, default="config/train_params.yaml")
     parser.add_argument("--model-type", type=str, help="Тип модели")
+    parser.add_argument(
+        "--no-fit-cache", action="store_true", help="Не использовать кэш обучения"
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=None,
+        help="Потоки обучения (по умолчанию - все доступные ядра)",
+    )
+    parser.add_argument(
+        "--codec",
+        choices=MODEL_CODECS,
+        default=DEFAULT_CODEC,
+        help="Кодек сохранения модели",
+    )
     args = parser.parse_args()
 
     config_file = Path(args.config)
     if not config_file.exists():
         raise FileNotFoundError(f"Конфигурационный файл не найден: {config_file}")
 
-    train_model(config_file, args.model_type)
+    train_model(
+        config_file,
+        args.model_type,
+        use_cache=not args.no_fit_cache,
+        threads=args.threads,
+        codec=args.codec,
+    )
 
 
 if __name__ == "__main__":
@@ -20,6 +20,16 @@ REPORTS_DIR = Path("reports")
 EXPERIMENTS_DIR = Path("experiments")
 OUTPUT_DIR = REPORTS_DIR / "experiments"
 
+# Стоимость модели из файлов метрик (время, процессор, память, размер)
+# и формат чисел в таблице
+COST_COLUMNS = {
+    "fit_seconds": ".3f",
+    "predict_latency_us": ".1f",
+    "cpu_seconds": ".3f",
+    "peak_rss_mb": ".1f",
+    "model_size_bytes": ".0f",
+}
+
 
 def load_all_experiments() -> list[dict[str, Any]]:
     """Загрузить все эксперименты."""
@@ -261,6 +271,24 @@ def generate_markdown_report(
                 + "\n\n"
             )
 
+        # Стоимость моделей рядом с качеством
+        cost_cols = [col for col in COST_COLUMNS if col in df.columns]
+        if cost_cols and "test_r2" in df.columns:
+            report += "### Стоимость моделей\n\n"
+            cost = df.sort_values("test_r2", ascending=False)[
+                ["Experiment ID", "Model", "test_r2", *cost_cols]
+            ]
+            report += (
+                tabulate(
+                    cost,
+                    headers="keys",
+                    tablefmt="pipe",
+                    showindex=False,
+                    floatfmt=["", "", ".4f", *(COST_COLUMNS[c] for c in cost_cols)],
+                )
+                + "\n\n"
+            )
+
     # Сравнительная таблица
     report += """## Сравнительная таблица
 
@@ -2,16 +2,48 @@
 
 from . import (
     clearml_tracker,
+    compiled_predictor,
     config_models,
+    cross_validation,
+    data_io,
+    dataset_cache,
+    drift,
     dvc_utils,
     experiment_tracker,
+    fit_cache,
+    metrics,
+    model_registry,
+    model_store,
     pipeline_monitor,
+    profiler,
+    resource_usage,
+    run_manifest,
+    splitting,
+    sweeps,
+    thread_budget,
+    validation,
 )
 
 __all__ = [
     "clearml_tracker",
+    "compiled_predictor",
     "config_models",
+    "cross_validation",
+    "data_io",
+    "dataset_cache",
+    "drift",
     "dvc_utils",
     "experiment_tracker",
+    "fit_cache",
+    "metrics",
+    "model_registry",
+    "model_store",
     "pipeline_monitor",
+    "profiler",
+    "resource_usage",
+    "run_manifest",
+    "splitting",
+    "sweeps",
+    "thread_budget",
+    "validation",
 ]
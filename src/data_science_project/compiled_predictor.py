@@ -0,0 +1,286 @@
+"""Компиляция линейных моделей и деревьев в плоские массивы numpy.
+
+Модуль зависит только от numpy и стандартной библиотеки: загрузчик
+load_predictor можно скопировать в сервис, где нет scikit-learn.
+"""
+
+import io
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# Версия формата файла предиктора: меняется при изменении набора массивов
+PREDICTOR_FORMAT_VERSION = 1
+
+# Класс модели -> вид предиктора (модели сопоставляются по имени класса,
+# поэтому для компиляции не нужен импорт scikit-learn)
+LINEAR_MODELS = ("LinearRegression", "Ridge", "Lasso", "ElasticNet")
+TREE_MODELS = (
+    "DecisionTreeRegressor",
+    "RandomForestRegressor",
+    "GradientBoostingRegressor",
+    "AdaBoostRegressor",
+)
+
+# Не больше стольких пар (строка, дерево) деревья обходятся циклом Python:
+# на малых пакетах накладные расходы вызовов numpy дороже самого обхода
+SCALAR_MAX_PAIRS = 64
+
+
+class CompiledPredictor:
+    """Предсказание по плоским массивам: коэффициенты или узлы деревьев."""
+
+    def __init__(self, meta: dict[str, Any], arrays: dict[str, np.ndarray]):
+        """
+        Инициализация предиктора.
+
+        Args:
+            meta: Метаданные (kind, combine, offset, depth, n_features, ...)
+            arrays: Массивы предиктора
+        """
+        self.meta = meta
+        self.arrays = arrays
+        if meta["kind"] == "trees":
+            # Дети узла подряд: следующий узел - children[2 * узел + вправо]
+            self._children = np.column_stack([arrays["left"], arrays["right"]]).ravel()
+            self._is_leaf = arrays["left"] == np.arange(len(arrays["left"]))
+            self._node_lists: tuple[list[Any], ...] | None = None
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Предсказать для пакета строк или одной строки.
+
+        Args:
+            X: Признаки (n_rows, n_features) или одна строка (n_features,)
+
+        Returns:
+            Предсказания (n_rows,)
+        """
+        X = np.atleast_2d(np.asarray(X))
+        if X.shape[1] != self.meta["n_features"]:
+            raise ValueError(
+                f"Expected {self.meta['n_features']} features, got {X.shape[1]}"
+            )
+        if self.meta["kind"] == "linear":
+            result: np.ndarray = (
+                X.astype(np.float64, copy=False) @ self.arrays["coef"]
+                + self.meta["offset"]
+            )
+            return result
+        return self._predict_trees(X)
+
+    def _predict_trees(self, X: np.ndarray) -> np.ndarray:
+        """Найти лист каждого дерева для каждой строки и объединить значения."""
+        # Деревья sklearn сравнивают признаки во float32
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if len(X) * len(self.arrays["roots"]) <= SCALAR_MAX_PAIRS:
+            leaves = self._leaves_scalar(X)
+        else:
+            leaves = self._leaves_vectorized(X)
+        values = self.arrays["value"][leaves]
+
+        combine = self.meta["combine"]
+        if combine == "mean":
+            result: np.ndarray = values.mean(axis=1)
+        elif combine == "sum":
+            result = values.sum(axis=1)
+        else:
+            result = _weighted_median(values, self.arrays["weights"])
+        offset: float = self.meta["offset"]
+        return result + offset
+
+    def _leaves_vectorized(self, X: np.ndarray) -> np.ndarray:
+        """Листья всех пар (строка, дерево) обходом по уровням сразу для всех."""
+        feature, threshold = self.arrays["feature"], self.arrays["threshold"]
+        roots = self.arrays["roots"]
+        n_rows, n_trees = len(X), len(roots)
+        X_flat = X.ravel()
+        # Пары (строка, дерево) в одном плоском массиве текущих узлов
+        nodes = np.tile(roots, n_rows)
+        row_start = np.repeat(np.arange(n_rows) * X.shape[1], n_trees)
+        active = np.flatnonzero(~self._is_leaf[nodes])
+        # Дошедшие до листа пары выбывают, поэтому шагов не больше depth
+        while active.size:
+            current = nodes[active]
+            go_right = X_flat[row_start[active] + feature[current]] > threshold[current]
+            current = self._children[2 * current + go_right]
+            nodes[active] = current
+            active = active[~self._is_leaf[current]]
+        return nodes.reshape(n_rows, n_trees)
+
+    def _leaves_scalar(self, X: np.ndarray) -> np.ndarray:
+        """Листья пар (строка, дерево) циклом Python для малых пакетов."""
+        if self._node_lists is None:
+            self._node_lists = tuple(
+                self.arrays[name].tolist()
+                for name in ("feature", "threshold", "left", "right", "roots")
+            )
+        feature, threshold, left, right, roots = self._node_lists
+        leaves = []
+        for row in X.tolist():
+            for node in roots:
+                while left[node] != node:
+                    if row[feature[node]] <= threshold[node]:
+                        node = left[node]
+                    else:
+                        node = right[node]
+                leaves.append(node)
+        return np.array(leaves, dtype=np.intp).reshape(len(X), len(roots))
+
+    def save(self, path: Path | str) -> Path:
+        """
+        Сохранить предиктор в .npz без pickle (атомарно, через временный файл).
+
+        Args:
+            path: Путь к файлу
+
+        Returns:
+            Путь к файлу
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        buffer = io.BytesIO()
+        arrays: dict[str, Any] = {"meta": np.array(json.dumps(self.meta))}
+        arrays.update(self.arrays)
+        np.savez(buffer, **arrays)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_bytes(buffer.getvalue())
+        os.replace(tmp_path, path)
+        return path
+
+
+def _weighted_median(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Взвешенная медиана предсказаний оценщиков, как в AdaBoostRegressor."""
+    sorted_idx = np.argsort(values, axis=1)
+    weight_cdf = np.cumsum(weights[sorted_idx], axis=1)
+    median_idx = (weight_cdf >= 0.5 * weight_cdf[:, -1:]).argmax(axis=1)
+    rows = np.arange(len(values))
+    result: np.ndarray = values[rows, sorted_idx[rows, median_idx]]
+    return result
+
+
+def _flatten_trees(trees: list[Any]) -> tuple[dict[str, np.ndarray], int]:
+    """
+    Склеить узлы деревьев sklearn в общие массивы.
+
+    Args:
+        trees: Обученные деревья (DecisionTreeRegressor)
+
+    Returns:
+        (массивы feature, threshold, left, right, value, roots; глубина)
+    """
+    parts: dict[str, list[np.ndarray]] = {
+        name: [] for name in ("feature", "threshold", "left", "right", "value")
+    }
+    roots, offset, depth = [], 0, 0
+    for estimator in trees:
+        tree = estimator.tree_
+        if tree.n_outputs != 1:
+            raise ValueError("Only single-output trees can be compiled")
+        ids = np.arange(tree.node_count)
+        is_leaf = tree.children_left < 0
+        # Лист ведет сам в себя по обеим ветвям с любым признаком
+        parts["feature"].append(np.where(is_leaf, 0, tree.feature))
+        parts["threshold"].append(tree.threshold)
+        parts["left"].append(np.where(is_leaf, ids, tree.children_left) + offset)
+        parts["right"].append(np.where(is_leaf, ids, tree.children_right) + offset)
+        parts["value"].append(tree.value[:, 0, 0])
+        roots.append(offset)
+        offset += tree.node_count
+        depth = max(depth, tree.max_depth)
+    arrays = {
+        "feature": np.concatenate(parts["feature"]).astype(np.intp),
+        "threshold": np.concatenate(parts["threshold"]).astype(np.float64),
+        "left": np.concatenate(parts["left"]).astype(np.intp),
+        "right": np.concatenate(parts["right"]).astype(np.intp),
+        "value": np.concatenate(parts["value"]).astype(np.float64),
+        "roots": np.array(roots, dtype=np.intp),
+    }
+    return arrays, depth
+
+
+def compile_model(model: Any) -> CompiledPredictor:
+    """
+    Скомпилировать обученную модель в плоские массивы.
+
+    Линейные модели - вектор коэффициентов и свободный член; деревья и
+    ансамбли деревьев - массивы узлов всех деревьев и способ объединения
+    листьев: среднее (dt, rf), сумма с начальным значением (gb) или
+    взвешенная медиана (ada).
+
+    Args:
+        model: Обученная модель из LINEAR_MODELS или TREE_MODELS
+
+    Returns:
+        Скомпилированный предиктор
+    """
+    name = type(model).__name__
+    meta: dict[str, Any] = {
+        "format_version": PREDICTOR_FORMAT_VERSION,
+        "model_class": name,
+        "n_features": int(model.n_features_in_),
+        "offset": 0.0,
+    }
+    if name in LINEAR_MODELS:
+        if np.ndim(model.coef_) != 1:
+            raise ValueError("Only single-output linear models can be compiled")
+        meta.update(kind="linear", offset=float(model.intercept_))
+        return CompiledPredictor(
+            meta, {"coef": np.asarray(model.coef_, dtype=np.float64)}
+        )
+    if name not in TREE_MODELS:
+        raise ValueError(
+            f"Cannot compile {name}: supported {LINEAR_MODELS + TREE_MODELS}"
+        )
+
+    meta.update(kind="trees", combine="mean")
+    extra: dict[str, np.ndarray] = {}
+    if name == "DecisionTreeRegressor":
+        trees = [model]
+    elif name == "RandomForestRegressor":
+        trees = list(model.estimators_)
+    elif name == "GradientBoostingRegressor":
+        trees = list(model.estimators_[:, 0])
+        meta["combine"] = "sum"
+        if isinstance(model.init_, str) and model.init_ == "zero":
+            meta["offset"] = 0.0
+        elif hasattr(model.init_, "constant_"):
+            meta["offset"] = float(np.ravel(model.init_.constant_)[0])
+        else:
+            raise ValueError("Only constant init estimators can be compiled")
+    else:
+        trees = list(model.estimators_)
+        meta["combine"] = "weighted_median"
+        extra["weights"] = np.asarray(
+            model.estimator_weights_[: len(trees)], dtype=np.float64
+        )
+
+    arrays, depth = _flatten_trees(trees)
+    if name == "GradientBoostingRegressor":
+        # Вклад дерева - learning_rate * значение листа, как в predict_stages
+        arrays["value"] = model.learning_rate * arrays["value"]
+    meta["depth"] = depth
+    return CompiledPredictor(meta, {**arrays, **extra})
+
+
+def load_predictor(path: Path | str) -> CompiledPredictor:
+    """
+    Загрузить предиктор, сохраненный CompiledPredictor.save.
+
+    Args:
+        path: Путь к .npz файлу
+
+    Returns:
+        Скомпилированный предиктор
+    """
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data["meta"]))
+        if meta.get("format_version") != PREDICTOR_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported predictor format: {meta.get('format_version')}"
+            )
+        arrays = {name: data[name] for name in data.files if name != "meta"}
+    return CompiledPredictor(meta, arrays)
@@ -2,7 +2,54 @@
 
 from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+
+class ColumnRule(BaseModel):
+    """Правила проверки значений колонки."""
+
+    min: float | None = Field(default=None, description="Минимальное значение")
+    max: float | None = Field(default=None, description="Максимальное значение")
+    dtype: Literal["int", "float"] | None = Field(
+        default=None,
+        description="Ожидаемый тип: float - числовая колонка, int - только целые",
+    )
+    nullable: bool = Field(default=True, description="Разрешены ли пропуски")
+
+
+class DriftRules(BaseModel):
+    """Пороги проверки сдвига распределений признаков."""
+
+    enabled: bool = Field(default=True, description="Считать отчет о сдвиге")
+    n_bins: int = Field(default=10, ge=2, description="Количество бинов для PSI")
+    psi_threshold: float = Field(default=0.2, gt=0.0, description="Порог PSI")
+    ks_threshold: float = Field(
+        default=0.15, gt=0.0, le=1.0, description="Порог статистики KS"
+    )
+    reference_profile: str | None = Field(
+        default=None,
+        description="Путь к эталонному профилю (state_dict или prepare_state.json)",
+    )
+
+
+class ValidationRules(BaseModel):
+    """Декларативные правила валидации выборок."""
+
+    columns: dict[str, ColumnRule] = Field(
+        default_factory=dict, description="Правила по колонкам"
+    )
+    allowed_target_values: list[float] | None = Field(
+        default=None, description="Допустимые значения целевой переменной"
+    )
+    unique_columns: list[str] = Field(
+        default_factory=list, description="Колонки с уникальными значениями (Id)"
+    )
+    max_duplicate_ratio: float | None = Field(
+        default=None, ge=0.0, le=1.0, description="Максимальная доля дубликатов строк"
+    )
+    drift: DriftRules = Field(
+        default_factory=DriftRules, description="Проверка сдвига train/test"
+    )
 
 
 class DataConfig(BaseModel):
@@ -15,6 +62,46 @@ class DataConfig(BaseModel):
     )
     random_state: int = Field(default=42, description="Seed для воспроизводимости")
     stratify: bool = Field(default=False, description="Стратификация при разделении")
+    split_method: Literal["random", "hash"] = Field(
+        default="random",
+        description="Метод разделения: random (train_test_split) или hash "
+        "(детерминированно по хешу строки)",
+    )
+    split_key: str | None = Field(
+        default=None,
+        description="Колонка-ключ для hash-разбиения (None - хеш содержимого строки)",
+    )
+    feature_dtype: Literal["float32", "float64"] = Field(
+        default="float32",
+        description="Тип числовых признаков при чтении выборок (float64 - "
+        "точные значения CSV ценой вдвое большей памяти)",
+    )
+    target_dtype: Literal["auto", "float32", "float64"] = Field(
+        default="auto",
+        description="Тип целевой переменной (auto - наименьший подходящий int)",
+    )
+    categorical_columns: list[str] = Field(
+        default_factory=list,
+        description="Признаки, читаемые как категории и кодируемые целыми кодами",
+    )
+    category_levels: dict[str, list[str]] = Field(
+        default_factory=dict,
+        description="Уровни каждого категориального признака: код - позиция "
+        "уровня в списке, неизвестное значение - -1",
+    )
+    validation: ValidationRules = Field(
+        default_factory=ValidationRules, description="Правила валидации выборок"
+    )
+
+    @model_validator(mode="after")
+    def _check_category_levels(self) -> "DataConfig":
+        """Коды категорий должны совпадать во всех выборках: уровни задаются явно."""
+        missing = [
+            col for col in self.categorical_columns if col not in self.category_levels
+        ]
+        if missing:
+            raise ValueError(f"Не заданы category_levels для колонок: {missing}")
+        return self
 
 
 class ModelParams(BaseModel):
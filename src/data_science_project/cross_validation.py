@@ -0,0 +1,203 @@
+"""K-fold кросс-валидация: индексы фолдов и кэш метрик по фолдам."""
+
+import hashlib
+import io
+import json
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .fit_cache import array_digest
+from .run_manifest import write_atomic
+
+# Версия формата кэша: меняется при изменении формата записей
+CV_CACHE_VERSION = 2
+
+
+def fold_assignments(
+    n_rows: int, k: int, repeat: int = 0, seed: int = 42
+) -> np.ndarray:
+    """
+    Разбить строки на k фолдов почти равного размера.
+
+    Разбиение каждого повтора зависит только от (seed, repeat), поэтому
+    добавление повторов не меняет уже посчитанные.
+
+    Args:
+        n_rows: Количество строк
+        k: Количество фолдов
+        repeat: Номер повтора
+        seed: Seed генератора
+
+    Returns:
+        Номер фолда для каждой строки
+    """
+    if not 2 <= k <= n_rows:
+        raise ValueError(f"Нужно 2 <= k <= {n_rows}, получено {k}")
+    order = np.random.default_rng([seed, repeat]).permutation(n_rows)
+    folds = np.empty(n_rows, dtype=np.int16)
+    folds[order] = np.arange(n_rows) % k
+    return folds
+
+
+def load_folds(
+    path: Path | str, n_rows: int, k: int, repeats: int = 1, seed: int = 42
+) -> np.ndarray:
+    """
+    Загрузить разбиения на фолды, досчитав и сохранив недостающие повторы.
+
+    Args:
+        path: Путь к .npz файлу разбиений (ключ файла - данные, k и seed)
+        n_rows: Количество строк
+        k: Количество фолдов
+        repeats: Количество повторов
+        seed: Seed генератора
+
+    Returns:
+        Массив формы (repeats, n_rows) с номером фолда для каждой строки
+    """
+    path = Path(path)
+    stored = np.empty((0, n_rows), dtype=np.int16)
+    if path.exists():
+        with np.load(path) as f:
+            if f["folds"].shape[1:] == (n_rows,):
+                stored = f["folds"]
+    if len(stored) < repeats:
+        added = [
+            fold_assignments(n_rows, k, repeat, seed)
+            for repeat in range(len(stored), repeats)
+        ]
+        stored = np.vstack([stored, *added])
+        buffer = io.BytesIO()
+        np.savez(buffer, folds=stored)
+        write_atomic(path, buffer.getvalue())
+    return stored[:repeats]
+
+
+def fold_split(assignments: np.ndarray, fold: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Индексы обучающей и проверочной части фолда.
+
+    Args:
+        assignments: Номер фолда для каждой строки
+        fold: Номер фолда
+
+    Returns:
+        (индексы обучения, индексы проверки)
+    """
+    mask = assignments == fold
+    return np.flatnonzero(~mask), np.flatnonzero(mask)
+
+
+def fold_cache_key(
+    data_digest: str, test_idx: np.ndarray, model_name: str, params: dict[str, Any]
+) -> str:
+    """
+    Построить ключ кэша метрик по фолду и конфигурации модели.
+
+    Фолд определяется содержимым проверочных индексов, а не номером,
+    поэтому совпадающие фолды разных запусков используют одну запись.
+
+    Args:
+        data_digest: Хеш данных кросс-валидации (array_digest)
+        test_idx: Индексы проверочной части фолда
+        model_name: Тип модели
+        params: Параметры модели
+
+    Returns:
+        Hex-строка ключа
+    """
+    import sklearn
+
+    payload = {
+        "cache_version": CV_CACHE_VERSION,
+        "data": data_digest,
+        "fold": array_digest(np.asarray(test_idx, dtype=np.int64)),
+        "model": model_name,
+        "params": params,
+        "sklearn": sklearn.__version__,
+    }
+    serialized = json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), default=repr
+    )
+    return hashlib.blake2b(serialized.encode(), digest_size=16).hexdigest()
+
+
+class FoldCache:
+    """Локальный кэш метрик модели на отдельных фолдах."""
+
+    def __init__(self, cache_dir: Path | str = "data/interim/cv_cache"):
+        """
+        Инициализация кэша.
+
+        Args:
+            cache_dir: Директория для хранения записей кэша
+        """
+        self.cache_dir = Path(cache_dir)
+
+    def entry_path(self, key: str) -> Path:
+        """
+        Получить путь к записи кэша.
+
+        Args:
+            key: Ключ кэша
+
+        Returns:
+            Путь к файлу записи
+        """
+        return self.cache_dir / f"{key}.json"
+
+    def load(self, key: str) -> dict[str, float] | None:
+        """
+        Загрузить метрики фолда; поврежденная запись считается промахом.
+
+        Args:
+            key: Ключ кэша
+
+        Returns:
+            Метрики или None
+        """
+        path = self.entry_path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path) as f:
+                return dict(json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def store(self, key: str, metrics: dict[str, float]) -> Path:
+        """
+        Сохранить метрики фолда.
+
+        Args:
+            key: Ключ кэша
+            metrics: Метрики
+
+        Returns:
+            Путь к файлу записи
+        """
+        path = self.entry_path(key)
+        write_atomic(path, json.dumps(metrics, indent=2).encode())
+        return path
+
+
+def summarize_folds(fold_metrics: list[dict[str, float]]) -> dict[str, float]:
+    """
+    Среднее и стандартное отклонение (ddof=1) каждой метрики по фолдам.
+
+    Args:
+        fold_metrics: Метрики по фолдам с одинаковым набором ключей
+
+    Returns:
+        Словарь {метрика}_mean и {метрика}_std
+    """
+    if not fold_metrics:
+        raise ValueError("No fold metrics to summarize")
+    summary = {}
+    for name in fold_metrics[0]:
+        values = np.array([metrics[name] for metrics in fold_metrics], dtype=float)
+        summary[f"{name}_mean"] = float(values.mean())
+        summary[f"{name}_std"] = float(values.std(ddof=1)) if len(values) > 1 else 0.0
+    return summary
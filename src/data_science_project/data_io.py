@@ -0,0 +1,865 @@
+"""Чтение и запись обработанных выборок (CSV + бинарный колоночный формат)."""
+
+import base64
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import IO, Any
+
+import numpy as np
+import pandas as pd
+
+from .config_models import DataConfig
+from .dataset_cache import file_digest
+
+BINARY_SUFFIX = ".npz"
+SCHEMA_SUFFIX = ".schema.json"
+FORMAT_VERSION = 2
+
+FEATURES_SUFFIX = ".features.npy"
+TARGET_SUFFIX = ".target.npy"
+MATRIX_SUFFIX = ".matrix.json"
+
+
+def binary_paths(csv_path: Path | str) -> tuple[Path, Path]:
+    """
+    Получить пути бинарного представления выборки.
+
+    Args:
+        csv_path: Путь к CSV файлу выборки
+
+    Returns:
+        Кортеж (путь к .npz с колонками, путь к JSON схеме)
+    """
+    csv_file = Path(csv_path)
+    return (
+        csv_file.with_suffix(BINARY_SUFFIX),
+        csv_file.with_suffix(SCHEMA_SUFFIX),
+    )
+
+
+def save_binary(df: pd.DataFrame, csv_path: Path | str) -> None:
+    """
+    Сохранить выборку в колоночном формате рядом с CSV.
+
+    Каждая колонка хранится непрерывным массивом в несжатом .npz (при
+    дописывании SplitWriter - несколькими частями подряд), а имена колонок,
+    ключи частей, типы и отпечаток исходного CSV - в JSON схеме.
+
+    Args:
+        df: Данные выборки
+        csv_path: Путь к CSV файлу, рядом с которым сохраняется формат
+    """
+    csv_file = Path(csv_path)
+    npz_path, schema_path = binary_paths(csv_file)
+
+    arrays: dict[str, Any] = {}
+    columns: list[dict[str, Any]] = []
+    for i, column in enumerate(df.columns):
+        values = df[column].to_numpy()
+        if values.dtype.kind not in "biuf":
+            values = values.astype(str)
+        key = f"c{i}"
+        arrays[key] = np.ascontiguousarray(values)
+        columns.append({"name": str(column), "keys": [key], "dtype": str(values.dtype)})
+
+    with open(npz_path, "wb") as f:
+        np.savez(f, **arrays)
+
+    schema: dict[str, Any] = {
+        "format_version": FORMAT_VERSION,
+        "n_rows": len(df),
+        "columns": columns,
+        "source": _source_fingerprint(csv_file),
+    }
+    with open(schema_path, "w") as f:
+        json.dump(schema, f, indent=2)
+
+
+def save_split(
+    df: pd.DataFrame, csv_path: Path | str, write_binary: bool = True
+) -> None:
+    """
+    Сохранить выборку в CSV и (опционально) в бинарном формате.
+
+    Args:
+        df: Данные выборки
+        csv_path: Путь к CSV файлу
+        write_binary: Дополнительно сохранить колоночный .npz
+    """
+    df.to_csv(csv_path, index=False)
+    if write_binary:
+        save_binary(df, csv_path)
+
+
+class SplitWriter:
+    """Инкрементальная запись выборки по чанкам (CSV + бинарный формат).
+
+    Память ограничена размером одного чанка: строки дописываются в CSV, а
+    значения колонок - во временные файлы, из которых при закрытии собирается
+    .npz без загрузки всей выборки в память. В режиме append строки
+    дописываются к существующей выборке: новые значения колонок добавляются
+    в .npz отдельными частями, а при matrix_config - и в конец матрицы
+    признаков (save_matrix), поэтому запись не зависит от размера выборки.
+    """
+
+    def __init__(
+        self,
+        csv_path: Path | str,
+        write_binary: bool = True,
+        append: bool = False,
+        matrix_config: DataConfig | None = None,
+    ) -> None:
+        """
+        Инициализация writer.
+
+        Args:
+            csv_path: Путь к CSV файлу выборки
+            write_binary: Дополнительно собрать колоночный .npz
+            append: Дописывать к существующей выборке вместо перезаписи
+            matrix_config: Конфигурация данных для дописывания строк в
+                актуальную матрицу признаков (только в режиме append)
+        """
+        self.csv_path = Path(csv_path)
+        self.write_binary = write_binary
+        self.n_rows = 0
+        self.matrix_updated = False
+        self._binary_rows = 0
+        self._stored_rows = 0
+        self._columns: list[str] | None = None
+        self._dtypes: list[np.dtype] = []
+        self._keys: list[list[str]] = []
+        self._tmp_dir: tempfile.TemporaryDirectory[str] | None = None
+        self._column_files: list[IO[bytes]] = []
+        self._matrix: _MatrixAppender | None = None
+
+        existing = (
+            append and self.csv_path.exists() and self.csv_path.stat().st_size > 0
+        )
+        resume_binary = existing and write_binary and has_fresh_binary(self.csv_path)
+        if (
+            existing
+            and matrix_config is not None
+            and load_matrix(self.csv_path, matrix_config) is not None
+        ):
+            self._matrix = _MatrixAppender(self.csv_path, matrix_config)
+        self._csv_file = open(self.csv_path, "a" if existing else "w", newline="")
+        if existing:
+            with open(self.csv_path, newline="") as f:
+                self._columns = next(csv.reader(f))
+            if resume_binary:
+                self._resume_binary()
+            else:
+                self._abort_binary()
+
+    def append(self, chunk: pd.DataFrame) -> None:
+        """
+        Дописать чанк в выборку.
+
+        Args:
+            chunk: Строки выборки (колонки как у первого чанка)
+        """
+        if self._columns is None:
+            self._start(chunk)
+            chunk.to_csv(self._csv_file, index=False)
+        else:
+            chunk.to_csv(self._csv_file, index=False, header=False)
+        self.n_rows += len(chunk)
+        if self._matrix is not None and not self._matrix.append(chunk):
+            self._matrix = None
+
+        if not self.write_binary:
+            return
+        self._binary_rows += len(chunk)
+        for i, column in enumerate(chunk.columns):
+            values = chunk[column].to_numpy()
+            dtype = self._dtypes[i]
+            if values.dtype != dtype:
+                if not np.can_cast(values.dtype, dtype, casting="same_kind"):
+                    # Тип колонки изменился между чанками - бинарный формат
+                    # не собираем, читатели вернутся к CSV
+                    self._abort_binary()
+                    return
+                values = values.astype(dtype)
+            self._column_files[i].write(np.ascontiguousarray(values).tobytes())
+
+    def close(self) -> None:
+        """Завершить запись, собрать бинарный формат и дописать матрицу."""
+        self._csv_file.close()
+        source = _source_fingerprint(self.csv_path)
+        if self._matrix is not None:
+            self._matrix.close(source)
+            self.matrix_updated = True
+        npz_path, schema_path = binary_paths(self.csv_path)
+        if not self.write_binary or self._columns is None:
+            self._abort_binary()
+            return
+
+        # Существующий .npz дополняется новыми частями колонок без перезаписи
+        resumed = any(self._keys)
+        columns: list[dict[str, Any]] = []
+        with zipfile.ZipFile(
+            npz_path, "a" if resumed else "w", zipfile.ZIP_STORED
+        ) as archive:
+            for i, (name, dtype, keys) in enumerate(
+                zip(self._columns, self._dtypes, self._keys, strict=True)
+            ):
+                key = f"c{i}_{len(keys)}" if keys else f"c{i}"
+                column_file = self._column_files[i]
+                column_file.seek(0)
+                with archive.open(f"{key}.npy", "w", force_zip64=True) as out:
+                    np.lib.format.write_array_header_2_0(
+                        out,
+                        {
+                            "descr": np.lib.format.dtype_to_descr(dtype),
+                            "fortran_order": False,
+                            "shape": (self._binary_rows,),
+                        },
+                    )
+                    shutil.copyfileobj(column_file, out)
+                columns.append(
+                    {"name": name, "keys": [*keys, key], "dtype": str(dtype)}
+                )
+        self._cleanup()
+
+        schema: dict[str, Any] = {
+            "format_version": FORMAT_VERSION,
+            "n_rows": self._stored_rows + self._binary_rows,
+            "columns": columns,
+            "source": source,
+        }
+        with open(schema_path, "w") as f:
+            json.dump(schema, f, indent=2)
+
+    def _start(self, chunk: pd.DataFrame) -> None:
+        """Зафиксировать колонки и типы по первому чанку."""
+        self._columns = [str(column) for column in chunk.columns]
+        self._dtypes = [chunk[column].to_numpy().dtype for column in chunk.columns]
+        self._keys = [[] for _ in self._columns]
+        if not all(dtype.kind in "biuf" for dtype in self._dtypes):
+            self.write_binary = False
+        if self.write_binary:
+            self._open_column_files(len(self._columns))
+
+    def _resume_binary(self) -> None:
+        """Продолжить существующий .npz: новые строки пойдут отдельной частью."""
+        _, schema_path = binary_paths(self.csv_path)
+        with open(schema_path) as f:
+            schema = json.load(f)
+        if [col["name"] for col in schema["columns"]] != self._columns:
+            self._abort_binary()
+            return
+
+        self._dtypes = [np.dtype(col["dtype"]) for col in schema["columns"]]
+        self._keys = [list(col["keys"]) for col in schema["columns"]]
+        self._stored_rows = schema["n_rows"]
+        self._open_column_files(len(schema["columns"]))
+
+    def _open_column_files(self, n_columns: int) -> None:
+        """Создать временные файлы для значений колонок."""
+        self._tmp_dir = tempfile.TemporaryDirectory(dir=self.csv_path.parent)
+        self._column_files = [
+            open(Path(self._tmp_dir.name) / f"c{i}.bin", "w+b")
+            for i in range(n_columns)
+        ]
+
+    def _abort_binary(self) -> None:
+        """Отказаться от бинарного формата и удалить устаревшие файлы."""
+        self.write_binary = False
+        self._cleanup()
+        for path in binary_paths(self.csv_path):
+            path.unlink(missing_ok=True)
+
+    def _cleanup(self) -> None:
+        """Закрыть и удалить временные файлы колонок."""
+        for column_file in self._column_files:
+            column_file.close()
+        self._column_files = []
+        if self._tmp_dir is not None:
+            self._tmp_dir.cleanup()
+            self._tmp_dir = None
+
+
+def append_checkpoint(csv_path: Path | str) -> dict[str, Any]:
+    """
+    Запомнить файлы выборки перед дописыванием SplitWriter(append=True).
+
+    Дописывание меняет существующие файлы только в конце и в небольших
+    областях: CSV и строки матриц дописываются, в .npy перезаписывается
+    заголовок, в .npz - центральный каталог zip, JSON схемы и метаданных
+    переписываются целиком. Поэтому снимок - размер файла и содержимое этих
+    областей, его объем не зависит от числа строк.
+
+    Args:
+        csv_path: Путь к CSV файлу выборки
+
+    Returns:
+        JSON-совместимый снимок для rollback_append
+    """
+    csv_file = Path(csv_path)
+    npz_path, schema_path = binary_paths(csv_file)
+    checkpoint: dict[str, Any] = {}
+    for path in (csv_file, npz_path, schema_path, *matrix_paths(csv_file)):
+        if not path.exists():
+            continue
+        size = path.stat().st_size
+        head_end, tail_start = 0, size
+        if path.suffix == ".json":
+            head_end = size
+        elif path == npz_path:
+            with zipfile.ZipFile(path) as archive:
+                tail_start = archive.start_dir
+        elif path != csv_file:
+            with open(path, "rb") as npy_file:
+                head_end = _read_npy_header(npy_file)[1]
+        with open(path, "rb") as f:
+            head = f.read(head_end)
+            f.seek(tail_start)
+            tail = f.read(size - tail_start)
+        checkpoint[path.name] = {
+            "size": size,
+            "head": base64.b64encode(head).decode(),
+            "tail_start": tail_start,
+            "tail": base64.b64encode(tail).decode(),
+        }
+    return checkpoint
+
+
+def rollback_append(csv_path: Path | str, checkpoint: dict[str, Any]) -> None:
+    """
+    Вернуть файлы выборки к снимку append_checkpoint.
+
+    Повторный откат безопасен. Бинарный формат или матрица, удаленные во
+    время дописывания (сменился тип колонки), удаляются целиком: их соберут
+    заново, а читатели до этого вернутся к CSV.
+
+    Args:
+        csv_path: Путь к CSV файлу выборки
+        checkpoint: Результат append_checkpoint до дописывания
+    """
+    csv_file = Path(csv_path)
+    for group in (binary_paths(csv_file), matrix_paths(csv_file)):
+        lost = any(path.name in checkpoint and not path.exists() for path in group)
+        for path in group:
+            if lost or path.name not in checkpoint:
+                path.unlink(missing_ok=True)
+
+    for path in (csv_file, *binary_paths(csv_file), *matrix_paths(csv_file)):
+        snapshot = checkpoint.get(path.name)
+        if snapshot is None or not path.exists():
+            continue
+        with open(path, "r+b") as f:
+            f.truncate(snapshot["size"])
+            f.write(base64.b64decode(snapshot["head"]))
+            f.seek(snapshot["tail_start"])
+            f.write(base64.b64decode(snapshot["tail"]))
+
+
+def has_fresh_binary(csv_path: Path | str) -> bool:
+    """
+    Проверить, что бинарное представление выборки существует и актуально.
+
+    Бинарный формат считается актуальным, если содержимое CSV совпадает с
+    записанным в схеме (либо CSV отсутствует), см. _source_is_fresh.
+
+    Args:
+        csv_path: Путь к CSV файлу
+
+    Returns:
+        True, если можно читать бинарный формат
+    """
+    csv_file = Path(csv_path)
+    npz_path, schema_path = binary_paths(csv_file)
+    if not npz_path.exists() or not schema_path.exists():
+        return False
+
+    try:
+        with open(schema_path) as f:
+            schema = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return False
+
+    if schema.get("format_version") != FORMAT_VERSION:
+        return False
+    if not csv_file.exists():
+        return True
+    return _source_is_fresh(csv_file, schema.get("source"))
+
+
+def load_binary(csv_path: Path | str, columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Загрузить выборку из бинарного формата.
+
+    Args:
+        csv_path: Путь к CSV файлу выборки
+        columns: Загружаемые колонки (None = все)
+
+    Returns:
+        DataFrame с данными выборки
+    """
+    npz_path, schema_path = binary_paths(csv_path)
+    with open(schema_path) as f:
+        schema = json.load(f)
+
+    keys = {col["name"]: col["keys"] for col in schema["columns"]}
+    names = columns if columns is not None else list(keys)
+    missing = [name for name in names if name not in keys]
+    if missing:
+        raise KeyError(f"Колонки отсутствуют в {npz_path}: {missing}")
+
+    with np.load(npz_path, allow_pickle=False) as data:
+        return pd.DataFrame({name: _read_column(data, keys[name]) for name in names})
+
+
+def load_split(csv_path: Path | str, columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Загрузить выборку, предпочитая бинарный формат при его наличии.
+
+    Args:
+        csv_path: Путь к CSV файлу выборки
+        columns: Загружаемые колонки (None = все)
+
+    Returns:
+        DataFrame с данными выборки
+    """
+    if has_fresh_binary(csv_path):
+        return load_binary(csv_path, columns)
+    return pd.read_csv(csv_path, usecols=columns)
+
+
+def split_columns(data_config: DataConfig) -> list[str]:
+    """
+    Колонки, нужные стадиям пайплайна: признаки и целевая переменная.
+
+    Args:
+        data_config: Конфигурация данных
+
+    Returns:
+        Список колонок без повторов
+    """
+    return list(
+        dict.fromkeys([*data_config.feature_columns, data_config.target_column])
+    )
+
+
+def split_dtypes(data_config: DataConfig) -> dict[str, str]:
+    """
+    Компактная карта типов признаков для чтения выборок.
+
+    Args:
+        data_config: Конфигурация данных
+
+    Returns:
+        Словарь {колонка: dtype}
+    """
+    dtypes: dict[str, str] = dict.fromkeys(
+        data_config.feature_columns, data_config.feature_dtype
+    )
+    for column in data_config.categorical_columns:
+        dtypes[column] = "category"
+    return dtypes
+
+
+def compact_frame(df: pd.DataFrame, data_config: DataConfig) -> pd.DataFrame:
+    """
+    Оставить только нужные колонки и привести их к компактным типам.
+
+    Признаки приводятся к feature_dtype, категориальные признаки заменяются
+    целыми кодами по category_levels (одинаковыми во всех выборках), целевая переменная при target_dtype="auto" сжимается до
+    наименьшего подходящего целого типа (если ее значения целые).
+
+    Args:
+        df: Данные выборки
+        data_config: Конфигурация данных
+
+    Returns:
+        DataFrame с компактными типами
+    """
+    columns = [col for col in split_columns(data_config) if col in df.columns]
+    dtypes = {
+        col: dtype
+        for col, dtype in split_dtypes(data_config).items()
+        if col in df.columns
+    }
+    result = df[columns].astype(dtypes)
+
+    for column in data_config.categorical_columns:
+        if column in result.columns:
+            # Уровни из конфигурации, а не из выборки: коды train и test совпадают
+            levels = pd.Index(data_config.category_levels[column])
+            codes = levels.get_indexer(result[column].astype(str))
+            result[column] = pd.to_numeric(
+                pd.Series(codes, index=result.index), downcast="integer"
+            )
+
+    target = data_config.target_column
+    if target in result.columns and not (
+        target in data_config.feature_columns
+        or target in data_config.categorical_columns
+    ):
+        if data_config.target_dtype == "auto":
+            result[target] = pd.to_numeric(result[target], downcast="integer")
+        else:
+            result[target] = result[target].astype(data_config.target_dtype)
+
+    return result
+
+
+def read_split(csv_path: Path | str, data_config: DataConfig) -> pd.DataFrame:
+    """
+    Прочитать выборку только с нужными колонками и компактными типами.
+
+    Отсутствующие в файле колонки пропускаются (их наличие проверяет
+    валидация данных).
+
+    Args:
+        csv_path: Путь к CSV файлу выборки
+        data_config: Конфигурация данных
+
+    Returns:
+        DataFrame с признаками и целевой переменной
+    """
+    wanted = split_columns(data_config)
+    if has_fresh_binary(csv_path):
+        _, schema_path = binary_paths(csv_path)
+        with open(schema_path) as f:
+            available = {col["name"] for col in json.load(f)["columns"]}
+        df = load_binary(csv_path, [col for col in wanted if col in available])
+    else:
+        df = pd.read_csv(
+            csv_path,
+            usecols=lambda col: col in wanted,
+            dtype=split_dtypes(data_config),
+        )
+    return compact_frame(df, data_config)
+
+
+def memory_per_row(df: pd.DataFrame, data_config: DataConfig) -> dict[str, float]:
+    """
+    Оценить память на строку при полном и компактном чтении выборки.
+
+    Args:
+        df: Данные (или их представительная часть) с типами по умолчанию
+        data_config: Конфигурация данных
+
+    Returns:
+        Словарь с байтами на строку: full (все колонки) и compact
+    """
+    if df.empty:
+        return {"full": 0.0, "compact": 0.0}
+    full = df.memory_usage(deep=True, index=False).sum()
+    compact = compact_frame(df, data_config).memory_usage(deep=True, index=False)
+    return {"full": float(full) / len(df), "compact": float(compact.sum()) / len(df)}
+
+
+def matrix_paths(csv_path: Path | str) -> tuple[Path, Path, Path]:
+    """
+    Получить пути матричного представления выборки.
+
+    Args:
+        csv_path: Путь к CSV файлу выборки
+
+    Returns:
+        Кортеж (матрица признаков .npy, вектор целевой переменной .npy,
+        JSON метаданные)
+    """
+    csv_file = Path(csv_path)
+    stem = csv_file.with_suffix("")
+    return (
+        stem.with_name(stem.name + FEATURES_SUFFIX),
+        stem.with_name(stem.name + TARGET_SUFFIX),
+        stem.with_name(stem.name + MATRIX_SUFFIX),
+    )
+
+
+def save_matrix(csv_path: Path | str, data_config: DataConfig) -> None:
+    """
+    Сохранить C-непрерывную матрицу признаков и вектор цели для memory-map.
+
+    Из бинарного формата матрица собирается по одной колонке, поэтому в
+    памяти одновременно находится только одна колонка; CSV читается один
+    раз (только нужные колонки).
+
+    Args:
+        csv_path: Путь к CSV файлу выборки (сохраненной ранее)
+        data_config: Конфигурация данных
+    """
+    csv_file = Path(csv_path)
+    features_path, target_path, meta_path = matrix_paths(csv_file)
+
+    csv_frame = (
+        None if has_fresh_binary(csv_file) else read_split(csv_file, data_config)
+    )
+
+    def load_column(column: str) -> pd.Series:
+        if csv_frame is not None:
+            return csv_frame[column]
+        return compact_frame(load_binary(csv_file, [column]), data_config)[column]
+
+    target = load_column(data_config.target_column)
+    n_rows, n_features = len(target), len(data_config.feature_columns)
+
+    features = np.lib.format.open_memmap(
+        features_path,
+        mode="w+",
+        dtype=np.dtype(data_config.feature_dtype),
+        shape=(n_rows, n_features),
+    )
+    for j, column in enumerate(data_config.feature_columns):
+        features[:, j] = load_column(column).to_numpy()
+    features.flush()
+    del features
+
+    np.save(target_path, np.ascontiguousarray(target.to_numpy()))
+
+    meta: dict[str, Any] = {
+        "format_version": FORMAT_VERSION,
+        "shape": [n_rows, n_features],
+        "feature_dtype": data_config.feature_dtype,
+        # Настройка из конфигурации; фактический тип хранит сам .npy
+        "target_dtype": data_config.target_dtype,
+        "feature_columns": list(data_config.feature_columns),
+        "target_column": data_config.target_column,
+        "categorical_columns": list(data_config.categorical_columns),
+        "category_levels": data_config.category_levels,
+        "source": _source_fingerprint(csv_file),
+    }
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=2)
+
+
+def load_matrix(
+    csv_path: Path | str, data_config: DataConfig
+) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    Подключиться к матрице признаков и вектору цели через memory-map.
+
+    Массивы открываются только для чтения без копирования: несколько
+    процессов, читающих одну выборку, разделяют одну копию в page cache.
+
+    Args:
+        csv_path: Путь к CSV файлу выборки
+        data_config: Конфигурация данных
+
+    Returns:
+        Кортеж (X, y) или None, если матрица отсутствует, устарела или
+        собрана для других колонок/типов
+    """
+    csv_file = Path(csv_path)
+    features_path, target_path, meta_path = matrix_paths(csv_file)
+    if not (features_path.exists() and target_path.exists() and meta_path.exists()):
+        return None
+
+    with open(meta_path) as f:
+        meta = json.load(f)
+    expected = {
+        "format_version": FORMAT_VERSION,
+        "feature_dtype": data_config.feature_dtype,
+        "target_dtype": data_config.target_dtype,
+        "feature_columns": list(data_config.feature_columns),
+        "target_column": data_config.target_column,
+        "categorical_columns": list(data_config.categorical_columns),
+        "category_levels": data_config.category_levels,
+    }
+    if any(meta.get(key) != value for key, value in expected.items()):
+        return None
+    if csv_file.exists() and not _source_is_fresh(csv_file, meta.get("source")):
+        return None
+
+    features = np.load(features_path, mmap_mode="r")
+    target = np.load(target_path, mmap_mode="r")
+    return features, target
+
+
+def load_xy(
+    csv_path: Path | str, data_config: DataConfig
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Загрузить признаки и цель выборки как массивы NumPy.
+
+    Предпочитает memory-map матрицу (без копирования), иначе читает выборку
+    через read_split.
+
+    Args:
+        csv_path: Путь к CSV файлу выборки
+        data_config: Конфигурация данных
+
+    Returns:
+        Кортеж (X, y)
+    """
+    matrix = load_matrix(csv_path, data_config)
+    if matrix is not None:
+        return matrix
+
+    df = read_split(csv_path, data_config)
+    features = np.ascontiguousarray(
+        df[data_config.feature_columns].to_numpy(dtype=data_config.feature_dtype)
+    )
+    return features, df[data_config.target_column].to_numpy()
+
+
+def _read_column(data: Any, keys: list[str]) -> np.ndarray:
+    """Собрать колонку .npz из ее частей."""
+    if len(keys) == 1:
+        column: np.ndarray = data[keys[0]]
+        return column
+    return np.concatenate([data[key] for key in keys])
+
+
+class _MatrixAppender:
+    """Дописывание строк в конец матрицы признаков и вектора цели.
+
+    Матрица C-непрерывна, поэтому новые строки дописываются в конец .npy, а
+    в заголовке меняется только число строк (numpy оставляет в заголовке
+    место под рост первой оси).
+    """
+
+    def __init__(self, csv_path: Path, data_config: DataConfig) -> None:
+        """
+        Открыть актуальную матрицу выборки для дописывания.
+
+        Args:
+            csv_path: Путь к CSV файлу выборки
+            data_config: Конфигурация данных (совпадает с матрицей)
+        """
+        self._paths = matrix_paths(csv_path)
+        self._data_config = data_config
+        self._files = [open(path, "r+b") for path in self._paths[:2]]
+        self._headers = [_read_npy_header(npy_file) for npy_file in self._files]
+        for npy_file in self._files:
+            npy_file.seek(0, os.SEEK_END)
+
+    def append(self, chunk: pd.DataFrame) -> bool:
+        """
+        Дописать строки чанка.
+
+        Args:
+            chunk: Строки выборки
+
+        Returns:
+            False, если строки не подходят к матрице (она удалена и будет
+            собрана заново)
+        """
+        data_config = self._data_config
+        frame = compact_frame(chunk, data_config)
+        features_dtype, target_dtype = (header[3] for header in self._headers)
+        target = frame[data_config.target_column].to_numpy()
+        if not np.can_cast(target.dtype, target_dtype, casting="safe"):
+            # Цель "auto" больше не помещается в сохраненный целый тип
+            self._abort()
+            return False
+
+        features = np.empty(
+            (len(frame), len(data_config.feature_columns)), dtype=features_dtype
+        )
+        for j, column in enumerate(data_config.feature_columns):
+            features[:, j] = frame[column].to_numpy()
+        self._files[0].write(features.tobytes())
+        self._files[1].write(target.astype(target_dtype).tobytes())
+        self._headers = [
+            (version, end, (shape[0] + len(frame), *shape[1:]), dtype)
+            for version, end, shape, dtype in self._headers
+        ]
+        return True
+
+    def close(self, source: dict[str, Any]) -> None:
+        """
+        Обновить заголовки .npy и метаданные матрицы.
+
+        Args:
+            source: Отпечаток CSV после дописывания
+        """
+        for npy_file, header in zip(self._files, self._headers, strict=True):
+            _write_npy_header(npy_file, *header)
+            npy_file.close()
+        meta_path = self._paths[2]
+        with open(meta_path) as f:
+            meta = json.load(f)
+        meta["shape"] = list(self._headers[0][2])
+        meta["source"] = source
+        with open(meta_path, "w") as f:
+            json.dump(meta, f, indent=2)
+
+    def _abort(self) -> None:
+        """Удалить матрицу: ее соберет save_matrix."""
+        for npy_file in self._files:
+            npy_file.close()
+        for path in self._paths:
+            path.unlink(missing_ok=True)
+
+
+def _read_npy_header(
+    f: IO[bytes],
+) -> tuple[tuple[int, int], int, tuple[int, ...], np.dtype]:
+    """Прочитать заголовок C-непрерывного .npy: (версия, конец, форма, тип)."""
+    version = np.lib.format.read_magic(f)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+    if fortran_order:
+        raise ValueError(f"Матрица должна быть C-непрерывной: {f.name}")
+    return version, f.tell(), shape, dtype
+
+
+def _write_npy_header(
+    f: IO[bytes],
+    version: tuple[int, int],
+    header_end: int,
+    shape: tuple[int, ...],
+    dtype: np.dtype,
+) -> None:
+    """Перезаписать заголовок .npy новой формой, не сдвигая данные."""
+    header = io.BytesIO()
+    fields = {
+        "descr": np.lib.format.dtype_to_descr(dtype),
+        "fortran_order": False,
+        "shape": shape,
+    }
+    if version == (1, 0):
+        np.lib.format.write_array_header_1_0(header, fields)
+    else:
+        np.lib.format.write_array_header_2_0(header, fields)
+    if len(header.getvalue()) != header_end:
+        raise ValueError(f"Заголовок {f.name} не помещается на прежнее место")
+    f.seek(0)
+    f.write(header.getvalue())
+
+
+def _source_fingerprint(csv_file: Path) -> dict[str, Any]:
+    """Отпечаток CSV файла: размер, время изменения и хеш содержимого."""
+    stat = csv_file.stat()
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "digest": file_digest(csv_file),
+    }
+
+
+def _source_is_fresh(csv_file: Path, source: dict[str, Any] | None) -> bool:
+    """
+    Проверить, что CSV не изменился с момента записи отпечатка.
+
+    Совпадение времени изменения - быстрый путь; если оно другое (dvc
+    checkout/pull, копирование, свежий клон), сравнивается хеш содержимого.
+
+    Args:
+        csv_file: Путь к CSV файлу
+        source: Отпечаток из схемы или метаданных матрицы
+
+    Returns:
+        True, если содержимое CSV совпадает с отпечатком
+    """
+    if not source:
+        return False
+    stat = csv_file.stat()
+    if source.get("size") != stat.st_size:
+        return False
+    if source.get("mtime_ns") == stat.st_mtime_ns:
+        return True
+    return bool(source.get("digest") == file_digest(csv_file))
@@ -0,0 +1,161 @@
+"""Контентно-адресуемый кэш подготовленных данных (независимо от DVC)."""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from .config_models import DataConfig
+
+# Версия формата кэша: меняется при изменении логики подготовки данных
+# или формата выходных файлов (2 - профиль в data_stats.json и состоянии,
+# 3 - части колонок в .npz и индекс хешей строк)
+CACHE_VERSION = 3
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_digest(path: Path | str) -> str:
+    """
+    Посчитать BLAKE2b хеш содержимого файла.
+
+    Args:
+        path: Путь к файлу
+
+    Returns:
+        Hex-строка хеша
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while block := f.read(HASH_BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def dataset_cache_key(raw_path: Path | str, data_config: DataConfig) -> str:
+    """
+    Построить ключ кэша по содержимому сырых данных и конфигурации данных.
+
+    Args:
+        raw_path: Путь к сырым данным
+        data_config: Конфигурация данных (test_size, random_state, колонки...)
+
+    Returns:
+        Hex-строка ключа
+    """
+    payload = {
+        "cache_version": CACHE_VERSION,
+        "raw_digest": file_digest(raw_path),
+        # Правила валидации не влияют на подготовленные данные
+        "data_config": data_config.model_dump(mode="json", exclude={"validation"}),
+    }
+    serialized = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(serialized.encode(), digest_size=16).hexdigest()
+
+
+class DatasetCache:
+    """Локальный кэш артефактов подготовки данных, адресуемый ключом."""
+
+    def __init__(self, cache_dir: Path | str = "data/interim/dataset_cache"):
+        """
+        Инициализация кэша.
+
+        Args:
+            cache_dir: Директория для хранения записей кэша
+        """
+        self.cache_dir = Path(cache_dir)
+
+    def entry_dir(self, key: str) -> Path:
+        """
+        Получить директорию записи кэша.
+
+        Args:
+            key: Ключ кэша
+
+        Returns:
+            Путь к директории записи
+        """
+        return self.cache_dir / key
+
+    def has(self, key: str) -> bool:
+        """
+        Проверить наличие записи в кэше.
+
+        Args:
+            key: Ключ кэша
+
+        Returns:
+            True, если запись существует
+        """
+        return (self.entry_dir(key) / "manifest.json").exists()
+
+    def store(self, key: str, files: dict[str, Path]) -> Path:
+        """
+        Сохранить файлы в кэш под ключом.
+
+        Запись сначала собирается во временной директории и затем атомарно
+        переименовывается, поэтому прерванное сохранение не оставляет
+        неполных записей.
+
+        Args:
+            key: Ключ кэша
+            files: Словарь {имя артефакта: путь}; отсутствующие файлы пропускаются
+
+        Returns:
+            Путь к директории записи
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = self.entry_dir(key)
+        tmp_dir = Path(tempfile.mkdtemp(dir=self.cache_dir, prefix=f".{key}."))
+        try:
+            stored = []
+            for name, path in files.items():
+                if path.exists():
+                    shutil.copy2(path, tmp_dir / name)
+                    stored.append(name)
+            with open(tmp_dir / "manifest.json", "w") as f:
+                json.dump({"key": key, "files": stored}, f, indent=2)
+
+            if entry.exists():
+                shutil.rmtree(entry)
+            os.replace(tmp_dir, entry)
+        finally:
+            if tmp_dir.exists():
+                shutil.rmtree(tmp_dir)
+        return entry
+
+    def restore(self, key: str, files: dict[str, Path]) -> bool:
+        """
+        Восстановить файлы из кэша.
+
+        Файлы копируются с сохранением времени изменения (от него зависят
+        отпечатки бинарных форматов). Целевые файлы, которых нет в записи,
+        удаляются, чтобы не оставлять устаревших артефактов.
+
+        Args:
+            key: Ключ кэша
+            files: Словарь {имя артефакта: путь назначения}
+
+        Returns:
+            True при попадании в кэш
+        """
+        if not self.has(key):
+            return False
+
+        entry = self.entry_dir(key)
+        with open(entry / "manifest.json") as f:
+            stored = set(json.load(f)["files"])
+
+        for name, path in files.items():
+            if name in stored:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(entry / name, path)
+            else:
+                path.unlink(missing_ok=True)
+        return True
+
+    def clear(self) -> None:
+        """Удалить все записи кэша."""
+        if self.cache_dir.exists():
+            shutil.rmtree(self.cache_dir)
@@ -0,0 +1,72 @@
+"""Отчет о сдвиге распределений признаков (PSI и статистика KS)."""
+
+from typing import Any
+
+import numpy as np
+
+from .config_models import DriftRules
+from .profiler import ColumnProfiler
+
+# Нижняя граница доли бина в PSI (пустые бины дают бесконечный логарифм)
+PSI_EPSILON = 1e-4
+
+
+def drift_report(
+    expected: ColumnProfiler, actual: ColumnProfiler, rules: DriftRules
+) -> dict[str, Any]:
+    """
+    Сравнить распределения колонок двух профилей.
+
+    Гистограммы обоих профилей переносятся на общую сетку бинов, после чего
+    PSI и KS считаются для всех колонок сразу операциями над матрицами
+    (колонки x бины). Бины PSI - квантили expected, собранные из мелких
+    бинов профиля; KS - максимум разности эмпирических функций
+    распределения на границах мелких бинов.
+
+    Args:
+        expected: Эталонный профиль (train или сохраненный профиль)
+        actual: Сравниваемый профиль (test или текущие данные)
+        rules: Пороги и количество бинов
+
+    Returns:
+        Словарь с PSI, KS и флагом сдвига по колонкам
+    """
+    hist_e, hist_a = expected.aligned_histograms(actual)
+    n_e = np.maximum(hist_e.sum(axis=1, keepdims=True), 1)
+    n_a = np.maximum(hist_a.sum(axis=1, keepdims=True), 1)
+    cdf_e = np.cumsum(hist_e, axis=1) / n_e
+    cdf_a = np.cumsum(hist_a, axis=1) / n_a
+    ks = np.abs(cdf_e - cdf_a).max(axis=1)
+
+    # Мелкий бин попадает в квантильную группу по CDF expected в его середине
+    n_columns, n_groups = len(expected.columns), rules.n_bins
+    middle = cdf_e - hist_e / (2 * n_e)
+    groups = np.minimum((middle * n_groups).astype(np.int64), n_groups - 1)
+    flat = (groups + np.arange(n_columns)[:, None] * n_groups).ravel()
+    shape = (n_columns, n_groups)
+    share_e = np.bincount(flat, weights=hist_e.ravel(), minlength=n_columns * n_groups)
+    share_a = np.bincount(flat, weights=hist_a.ravel(), minlength=n_columns * n_groups)
+    share_e = np.maximum(share_e.reshape(shape) / n_e, PSI_EPSILON)
+    share_a = np.maximum(share_a.reshape(shape) / n_a, PSI_EPSILON)
+    psi = ((share_a - share_e) * np.log(share_a / share_e)).sum(axis=1)
+
+    columns: dict[str, Any] = {}
+    for j, column in enumerate(expected.columns):
+        if not expected.count[j] or not actual.count[j]:
+            columns[column] = {"psi": None, "ks": None, "drift": False}
+            continue
+        columns[column] = {
+            "psi": round(float(psi[j]), 6),
+            "ks": round(float(ks[j]), 6),
+            "drift": bool(psi[j] > rules.psi_threshold or ks[j] > rules.ks_threshold),
+        }
+
+    drifted = [column for column, result in columns.items() if result["drift"]]
+    return {
+        "n_bins": rules.n_bins,
+        "psi_threshold": rules.psi_threshold,
+        "ks_threshold": rules.ks_threshold,
+        "columns": columns,
+        "drifted": drifted,
+        "passed": not drifted,
+    }
@@ -0,0 +1,285 @@
+"""Контентно-адресуемый кэш обученных моделей."""
+
+import hashlib
+import json
+import os
+import pickle  # nosec B403
+import shutil
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from sklearn.base import BaseEstimator
+
+# Версия формата кэша: меняется при изменении формата записей
+FIT_CACHE_VERSION = 1
+
+# Параметры, не влияющие на обученную модель (число потоков)
+IGNORED_PARAMS = ("n_jobs",)
+
+
+def array_digest(*arrays: np.ndarray) -> str:
+    """
+    Посчитать BLAKE2b хеш содержимого массивов (с учетом dtype и формы).
+
+    Args:
+        arrays: Массивы, например матрица признаков и целевая переменная
+
+    Returns:
+        Hex-строка хеша
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.data)
+    return digest.hexdigest()
+
+
+def fit_cache_key(data_digest: str, model: "BaseEstimator") -> str:
+    """
+    Построить ключ кэша по данным, классу и параметрам модели, версии sklearn.
+
+    Параметры берутся из get_params() уже созданной модели, поэтому значения
+    по умолчанию и способ их передачи не влияют на ключ. IGNORED_PARAMS
+    в ключ не входят.
+
+    Args:
+        data_digest: Хеш обучающих данных (array_digest)
+        model: Необученная модель
+
+    Returns:
+        Hex-строка ключа
+    """
+    import sklearn
+
+    params = {
+        name: value
+        for name, value in model.get_params(deep=False).items()
+        if name not in IGNORED_PARAMS
+    }
+    payload = {
+        "cache_version": FIT_CACHE_VERSION,
+        "data": data_digest,
+        "estimator": f"{type(model).__module__}.{type(model).__qualname__}",
+        "params": params,
+        "sklearn": sklearn.__version__,
+    }
+    serialized = json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), default=repr
+    )
+    return hashlib.blake2b(serialized.encode(), digest_size=16).hexdigest()
+
+
+class FitCache:
+    """Локальный кэш обученных моделей с учетом попаданий и сэкономленного времени."""
+
+    def __init__(self, cache_dir: Path | str = "models/fit_cache"):
+        """
+        Инициализация кэша.
+
+        Args:
+            cache_dir: Директория для хранения записей кэша
+        """
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self.saved_cpu_seconds = 0.0
+
+    def entry_path(self, key: str) -> Path:
+        """
+        Получить путь к записи кэша.
+
+        Args:
+            key: Ключ кэша
+
+        Returns:
+            Путь к файлу записи
+        """
+        return self.cache_dir / f"{key}.pkl"
+
+    def load(self, key: str) -> tuple["BaseEstimator", float, float] | None:
+        """
+        Загрузить модель из кэша.
+
+        Поврежденная запись считается промахом.
+
+        Args:
+            key: Ключ кэша
+
+        Returns:
+            (модель, время и процессорное время исходного обучения) или None
+        """
+        path = self.entry_path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)  # nosec B301
+            return (
+                entry["model"],
+                float(entry["fit_seconds"]),
+                float(entry.get("cpu_seconds", 0.0)),
+            )
+        except Exception:
+            return None
+
+    def store(
+        self,
+        key: str,
+        model: "BaseEstimator",
+        fit_seconds: float,
+        cpu_seconds: float = 0.0,
+    ) -> Path:
+        """
+        Сохранить обученную модель в кэш.
+
+        Запись пишется во временный файл и атомарно переименовывается.
+
+        Args:
+            key: Ключ кэша
+            model: Обученная модель
+            fit_seconds: Время обучения в секундах
+            cpu_seconds: Процессорное время обучения в секундах
+
+        Returns:
+            Путь к файлу записи
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.entry_path(key)
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{key}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                entry = {
+                    "model": model,
+                    "fit_seconds": fit_seconds,
+                    "cpu_seconds": cpu_seconds,
+                }
+                pickle.dump(entry, f)  # nosec B301
+            os.replace(tmp_name, path)
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+        return path
+
+    def record(
+        self, hit: bool, fit_seconds: float = 0.0, cpu_seconds: float = 0.0
+    ) -> None:
+        """
+        Учесть обращение к кэшу.
+
+        Args:
+            hit: Попадание в кэш
+            fit_seconds: Сэкономленное время обучения при попадании
+            cpu_seconds: Сэкономленное процессорное время при попадании
+        """
+        if hit:
+            self.hits += 1
+            self.saved_seconds += fit_seconds
+            self.saved_cpu_seconds += cpu_seconds
+        else:
+            self.misses += 1
+
+    def fit(
+        self,
+        model: "BaseEstimator",
+        X: np.ndarray,
+        y: np.ndarray,
+        data_digest: str | None = None,
+    ) -> tuple["BaseEstimator", bool]:
+        """
+        Обучить модель или взять обученную из кэша.
+
+        Args:
+            model: Необученная модель
+            X: Признаки обучающей выборки
+            y: Целевая переменная обучающей выборки
+            data_digest: Готовый array_digest(X, y), чтобы не хешировать повторно
+
+        Returns:
+            (обученная модель, попадание в кэш)
+        """
+        key = fit_cache_key(data_digest or array_digest(X, y), model)
+        cached = self.load(key)
+        if cached is not None:
+            self.record(True, cached[1], cached[2])
+            return cached[0], True
+
+        start, cpu_start = time.perf_counter(), time.process_time()
+        model.fit(X, y)
+        self.store(
+            key,
+            model,
+            time.perf_counter() - start,
+            time.process_time() - cpu_start,
+        )
+        self.record(False)
+        return model, False
+
+    def fit_group(
+        self,
+        models: list["BaseEstimator"],
+        fit_all: Callable[[], list["BaseEstimator"]],
+        data_digest: str,
+    ) -> tuple[list["BaseEstimator"], bool]:
+        """
+        Обучить группу моделей совместно или взять их все из кэша.
+
+        Каждая модель группы хранится под своим ключом, поэтому записи
+        совместимы с обучением моделей по одной. Время и процессорное время
+        совместного обучения делятся поровну между моделями.
+
+        Args:
+            models: Необученные модели группы (для ключей)
+            fit_all: Функция совместного обучения; возвращает модели в том же порядке
+            data_digest: array_digest обучающих данных
+
+        Returns:
+            (обученные модели, попадание в кэш для всей группы)
+        """
+        keys = [fit_cache_key(data_digest, model) for model in models]
+        cached = [entry for entry in map(self.load, keys) if entry is not None]
+        if len(cached) == len(keys):
+            for _, fit_seconds, cpu_seconds in cached:
+                self.record(True, fit_seconds, cpu_seconds)
+            return [model for model, _, _ in cached], True
+
+        start, cpu_start = time.perf_counter(), time.process_time()
+        fitted = fit_all()
+        share = (time.perf_counter() - start) / len(fitted)
+        cpu_share = (time.process_time() - cpu_start) / len(fitted)
+        for key, model in zip(keys, fitted, strict=True):
+            self.store(key, model, share, cpu_share)
+            self.record(False)
+        return fitted, False
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Статистика обращений к кэшу.
+
+        Returns:
+            Словарь с количеством попаданий, промахов и сэкономленным временем
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "saved_seconds": round(self.saved_seconds, 3),
+        }
+
+    def summary(self) -> str:
+        """Строка со статистикой обращений к кэшу для вывода."""
+        return (
+            f"Кэш обучения: попаданий {self.hits}, промахов {self.misses}, "
+            f"сэкономлено {self.saved_seconds:.1f}с"
+        )
+
+    def clear(self) -> None:
+        """Удалить все записи кэша."""
+        if self.cache_dir.exists():
+            shutil.rmtree(self.cache_dir)
@@ -0,0 +1,68 @@
+"""Метрики регрессии по одному вычислению остатков, в том числе для пакета моделей."""
+
+import numpy as np
+
+# Метрики, которые возвращают regression_metrics и regression_metrics_batch
+REGRESSION_METRICS = ("mse", "rmse", "mae", "r2", "max_error")
+
+
+def regression_metrics_batch(
+    y_true: np.ndarray, y_pred: np.ndarray
+) -> dict[str, np.ndarray]:
+    """
+    Посчитать метрики регрессии для пакета предсказаний одним вызовом.
+
+    Остатки считаются один раз, сумма их квадратов - без промежуточного
+    массива. R² при постоянной целевой переменной - как в sklearn: 1 для
+    точного предсказания, иначе 0. Входные данные не проверяются на NaN.
+
+    Args:
+        y_true: Целевая переменная (n_rows,) или по выборкам (..., n_rows),
+            например бутстреп-выборки строк
+        y_pred: Предсказания (..., n_rows), например (n_models, n_rows)
+
+    Returns:
+        Словарь mse, rmse, mae, r2, max_error с массивами формы
+        broadcast(y_true, y_pred) без последней оси
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    y_pred = np.asarray(y_pred, dtype=np.float64)
+    n_rows = y_true.shape[-1] if y_true.ndim else 0
+    if n_rows == 0 or y_pred.ndim == 0 or y_pred.shape[-1] != n_rows:
+        raise ValueError(
+            f"Incompatible shapes: y_true {y_true.shape}, y_pred {y_pred.shape}"
+        )
+
+    residuals = y_pred - y_true
+    sse = np.einsum("...i,...i->...", residuals, residuals)
+    abs_residuals = np.abs(residuals, out=residuals)
+    centered = y_true - y_true.mean(axis=-1, keepdims=True)
+    sst = np.broadcast_to(np.einsum("...i,...i->...", centered, centered), sse.shape)
+
+    mse = sse / n_rows
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r2 = np.where(sst > 0, 1.0 - sse / sst, np.where(sse == 0, 1.0, 0.0))
+    return {
+        "mse": mse,
+        "rmse": np.sqrt(mse),
+        "mae": abs_residuals.mean(axis=-1),
+        "r2": r2,
+        "max_error": abs_residuals.max(axis=-1),
+    }
+
+
+def regression_metrics(y_true: np.ndarray, y_pred: np.ndarray) -> dict[str, float]:
+    """
+    Посчитать метрики регрессии одной модели.
+
+    Args:
+        y_true: Целевая переменная (n_rows,)
+        y_pred: Предсказания (n_rows,)
+
+    Returns:
+        Словарь mse, rmse, mae, r2, max_error
+    """
+    if np.ndim(y_pred) != 1:
+        raise ValueError(f"Expected 1-D predictions, got shape {np.shape(y_pred)}")
+    metrics = regression_metrics_batch(y_true, y_pred)
+    return {name: float(metrics[name]) for name in REGRESSION_METRICS}
@@ -0,0 +1,108 @@
+"""Реестр моделей: тип модели -> оценщик scikit-learn с ленивым импортом."""
+
+import importlib
+from functools import cache
+from typing import TYPE_CHECKING, Any
+
+from .config_models import (
+    AdaBoostParams,
+    DecisionTreeParams,
+    ElasticNetParams,
+    GradientBoostingParams,
+    KNNParams,
+    LassoParams,
+    LinearModelParams,
+    ModelParams,
+    RandomForestParams,
+    RidgeParams,
+    SVRParams,
+)
+
+if TYPE_CHECKING:
+    from sklearn.base import BaseEstimator
+
+# Тип модели -> (модуль, класс оценщика, модель параметров).
+# Модули sklearn импортируются только при первом обращении к типу модели.
+MODEL_REGISTRY: dict[str, tuple[str, str, type[ModelParams]]] = {
+    "linear": ("sklearn.linear_model", "LinearRegression", LinearModelParams),
+    "ridge": ("sklearn.linear_model", "Ridge", RidgeParams),
+    "lasso": ("sklearn.linear_model", "Lasso", LassoParams),
+    "elasticnet": ("sklearn.linear_model", "ElasticNet", ElasticNetParams),
+    "knn": ("sklearn.neighbors", "KNeighborsRegressor", KNNParams),
+    "svr": ("sklearn.svm", "SVR", SVRParams),
+    "dt": ("sklearn.tree", "DecisionTreeRegressor", DecisionTreeParams),
+    "rf": ("sklearn.ensemble", "RandomForestRegressor", RandomForestParams),
+    "ada": ("sklearn.ensemble", "AdaBoostRegressor", AdaBoostParams),
+    "gb": ("sklearn.ensemble", "GradientBoostingRegressor", GradientBoostingParams),
+}
+
+MODEL_TYPES = tuple(MODEL_REGISTRY)
+
+
+def _spec(model_type: str) -> tuple[str, str, type[ModelParams]]:
+    """Запись реестра для типа модели."""
+    if model_type not in MODEL_REGISTRY:
+        raise ValueError(f"Unknown model type: {model_type}")
+    return MODEL_REGISTRY[model_type]
+
+
+@cache
+def get_estimator_class(model_type: str) -> type["BaseEstimator"]:
+    """
+    Получить класс оценщика, импортировав его модуль при первом обращении.
+
+    Args:
+        model_type: Тип модели
+
+    Returns:
+        Класс оценщика scikit-learn
+    """
+    module_name, class_name, _ = _spec(model_type)
+    estimator_class: type[BaseEstimator] = getattr(
+        importlib.import_module(module_name), class_name
+    )
+    return estimator_class
+
+
+def validate_params(model_type: str, params: dict[str, Any]) -> dict[str, Any]:
+    """
+    Проверить параметры модели через pydantic модель параметров.
+
+    Известные параметры проверяются и приводятся к нужным типам, значения по
+    умолчанию не добавляются; неизвестные передаются оценщику как есть.
+
+    Args:
+        model_type: Тип модели
+        params: Параметры модели
+
+    Returns:
+        Проверенные параметры
+
+    Raises:
+        pydantic.ValidationError: Если значения параметров недопустимы
+    """
+    _, _, params_model = _spec(model_type)
+    validated = params_model.model_validate(params)
+    return {**params, **validated.model_dump(exclude_unset=True)}
+
+
+def get_model(
+    model_type: str, params: dict[str, Any] | None = None, random_state: int = 42
+) -> "BaseEstimator":
+    """
+    Создать модель по типу.
+
+    Args:
+        model_type: Тип модели
+        params: Параметры модели
+        random_state: Seed для моделей с random_state, если он не задан в params
+
+    Returns:
+        Объект модели scikit-learn
+    """
+    params = validate_params(model_type, params or {})
+    model = get_estimator_class(model_type)(**params)
+    # Устанавливаем random_state только для моделей, которые его поддерживают
+    if "random_state" in model.get_params() and "random_state" not in params:
+        model.set_params(random_state=random_state)
+    return model
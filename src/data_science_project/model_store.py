@@ -0,0 +1,128 @@
+"""Сохранение и загрузка моделей с выбором кодека сериализации."""
+
+import io
+import json
+import lzma
+import pickle  # nosec B403
+import platform
+import struct
+import zlib
+from pathlib import Path
+from typing import Any
+
+from .run_manifest import write_atomic
+
+# Версия формата файла модели: меняется при изменении заголовка
+MODEL_FORMAT_VERSION = 1
+
+# Кодеки: raw - pickle, zlib/lzma - сжатый pickle, joblib - массивы numpy
+# отдельными блоками, которые при загрузке отображаются в память (mmap)
+MODEL_CODECS = ("raw", "zlib", "lzma", "joblib")
+DEFAULT_CODEC = "joblib"
+
+# Заголовок raw/zlib/lzma: сигнатура, длина JSON метаданных, метаданные
+_MAGIC = b"DSPM"
+_HEADER = struct.Struct("<4sI")
+
+
+def model_format(model: Any, codec: str, level: int | None = None) -> dict[str, Any]:
+    """
+    Метаданные формата файла модели.
+
+    Args:
+        model: Модель
+        codec: Кодек сериализации
+        level: Уровень сжатия (None - по умолчанию кодека)
+
+    Returns:
+        Словарь format_version, codec, level, model_class и версий библиотек
+    """
+    import numpy
+    import sklearn
+
+    return {
+        "format_version": MODEL_FORMAT_VERSION,
+        "codec": codec,
+        "level": level,
+        "model_class": f"{type(model).__module__}.{type(model).__qualname__}",
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "sklearn": sklearn.__version__,
+    }
+
+
+def save_model(
+    model: Any,
+    path: Path | str,
+    codec: str = DEFAULT_CODEC,
+    level: int | None = None,
+) -> dict[str, Any]:
+    """
+    Сохранить модель атомарно выбранным кодеком.
+
+    Метаданные формата записываются в сам файл, поэтому load_model не
+    нуждается в параметрах сохранения.
+
+    Args:
+        model: Модель
+        path: Путь к файлу модели
+        codec: Кодек из MODEL_CODECS
+        level: Уровень сжатия zlib (0-9) или lzma (preset 0-9)
+
+    Returns:
+        Метаданные формата и size_bytes - размер файла
+    """
+    if codec not in MODEL_CODECS:
+        raise ValueError(f"Unknown codec {codec!r}, expected one of {MODEL_CODECS}")
+    meta = model_format(model, codec, level)
+    if codec == "joblib":
+        # joblib - обязательная зависимость scikit-learn
+        import joblib
+
+        buffer = io.BytesIO()
+        # Без сжатия: только так массивы можно отобразить в память при загрузке
+        joblib.dump({"format": meta, "model": model}, buffer, compress=0)
+        content = buffer.getvalue()
+    else:
+        payload = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+        if codec == "zlib":
+            payload = zlib.compress(payload, 6 if level is None else level)
+        elif codec == "lzma":
+            payload = lzma.compress(payload, preset=level)
+        header = json.dumps(meta, sort_keys=True).encode()
+        content = _HEADER.pack(_MAGIC, len(header)) + header + payload
+    write_atomic(path, content)
+    return {**meta, "size_bytes": len(content)}
+
+
+def load_model(path: Path | str, mmap: bool = True) -> tuple[Any, dict[str, Any]]:
+    """
+    Загрузить модель, сохраненную save_model или обычным pickle.dump.
+
+    Args:
+        path: Путь к файлу модели
+        mmap: Отобразить массивы модели joblib в память только для чтения
+
+    Returns:
+        (модель, метаданные формата); для файла pickle.dump - codec pickle
+    """
+    path = Path(path)
+    with open(path, "rb") as f:
+        prefix = f.read(_HEADER.size)
+        if len(prefix) == _HEADER.size and prefix[:4] == _MAGIC:
+            _, header_size = _HEADER.unpack(prefix)
+            meta = json.loads(f.read(header_size))
+            payload = f.read()
+            if meta["codec"] == "zlib":
+                payload = zlib.decompress(payload)
+            elif meta["codec"] == "lzma":
+                payload = lzma.decompress(payload)
+            return pickle.loads(payload), meta  # nosec B301
+
+    # Файл joblib или модель, сохраненная pickle.dump до появления хранилища
+    import joblib
+
+    loaded = joblib.load(path, mmap_mode="r" if mmap else None)  # nosec B301
+    if isinstance(loaded, dict) and set(loaded) == {"format", "model"}:
+        return loaded["model"], loaded["format"]
+    return loaded, {"codec": "pickle"}
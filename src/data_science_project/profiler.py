@@ -0,0 +1,392 @@
+"""Векторизованный профилировщик колонок с объединяемым состоянием."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+# Значащих цифр в отчете: суммы по чанкам и по всей выборке отличаются
+# только ошибкой округления, которую округление убирает
+REPORT_DIGITS = 10
+# Минимальная ширина диапазона относительно модуля значений: индексы бинов
+# (значение / ширина) остаются меньше 2**51 и точно представимы в int64
+RELATIVE_SPAN = 2.0**-40
+
+
+def _bin_exponent(lo: np.ndarray, hi: np.ndarray, n_bins: int) -> np.ndarray:
+    """Степень двойки ширины бина, при которой [lo, hi] влезает в n_bins бинов.
+
+    Ширина диапазона не меньше RELATIVE_SPAN от модуля значений, а для
+    колонки из одних нулей равна 1, поэтому постоянная колонка не дает
+    бесконечных индексов бинов. Функция монотонна по ширине и модулю
+    диапазона, поэтому сетка объединения профилей всегда не мельче сеток
+    частей.
+    """
+    scale = np.maximum(np.abs(lo), np.abs(hi))
+    span = np.maximum(hi - lo, scale * RELATIVE_SPAN)
+    span = np.where(span > 0, span, 1.0)
+    return np.asarray(np.ceil(np.log2(span / (n_bins - 1))), dtype=np.int64)
+
+
+class ColumnProfiler:
+    """Профиль числовых колонок: count, nulls, min, max, mean, std, квантили.
+
+    Все статистики обновляются за один векторизованный проход по матрице
+    чанка. Гистограммы хранятся с шириной бина, равной степени двойки, и
+    границами, кратными ширине, поэтому два профиля объединяются точно
+    (результат не зависит от разбиения данных на чанки).
+    """
+
+    def __init__(self, columns: list[str], n_bins: int = 1024) -> None:
+        """
+        Инициализация профилировщика.
+
+        Args:
+            columns: Профилируемые колонки
+            n_bins: Количество бинов внутренней гистограммы
+        """
+        n_columns = len(columns)
+        self.columns = list(columns)
+        self.n_bins = n_bins
+        self.count = np.zeros(n_columns, dtype=np.int64)
+        self.nulls = np.zeros(n_columns, dtype=np.int64)
+        self.min = np.full(n_columns, np.inf)
+        self.max = np.full(n_columns, -np.inf)
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+        self.exponent = np.zeros(n_columns, dtype=np.int64)
+        self.origin = np.zeros(n_columns, dtype=np.int64)
+        self.hist = np.zeros((n_columns, n_bins), dtype=np.int64)
+
+    def update_frame(self, df: pd.DataFrame) -> None:
+        """
+        Обновить профиль колонками DataFrame.
+
+        Args:
+            df: Данные, содержащие профилируемые колонки
+        """
+        frame = df[self.columns]
+        non_numeric = frame.select_dtypes(exclude="number").columns
+        if len(non_numeric):
+            frame = frame.assign(
+                **{
+                    col: pd.to_numeric(frame[col], errors="coerce")
+                    for col in non_numeric
+                }
+            )
+        self.update(frame.to_numpy(dtype=np.float64))
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Обновить профиль матрицей значений.
+
+        Args:
+            values: Матрица (строки x колонки) в порядке self.columns
+        """
+        values = np.asarray(values, dtype=np.float64)
+        finite = np.isfinite(values)
+        count = finite.sum(axis=0)
+        if not count.any():
+            self.nulls += len(values) - count
+            return
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            lo = np.where(finite, values, np.inf).min(axis=0)
+            hi = np.where(finite, values, -np.inf).max(axis=0)
+            mean = np.where(finite, values, 0.0).sum(axis=0) / count
+            deviation = np.where(finite, values - mean, 0.0)
+        m2 = (deviation**2).sum(axis=0)
+
+        other = ColumnProfiler(self.columns, self.n_bins)
+        other.count, other.nulls = count, len(values) - count
+        other.min, other.max = lo, hi
+        other.mean, other.m2 = np.nan_to_num(mean), m2
+        present = count > 0
+        other.exponent = np.where(
+            present, _bin_exponent(lo, hi, self.n_bins), other.exponent
+        )
+        width = np.ldexp(1.0, other.exponent)
+        other.origin = np.where(present, np.floor(lo / width), 0).astype(np.int64)
+
+        # Одна гистограмма на все колонки: смещаем индексы бинов колонки j на
+        # j * n_bins и считаем общий bincount
+        with np.errstate(invalid="ignore"):
+            bins = np.floor(values / width) - other.origin
+        rows, cols = np.nonzero(finite)
+        flat = bins[rows, cols].astype(np.int64) + cols * self.n_bins
+        other.hist = np.bincount(
+            flat, minlength=len(self.columns) * self.n_bins
+        ).reshape(len(self.columns), self.n_bins)
+
+        self.merge(other)
+
+    def merge(self, other: "ColumnProfiler") -> "ColumnProfiler":
+        """
+        Объединить с другим профилем тех же колонок (in-place).
+
+        Args:
+            other: Профиль другой части данных
+
+        Returns:
+            Этот профиль
+        """
+        if other.columns != self.columns or other.n_bins != self.n_bins:
+            raise ValueError("Профили построены для разных колонок или бинов")
+
+        total = self.count + other.count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = other.mean - self.mean
+            mean = self.mean + np.where(total > 0, delta * other.count / total, 0.0)
+            m2 = self.m2 + other.m2
+            m2 += np.where(total > 0, delta**2 * self.count * other.count / total, 0.0)
+
+        exponent, origin = self._common_grid(other)
+        hist = self._rebin(self, exponent, origin) + self._rebin(
+            other, exponent, origin
+        )
+
+        self.count, self.nulls = total, self.nulls + other.nulls
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self.mean, self.m2 = mean, m2
+        self.exponent, self.origin, self.hist = exponent, origin, hist
+        return self
+
+    def aligned_histograms(
+        self, other: "ColumnProfiler"
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Гистограммы двух профилей на общей сетке бинов.
+
+        Args:
+            other: Профиль тех же колонок
+
+        Returns:
+            Кортеж (гистограмма этого профиля, гистограмма other) формы
+            (колонки x n_bins) с совпадающими границами бинов
+        """
+        if other.columns != self.columns or other.n_bins != self.n_bins:
+            raise ValueError("Профили построены для разных колонок или бинов")
+        exponent, origin = self._common_grid(other)
+        return (
+            self._rebin(self, exponent, origin),
+            self._rebin(other, exponent, origin),
+        )
+
+    def select(self, columns: list[str]) -> "ColumnProfiler":
+        """
+        Профиль подмножества колонок.
+
+        Args:
+            columns: Колонки (должны присутствовать в профиле)
+
+        Returns:
+            Новый профилировщик
+        """
+        idx = [self.columns.index(col) for col in columns]
+        profiler = ColumnProfiler(columns, self.n_bins)
+        for name in (
+            "count",
+            "nulls",
+            "min",
+            "max",
+            "mean",
+            "m2",
+            "exponent",
+            "origin",
+        ):
+            setattr(profiler, name, getattr(self, name)[idx])
+        profiler.hist = self.hist[idx]
+        return profiler
+
+    def _common_grid(self, other: "ColumnProfiler") -> tuple[np.ndarray, np.ndarray]:
+        """Сетка бинов (степень двойки ширины, начало), покрывающая оба профиля."""
+        lo = np.minimum(self.min, other.min)
+        hi = np.maximum(self.max, other.max)
+        present = (self.count + other.count) > 0
+        lo_present = np.where(present, lo, 0.0)
+        exponent = np.where(
+            present,
+            _bin_exponent(lo_present, np.where(present, hi, 0.0), self.n_bins),
+            0,
+        )
+        # Пустые профили не участвуют в выборе сетки
+        for part in (self, other):
+            exponent = np.where(
+                part.count > 0, np.maximum(exponent, part.exponent), exponent
+            )
+        origin = np.floor(lo_present / np.ldexp(1.0, exponent)).astype(np.int64)
+        return exponent, origin
+
+    def _rebin(
+        self, profile: "ColumnProfiler", exponent: np.ndarray, origin: np.ndarray
+    ) -> np.ndarray:
+        """Перенести гистограмму профиля на более крупную сетку бинов."""
+        shift = np.maximum(exponent - profile.exponent, 0)
+        absolute = profile.origin[:, None] + np.arange(self.n_bins)[None, :]
+        target = (absolute >> shift[:, None]) - origin[:, None]
+        rows = np.nonzero(profile.hist)
+        if not len(rows[0]):
+            return np.zeros_like(profile.hist)
+        flat = target[rows] + rows[0] * self.n_bins
+        return (
+            np.bincount(flat, weights=profile.hist[rows], minlength=self.hist.size)
+            .astype(np.int64)
+            .reshape(self.hist.shape)
+        )
+
+    def quantiles(self, qs: tuple[float, ...] = DEFAULT_QUANTILES) -> np.ndarray:
+        """
+        Приближенные квантили по гистограмме (погрешность - ширина бина).
+
+        Args:
+            qs: Уровни квантилей
+
+        Returns:
+            Матрица (колонки x квантили)
+        """
+        result = np.full((len(self.columns), len(qs)), np.nan)
+        cumulative = np.cumsum(self.hist, axis=1)
+        width = np.ldexp(1.0, self.exponent)
+        for j in np.nonzero(self.count)[0]:
+            ranks = np.asarray(qs) * self.count[j]
+            idx = np.minimum(
+                np.searchsorted(cumulative[j], ranks, side="left"), self.n_bins - 1
+            )
+            before = np.where(idx > 0, cumulative[j][idx - 1], 0)
+            inside = self.hist[j][idx]
+            fraction = np.where(inside > 0, (ranks - before) / np.maximum(inside, 1), 0)
+            left = (self.origin[j] + idx) * width[j]
+            result[j] = np.clip(left + fraction * width[j], self.min[j], self.max[j])
+        return result
+
+    def histogram(self, j: int, n_bins: int = 20) -> dict[str, list[Any]]:
+        """
+        Компактная гистограмма колонки с равными бинами между min и max.
+
+        Args:
+            j: Индекс колонки
+            n_bins: Количество бинов
+
+        Returns:
+            Словарь с границами бинов и количествами
+        """
+        if self.count[j] == 0:
+            return {"edges": [], "counts": []}
+        lo, hi = self.min[j], self.max[j]
+        edges = np.linspace(lo, hi, n_bins + 1)
+        width = np.ldexp(1.0, self.exponent[j])
+        centers = (self.origin[j] + np.arange(self.n_bins) + 0.5) * width
+        idx = np.clip(np.searchsorted(edges, centers, side="right") - 1, 0, n_bins - 1)
+        counts = np.bincount(idx, weights=self.hist[j], minlength=n_bins)
+        return {
+            "edges": [_round(edge) for edge in edges],
+            "counts": counts.astype(np.int64).tolist(),
+        }
+
+    def to_dict(self, qs: tuple[float, ...] = DEFAULT_QUANTILES) -> dict[str, Any]:
+        """
+        Сформировать отчет по колонкам.
+
+        Args:
+            qs: Уровни квантилей
+
+        Returns:
+            Словарь {колонка: статистики}
+        """
+        quantiles = self.quantiles(qs)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(self.m2 / np.maximum(self.count - 1, 1))
+
+        report: dict[str, Any] = {}
+        for j, column in enumerate(self.columns):
+            has_values = bool(self.count[j])
+            report[column] = {
+                "count": int(self.count[j]),
+                "nulls": int(self.nulls[j]),
+                "min": _round(self.min[j]) if has_values else None,
+                "max": _round(self.max[j]) if has_values else None,
+                "mean": _round(self.mean[j]) if has_values else None,
+                "std": _round(std[j]) if has_values else None,
+                "quantiles": {
+                    str(q): _round(value) if has_values else None
+                    for q, value in zip(qs, quantiles[j], strict=True)
+                },
+                "histogram": self.histogram(j),
+            }
+        return report
+
+    def state_dict(self) -> dict[str, Any]:
+        """
+        Сериализуемое состояние профиля (для объединения между запусками).
+
+        Returns:
+            JSON-совместимый словарь
+        """
+        return {
+            "columns": self.columns,
+            "n_bins": self.n_bins,
+            "count": self.count.tolist(),
+            "nulls": self.nulls.tolist(),
+            "min": self.min.tolist(),
+            "max": self.max.tolist(),
+            "mean": self.mean.tolist(),
+            "m2": self.m2.tolist(),
+            "exponent": self.exponent.tolist(),
+            "origin": self.origin.tolist(),
+            "hist": {
+                str(j): [idx.tolist(), self.hist[j][idx].tolist()]
+                for j in range(len(self.columns))
+                for idx in [np.nonzero(self.hist[j])[0]]
+            },
+        }
+
+    @classmethod
+    def from_state_dict(cls, state: dict[str, Any]) -> "ColumnProfiler":
+        """
+        Восстановить профиль из состояния.
+
+        Args:
+            state: Результат state_dict()
+
+        Returns:
+            Профилировщик
+        """
+        profiler = cls(state["columns"], state["n_bins"])
+        profiler.count = np.asarray(state["count"], dtype=np.int64)
+        profiler.nulls = np.asarray(state["nulls"], dtype=np.int64)
+        profiler.min = np.asarray(state["min"], dtype=np.float64)
+        profiler.max = np.asarray(state["max"], dtype=np.float64)
+        profiler.mean = np.asarray(state["mean"], dtype=np.float64)
+        profiler.m2 = np.asarray(state["m2"], dtype=np.float64)
+        profiler.exponent = np.asarray(state["exponent"], dtype=np.int64)
+        profiler.origin = np.asarray(state["origin"], dtype=np.int64)
+        for j, (idx, counts) in state["hist"].items():
+            profiler.hist[int(j), idx] = counts
+        return profiler
+
+
+def load_profile(path: Path | str) -> ColumnProfiler:
+    """
+    Загрузить сохраненный профиль.
+
+    Поддерживается как файл с результатом state_dict(), так и состояние
+    подготовки данных (prepare_state.json), где профиль лежит в ключе profile.
+
+    Args:
+        path: Путь к JSON файлу
+
+    Returns:
+        Профилировщик
+    """
+    with open(path) as f:
+        state = json.load(f)
+    return ColumnProfiler.from_state_dict(state.get("profile", state))
+
+
+def _round(value: float) -> float:
+    """Округлить значение до REPORT_DIGITS значащих цифр."""
+    return float(f"{value:.{REPORT_DIGITS}g}")
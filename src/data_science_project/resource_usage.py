@@ -0,0 +1,130 @@
+"""Замер времени, процессорного времени и памяти обучения и предсказания."""
+
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+
+def peak_rss_mb() -> float | None:
+    """
+    Пиковый объем резидентной памяти процесса в мегабайтах.
+
+    Returns:
+        Пик RSS или None, если платформа его не сообщает
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux сообщает килобайты, macOS - байты
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def reset_peak_rss() -> bool:
+    """
+    Сбросить пик RSS процесса (Linux), чтобы замерять пик отдельной задачи.
+
+    Returns:
+        True, если пик сброшен; иначе пик считается с начала процесса
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        return False
+    return True
+
+
+class UsageMeter:
+    """Замер стоимости модели по фазам: обучение (fit) и предсказание (predict)."""
+
+    def __init__(self, reset_peak: bool = True):
+        """
+        Инициализация замера.
+
+        Args:
+            reset_peak: Сбросить пик RSS процесса в начале замера
+        """
+        if reset_peak:
+            reset_peak_rss()
+        self.wall: dict[str, float] = {}
+        self.cpu_seconds = 0.0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Замерить время и процессорное время блока.
+
+        Args:
+            name: Фаза (load, fit, predict)
+        """
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.wall[name] = self.wall.get(name, 0.0) + time.perf_counter() - wall
+            self.cpu_seconds += time.process_time() - cpu
+
+    def charge_cached_fit(self, fit_seconds: float, cpu_seconds: float) -> None:
+        """
+        Учесть стоимость исходного обучения модели, взятой из кэша обучения.
+
+        Args:
+            fit_seconds: Время исходного обучения (заменяет время загрузки)
+            cpu_seconds: Процессорное время исходного обучения
+        """
+        self.wall["fit"] = fit_seconds
+        self.cpu_seconds += cpu_seconds
+
+    def split(self, n: int) -> "UsageMeter":
+        """
+        Доля замера одной из n моделей, обученных или предсказанных совместно.
+
+        Args:
+            n: Количество моделей
+
+        Returns:
+            Новый замер с временами, поделенными на n
+        """
+        share = UsageMeter(reset_peak=False)
+        share.wall = {name: seconds / n for name, seconds in self.wall.items()}
+        share.cpu_seconds = self.cpu_seconds / n
+        return share
+
+    def summary(
+        self, predict_rows: int = 0, model_size: int | None = None
+    ) -> dict[str, float]:
+        """
+        Поля стоимости модели для файла метрик.
+
+        Процессорное время включает все потоки процесса (BLAS, n_jobs).
+
+        Args:
+            predict_rows: Количество строк, на которых замерено предсказание
+            model_size: Размер сериализованной модели в байтах
+
+        Returns:
+            Словарь load_seconds, fit_seconds, predict_seconds,
+            predict_latency_us, cpu_seconds, peak_rss_mb, model_size_bytes
+            (что было замерено)
+        """
+        summary: dict[str, float] = {}
+        if "load" in self.wall:
+            summary["load_seconds"] = self.wall["load"]
+        if "fit" in self.wall:
+            summary["fit_seconds"] = self.wall["fit"]
+        if "predict" in self.wall:
+            summary["predict_seconds"] = self.wall["predict"]
+            if predict_rows:
+                summary["predict_latency_us"] = (
+                    self.wall["predict"] / predict_rows * 1e6
+                )
+        summary["cpu_seconds"] = self.cpu_seconds
+        peak = peak_rss_mb()
+        if peak is not None:
+            summary["peak_rss_mb"] = peak
+        if model_size is not None:
+            summary["model_size_bytes"] = model_size
+        return summary
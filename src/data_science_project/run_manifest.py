@@ -0,0 +1,190 @@
+"""Журнал выполнения экспериментов для возобновления прерванных прогонов."""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from .dataset_cache import file_digest
+
+# Версия формата журнала: меняется при изменении формата записей
+MANIFEST_VERSION = 1
+
+
+def config_hash(exp: dict[str, Any], data_digest: str | None = None) -> str:
+    """
+    Посчитать хеш конфигурации эксперимента.
+
+    Args:
+        exp: Эксперимент (id, model, params)
+        data_digest: Хеш данных, на которых обучается эксперимент
+
+    Returns:
+        Hex-строка хеша
+    """
+    payload = {
+        "manifest_version": MANIFEST_VERSION,
+        "model": exp["model"],
+        "params": exp["params"],
+        "data": data_digest,
+    }
+    serialized = json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), default=repr
+    )
+    return hashlib.blake2b(serialized.encode(), digest_size=16).hexdigest()
+
+
+def write_atomic(path: Path | str, content: bytes) -> None:
+    """
+    Записать файл атомарно: во временный файл рядом и переименованием.
+
+    Args:
+        path: Путь к файлу
+        content: Содержимое
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    finally:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+
+
+class RunManifest:
+    """Журнал экспериментов в формате JSON Lines, в который только дописывают."""
+
+    def __init__(self, path: Path | str = "reports/experiments/manifest.jsonl"):
+        """
+        Инициализация журнала.
+
+        Args:
+            path: Путь к файлу журнала
+        """
+        self.path = Path(path)
+
+    def records(self) -> list[dict[str, Any]]:
+        """
+        Прочитать записи журнала.
+
+        Строка, недописанная из-за аварийного завершения, пропускается.
+
+        Returns:
+            Записи в порядке добавления
+        """
+        if not self.path.exists():
+            return []
+        records = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(record, dict) and "id" in record:
+                    records.append(record)
+        return records
+
+    def latest(self) -> dict[str, dict[str, Any]]:
+        """Последняя запись по каждому эксперименту."""
+        return {record["id"]: record for record in self.records()}
+
+    def append(self, record: dict[str, Any]) -> None:
+        """
+        Дописать запись одной операцией записи с fsync.
+
+        Если предыдущая запись оборвана, новая начинается с новой строки.
+
+        Args:
+            record: Запись (должна содержать id)
+        """
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            size = os.fstat(fd).st_size
+            if size and os.pread(fd, 1, size - 1) != b"\n":
+                line = "\n" + line
+            os.write(fd, line.encode("utf-8"))
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def record(
+        self,
+        exp_id: str,
+        status: str,
+        config_hash: str,
+        artifacts: Iterable[Path | str] = (),
+        **extra: Any,
+    ) -> dict[str, Any]:
+        """
+        Записать статус эксперимента с хешами его артефактов.
+
+        Args:
+            exp_id: ID эксперимента
+            status: Статус (completed, failed)
+            config_hash: Хеш конфигурации эксперимента
+            artifacts: Пути к артефактам эксперимента
+            extra: Дополнительные поля записи (время, текст ошибки)
+
+        Returns:
+            Добавленная запись
+        """
+        record = {
+            "id": exp_id,
+            "status": status,
+            "config_hash": config_hash,
+            "artifacts": {str(path): file_digest(path) for path in artifacts},
+            "timestamp": time.time(),
+            **extra,
+        }
+        self.append(record)
+        return record
+
+    @staticmethod
+    def is_valid(record: dict[str, Any], config_hash: str) -> bool:
+        """
+        Проверить, что эксперимент завершен и его артефакты не изменились.
+
+        Args:
+            record: Запись журнала
+            config_hash: Текущий хеш конфигурации эксперимента
+
+        Returns:
+            True, если эксперимент можно не перезапускать
+        """
+        if record.get("status") != "completed":
+            return False
+        if record.get("config_hash") != config_hash:
+            return False
+        for path, digest in record.get("artifacts", {}).items():
+            if not Path(path).is_file() or file_digest(path) != digest:
+                return False
+        return True
+
+    def completed(self, config_hashes: dict[str, str]) -> set[str]:
+        """
+        Эксперименты, завершенные с той же конфигурацией и целыми артефактами.
+
+        Args:
+            config_hashes: Текущие хеши конфигураций по ID эксперимента
+
+        Returns:
+            ID экспериментов, которые можно пропустить
+        """
+        latest = self.latest()
+        return {
+            exp_id
+            for exp_id, current in config_hashes.items()
+            if exp_id in latest and self.is_valid(latest[exp_id], current)
+        }
@@ -0,0 +1,252 @@
+"""Детерминированное разделение данных на train/test по хешу строк."""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Константы финализатора splitmix64
+_GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+# Файл индекса хешей: заголовок (сигнатура, количество хешей) и таблица
+_INDEX_MAGIC = np.uint64(0x5248495800000001)
+_ZERO_HASH = np.uint64(_GOLDEN_GAMMA)
+_MIN_CAPACITY = 1024
+_GROW_BLOCK = 1 << 20
+
+
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """
+    Посчитать 64-битный хеш содержимого каждой строки.
+
+    Числовые колонки приводятся к float64, поэтому хеш не зависит от того,
+    как pandas вывел тип колонки в конкретном чанке (int или float).
+
+    Args:
+        df: Данные
+
+    Returns:
+        Массив uint64 с хешами строк
+    """
+    numeric_cols = df.select_dtypes(include="number").columns
+    normalized = df.astype(dict.fromkeys(numeric_cols, "float64"))
+    hashes = pd.util.hash_pandas_object(normalized, index=False)
+    return np.asarray(hashes, dtype=np.uint64)
+
+
+def key_hashes(df: pd.DataFrame, split_key: str | None = None) -> np.ndarray:
+    """
+    Посчитать хеши стабильного ключа разбиения.
+
+    Args:
+        df: Данные
+        split_key: Колонка-ключ (например, Id); None - хеш содержимого строки
+
+    Returns:
+        Массив uint64 с хешами ключей
+    """
+    if split_key is None:
+        return row_hashes(df)
+    if split_key not in df.columns:
+        raise KeyError(f"Колонка ключа разбиения не найдена: {split_key}")
+    return row_hashes(df[[split_key]])
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """Перемешать биты uint64 (финализатор splitmix64)."""
+    z = values.astype(np.uint64, copy=True)
+    z ^= z >> np.uint64(30)
+    z *= _MIX_1
+    z ^= z >> np.uint64(27)
+    z *= _MIX_2
+    z ^= z >> np.uint64(31)
+    return z
+
+
+def hash_test_mask(hashes: np.ndarray, test_size: float, seed: int) -> np.ndarray:
+    """
+    Определить принадлежность строк к тестовой выборке по их хешам.
+
+    Каждая строка попадает в test, если равномерное в [0, 1) значение,
+    полученное из хеша и seed, меньше test_size. Результат для строки не
+    зависит от остальных строк.
+
+    Args:
+        hashes: Хеши строк (uint64)
+        test_size: Доля тестовой выборки
+        seed: Seed разбиения
+
+    Returns:
+        Булев массив (True - строка в test)
+    """
+    salt = np.uint64((seed * _GOLDEN_GAMMA) % 2**64)
+    salted = hashes.astype(np.uint64) + salt
+    uniform = (_mix(salted) >> np.uint64(11)).astype(np.float64) / float(2**53)
+    return np.asarray(uniform < test_size)
+
+
+class RowHashIndex:
+    """Множество хешей строк в файле с memory-map (открытая адресация).
+
+    Таблица - массив uint64 на диске с линейным пробированием и заполнением
+    не больше половины, поэтому проверка и добавление d хешей читают и пишут
+    O(d) ячеек, не загружая множество целиком. Хеш 0 хранится как
+    _ZERO_HASH (0 означает пустую ячейку). При заполнении таблица
+    перестраивается с удвоением емкости (амортизированно O(1) на хеш).
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        """
+        Открыть существующий индекс.
+
+        Args:
+            path: Путь к файлу индекса
+        """
+        self.path = Path(path)
+        self._open()
+
+    @classmethod
+    def create(
+        cls, path: Path | str, hashes: np.ndarray | None = None
+    ) -> "RowHashIndex":
+        """
+        Создать индекс (перезаписав файл) и добавить в него хеши.
+
+        Args:
+            path: Путь к файлу индекса
+            hashes: Начальные хеши (uint64)
+
+        Returns:
+            Открытый индекс
+        """
+        n_hashes = 0 if hashes is None else len(hashes)
+        _write_empty_index(Path(path), _index_capacity(n_hashes))
+        index = cls(path)
+        if hashes is not None:
+            index.add(hashes)
+        return index
+
+    def __len__(self) -> int:
+        """Количество хешей в индексе."""
+        return int(self._header[1])
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Проверить наличие хешей в индексе.
+
+        Args:
+            hashes: Хеши (uint64)
+
+        Returns:
+            Булев массив (True - хеш уже в индексе)
+        """
+        keys = _as_keys(hashes)
+        found = np.zeros(len(keys), dtype=bool)
+        slots = self._slots(keys)
+        pending = np.arange(len(keys))
+        while pending.size:
+            stored = self._table[slots[pending]]
+            hit = stored == keys[pending]
+            found[pending[hit]] = True
+            pending = pending[~hit & (stored != 0)]
+            slots[pending] = (slots[pending] + 1) & self._mask
+        return found
+
+    def add(self, hashes: np.ndarray) -> None:
+        """
+        Добавить хеши в индекс (уже имеющиеся пропускаются).
+
+        Args:
+            hashes: Хеши (uint64)
+        """
+        keys = np.unique(_as_keys(hashes))
+        if len(self) + len(keys) > len(self._table) // 2:
+            self._rebuild(len(self) + len(keys))
+
+        slots = self._slots(keys)
+        pending = np.arange(len(keys))
+        added = 0
+        while pending.size:
+            stored = self._table[slots[pending]]
+            done = stored == keys[pending]
+            empty = np.flatnonzero(stored == 0)
+            # Из нескольких ключей, претендующих на одну пустую ячейку,
+            # ее занимает первый; остальные пробуют ее снова на следующем шаге
+            _, first = np.unique(slots[pending[empty]], return_index=True)
+            winners = pending[empty[first]]
+            self._table[slots[winners]] = keys[winners]
+            done[empty[first]] = True
+            added += len(winners)
+            advance = ~done & (stored != 0)
+            slots[pending[advance]] = (slots[pending[advance]] + 1) & self._mask
+            pending = pending[~done]
+        self._header[1] += added
+
+    def discard(self, hashes: np.ndarray) -> None:
+        """
+        Удалить хеши из индекса (для отката прерванного дописывания).
+
+        Таблица перестраивается без этих хешей, поэтому удаление стоит
+        O(размер индекса).
+
+        Args:
+            hashes: Хеши (uint64)
+        """
+        self._rebuild(len(self), exclude=np.unique(_as_keys(hashes)))
+
+    def flush(self) -> None:
+        """Записать изменения на диск."""
+        self._data.flush()
+
+    def _open(self) -> None:
+        """Подключить файл индекса через memory-map."""
+        self._data = np.memmap(self.path, dtype=np.uint64, mode="r+")
+        if len(self._data) < 2 or self._data[0] != _INDEX_MAGIC:
+            raise ValueError(f"Не индекс хешей строк: {self.path}")
+        self._header = self._data[:2]
+        self._table = self._data[2:]
+        self._mask = np.uint64(len(self._table) - 1)
+        self._shift = np.uint64(64 - (len(self._table).bit_length() - 1))
+
+    def _slots(self, keys: np.ndarray) -> np.ndarray:
+        """Начальные ячейки ключей (старшие биты хеша)."""
+        slots: np.ndarray = keys >> self._shift
+        return slots
+
+    def _rebuild(self, n_hashes: int, exclude: np.ndarray | None = None) -> None:
+        """Перестроить таблицу с емкостью под n_hashes хешей без ключей exclude."""
+        tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        _write_empty_index(tmp_path, _index_capacity(n_hashes))
+        rebuilt = RowHashIndex(tmp_path)
+        # Ключи переносятся блоками, чтобы не держать таблицу в памяти
+        for start in range(0, len(self._table), _GROW_BLOCK):
+            block = np.array(self._table[start : start + _GROW_BLOCK])
+            block = block[block != 0]
+            if exclude is not None:
+                block = block[~np.isin(block, exclude)]
+            rebuilt.add(block)
+        rebuilt.flush()
+        del self._data, self._header, self._table, rebuilt
+        os.replace(tmp_path, self.path)
+        self._open()
+
+
+def _index_capacity(n_hashes: int) -> int:
+    """Степень двойки не меньше удвоенного количества хешей."""
+    return max(_MIN_CAPACITY, 1 << (2 * n_hashes - 1).bit_length())
+
+
+def _write_empty_index(path: Path, capacity: int) -> None:
+    """Записать пустой индекс емкостью capacity ячеек (разреженный файл)."""
+    with open(path, "wb") as f:
+        f.write(np.array([_INDEX_MAGIC, 0], dtype=np.uint64).tobytes())
+        f.truncate((capacity + 2) * _INDEX_MAGIC.itemsize)
+
+
+def _as_keys(hashes: np.ndarray) -> np.ndarray:
+    """Привести хеши к ключам таблицы (0 зарезервирован под пустую ячейку)."""
+    keys = np.asarray(hashes, dtype=np.uint64)
+    return np.where(keys == 0, _ZERO_HASH, keys)
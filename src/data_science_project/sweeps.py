@@ -0,0 +1,384 @@
+"""Групповое обучение серий экспериментов, отличающихся одним параметром."""
+
+import copy
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from sklearn.base import BaseEstimator
+
+# Ансамбли, у которых первые k базовых моделей не зависят от n_estimators
+ENSEMBLE_MODELS = ("rf", "ada", "gb")
+
+# Линейные модели, обучаемые сразу для всех alpha одним путем регуляризации
+PATH_MODELS = ("ridge", "lasso", "elasticnet")
+
+# Модели соседей, предсказания которых для всех k берутся из одного запроса
+NEIGHBOR_MODELS = ("knn",)
+
+# Вид группы -> параметр, значения которого перебираются внутри группы
+SWEEP_PARAMS = {"ensemble": "n_estimators", "path": "alpha", "neighbors": "n_neighbors"}
+
+# Атрибуты обученного ансамбля с отдельным значением на каждую базовую модель
+_PER_ESTIMATOR_ATTRS = (
+    "estimators_",
+    "estimator_weights_",
+    "estimator_errors_",
+    "train_score_",
+    "oob_improvement_",
+    "oob_scores_",
+)
+
+
+def sweep_key(exp: dict[str, Any]) -> tuple[str, ...] | None:
+    """
+    Ключ группы, в которую эксперимент можно обучить совместно.
+
+    Первый элемент ключа - вид группы из SWEEP_PARAMS.
+
+    Args:
+        exp: Описание эксперимента (id, model, params)
+
+    Returns:
+        Ключ группы или None, если эксперимент обучается отдельно
+    """
+    params = exp["params"]
+    for kind, models in (
+        ("ensemble", ENSEMBLE_MODELS),
+        ("path", PATH_MODELS),
+        ("neighbors", NEIGHBOR_MODELS),
+    ):
+        param = SWEEP_PARAMS[kind]
+        if exp["model"] in models and param in params:
+            rest = {name: value for name, value in params.items() if name != param}
+            return (kind, exp["model"], repr(sorted(rest.items())))
+    return None
+
+
+def plan_sweeps(experiments: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+    """
+    Разбить эксперименты на группы совместного обучения.
+
+    Порядок групп следует первому появлению эксперимента группы; эксперименты
+    без ключа и единственные в своей группе образуют группы из одного элемента.
+
+    Args:
+        experiments: Описания экспериментов (id, model, params)
+
+    Returns:
+        Список групп экспериментов
+    """
+    groups: dict[Any, list[dict[str, Any]]] = {}
+    for i, exp in enumerate(experiments):
+        key = sweep_key(exp)
+        groups.setdefault(key if key is not None else i, []).append(exp)
+    return list(groups.values())
+
+
+def truncate_ensemble(model: "BaseEstimator", n_estimators: int) -> "BaseEstimator":
+    """
+    Ансамбль из первых n_estimators базовых моделей обученного ансамбля.
+
+    Базовые модели не копируются, а разделяются с исходным ансамблем. Если
+    ансамбль остановился раньше (AdaBoost с нулевой ошибкой, ранняя
+    остановка GradientBoosting) и обучено меньше n_estimators моделей,
+    остаются все обученные: так же остановилось бы и обучение с нуля.
+
+    Args:
+        model: Обученный RandomForest, AdaBoost или GradientBoosting
+        n_estimators: Количество базовых моделей (не больше n_estimators model)
+
+    Returns:
+        Обученный ансамбль меньшего размера
+    """
+    limit = model.get_params()["n_estimators"]
+    if not 0 < n_estimators <= limit:
+        raise ValueError(
+            f"n_estimators должно быть в [1, {limit}], получено {n_estimators}"
+        )
+    truncated = copy.copy(model)
+    truncated.set_params(n_estimators=n_estimators)
+    for attr in _PER_ESTIMATOR_ATTRS:
+        if hasattr(model, attr):
+            setattr(truncated, attr, getattr(model, attr)[:n_estimators])
+    if hasattr(model, "n_estimators_"):
+        truncated.n_estimators_ = min(n_estimators, len(model.estimators_))
+    return truncated
+
+
+def fit_ensemble_prefixes(
+    model: "BaseEstimator", sizes: list[int], X: np.ndarray, y: np.ndarray
+) -> list["BaseEstimator"]:
+    """
+    Обучить ансамбль наибольшего размера и получить из него ансамбли всех размеров.
+
+    При фиксированном random_state k-я базовая модель не зависит от общего
+    n_estimators, поэтому префикс большого ансамбля совпадает с ансамблем,
+    обученным с нуля, а каждый меньший размер обходится без обучения.
+
+    Args:
+        model: Необученный ансамбль с параметрами группы
+        sizes: Требуемые значения n_estimators
+        X: Признаки обучающей выборки
+        y: Целевая переменная обучающей выборки
+
+    Returns:
+        Обученные ансамбли в порядке sizes
+    """
+    largest = max(sizes)
+    model.set_params(n_estimators=largest)
+    model.fit(X, y)
+    return [
+        model if size == largest else truncate_ensemble(model, size) for size in sizes
+    ]
+
+
+def _center(
+    model: "BaseEstimator", X: np.ndarray, y: np.ndarray
+) -> tuple[np.ndarray, float, np.ndarray, np.ndarray]:
+    """Центрировать X и y, если модель обучает свободный член."""
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if not model.get_params()["fit_intercept"]:
+        return np.zeros(X.shape[1]), 0.0, X, y
+    X_offset = X.mean(axis=0)
+    y_offset = float(y.mean())
+    return X_offset, y_offset, X - X_offset, y - y_offset
+
+
+def _with_coef(
+    model: "BaseEstimator",
+    alpha: float,
+    coef: np.ndarray,
+    X_offset: np.ndarray,
+    y_offset: float,
+) -> "BaseEstimator":
+    """Копия необученной линейной модели с заданными alpha и коэффициентами."""
+    fitted = copy.copy(model).set_params(alpha=alpha)
+    fitted.coef_ = coef
+    fitted.intercept_ = y_offset - float(X_offset @ coef)
+    fitted.n_features_in_ = coef.shape[0]
+    return fitted
+
+
+def _ridge_path(
+    model: "BaseEstimator", alphas: np.ndarray, X: np.ndarray, y: np.ndarray
+) -> list["BaseEstimator"]:
+    """Ridge для всех alpha через одно SVD центрированной матрицы признаков."""
+    X_offset, y_offset, Xc, yc = _center(model, X, y)
+    U, s, Vt = np.linalg.svd(Xc, full_matrices=False)
+    Uty = U.T @ yc
+    fitted = []
+    for alpha in alphas:
+        # coef = V diag(s / (s^2 + alpha)) U^T y, нулевые s не вносят вклада
+        d = np.divide(s, s**2 + alpha, out=np.zeros_like(s), where=s > 0)
+        model_alpha = _with_coef(model, alpha, Vt.T @ (d * Uty), X_offset, y_offset)
+        model_alpha.solver_ = "svd"
+        model_alpha.n_iter_ = None
+        fitted.append(model_alpha)
+    return fitted
+
+
+def _enet_path(
+    model: "BaseEstimator", alphas: np.ndarray, X: np.ndarray, y: np.ndarray
+) -> list["BaseEstimator"]:
+    """Lasso/ElasticNet для всех alpha одним путем координатного спуска."""
+    from sklearn.linear_model import enet_path
+
+    params = model.get_params()
+    X_offset, y_offset, Xc, yc = _center(model, X, y)
+    # enet_path идет от большего alpha к меньшему, начиная каждую точку
+    # с решения предыдущей; матрица Грама считается один раз на весь путь
+    path_alphas, coefs, dual_gaps, n_iters = enet_path(
+        Xc,
+        yc,
+        l1_ratio=params.get("l1_ratio", 1.0),
+        alphas=alphas,
+        precompute=True,
+        positive=params["positive"],
+        tol=params["tol"],
+        max_iter=params["max_iter"],
+        selection=params["selection"],
+        random_state=params["random_state"],
+        return_n_iter=True,
+    )
+    by_alpha = {
+        float(alpha): (coefs[:, i], float(dual_gaps[i]), int(n_iters[i]))
+        for i, alpha in enumerate(np.atleast_1d(path_alphas))
+    }
+    fitted = []
+    for alpha in alphas:
+        coef, dual_gap, n_iter = by_alpha[float(alpha)]
+        model_alpha = _with_coef(model, alpha, coef.copy(), X_offset, y_offset)
+        model_alpha.dual_gap_ = dual_gap
+        model_alpha.n_iter_ = n_iter
+        fitted.append(model_alpha)
+    return fitted
+
+
+def fit_regularization_path(
+    model_type: str,
+    model: "BaseEstimator",
+    alphas: list[float],
+    X: np.ndarray,
+    y: np.ndarray,
+) -> list["BaseEstimator"]:
+    """
+    Обучить линейную модель сразу для всех значений alpha.
+
+    Ridge решается через одно SVD центрированной матрицы признаков: каждое
+    alpha стоит умножения матриц размера числа признаков. Lasso и ElasticNet
+    обучаются одним путем координатного спуска с теплым стартом, поэтому
+    результат совпадает с независимым обучением с точностью до tol.
+    Ridge с positive=True обучается для каждого alpha отдельно.
+
+    Args:
+        model_type: Тип модели из PATH_MODELS
+        model: Необученная модель с параметрами группы
+        alphas: Требуемые значения alpha
+        X: Признаки обучающей выборки
+        y: Целевая переменная обучающей выборки
+
+    Returns:
+        Обученные модели в порядке alphas
+    """
+    if model_type not in PATH_MODELS:
+        raise ValueError(f"Regularization path is not supported for {model_type}")
+    alpha_values = np.asarray(alphas, dtype=np.float64)
+    if model_type != "ridge":
+        return _enet_path(model, alpha_values, X, y)
+    if model.get_params()["positive"]:
+        from sklearn.base import clone
+
+        return [
+            clone(model).set_params(alpha=float(alpha)).fit(X, y)
+            for alpha in alpha_values
+        ]
+    return _ridge_path(model, alpha_values, X, y)
+
+
+def fit_neighbor_sweep(
+    model: "BaseEstimator", ks: list[int], X: np.ndarray, y: np.ndarray
+) -> list["BaseEstimator"]:
+    """
+    Обучить KNN для всех n_neighbors на одном поисковом индексе.
+
+    Индекс строится один раз, модели для каждого k разделяют его и отличаются
+    только n_neighbors.
+
+    Args:
+        model: Необученный KNeighborsRegressor с параметрами группы
+        ks: Требуемые значения n_neighbors
+        X: Признаки обучающей выборки
+        y: Целевая переменная обучающей выборки
+
+    Returns:
+        Обученные модели в порядке ks
+    """
+    k_max = max(ks)
+    model.set_params(n_neighbors=k_max)
+    model.fit(X, y)
+    return [
+        model if k == k_max else copy.copy(model).set_params(n_neighbors=k) for k in ks
+    ]
+
+
+def predict_neighbor_sweep(
+    models: list["BaseEstimator"], X: np.ndarray, y_train: np.ndarray
+) -> list[np.ndarray]:
+    """
+    Предсказания KNN для всех n_neighbors из одного запроса k_max соседей.
+
+    Соседи возвращаются отсортированными по расстоянию, поэтому для каждого k
+    достаточно накопленной суммы по первым k соседям: среднего для uniform и
+    взвешенного 1/расстояние среднего для distance (при нулевом расстоянии,
+    как в sklearn, учитываются только совпадающие точки). При равных
+    расстояниях на границе k набор соседей может отличаться от отдельного
+    запроса k соседей, как и между разными алгоритмами поиска sklearn.
+    Модели с весовой функцией-вызываемым объектом предсказывают по
+    отдельности.
+
+    Args:
+        models: Модели из fit_neighbor_sweep
+        X: Признаки, для которых нужны предсказания
+        y_train: Целевая переменная, на которой обучены модели
+
+    Returns:
+        Предсказания в порядке models
+    """
+    ks = [int(m.get_params()["n_neighbors"]) for m in models]
+    base = models[int(np.argmax(ks))]
+    weights = base.get_params()["weights"]
+    if weights not in (None, "uniform", "distance"):
+        return [model.predict(X) for model in models]
+    distances, indices = base.kneighbors(X, n_neighbors=max(ks))
+    neighbors_y = np.asarray(y_train, dtype=np.float64)[indices]
+
+    if weights in (None, "uniform"):
+        cumulative = np.cumsum(neighbors_y, axis=1)
+        return [cumulative[:, k - 1] / k for k in ks]
+
+    with np.errstate(divide="ignore"):
+        weights = 1.0 / distances
+    exact = np.isinf(weights)
+    # Строки с нулевым расстоянием: вес 1 у совпадающих точек, 0 у остальных.
+    # Совпадающие точки идут первыми, поэтому среди первых k есть хотя бы одна
+    exact_rows = exact[:, 0]
+    weights[exact_rows] = exact[exact_rows]
+    cumulative_y = np.cumsum(weights * neighbors_y, axis=1)
+    cumulative_w = np.cumsum(weights, axis=1)
+    return [cumulative_y[:, k - 1] / cumulative_w[:, k - 1] for k in ks]
+
+
+def fit_sweep(
+    kind: str,
+    model_type: str,
+    model: "BaseEstimator",
+    values: list[Any],
+    X: np.ndarray,
+    y: np.ndarray,
+) -> list["BaseEstimator"]:
+    """
+    Обучить группу экспериментов одного вида.
+
+    Args:
+        kind: Вид группы (первый элемент sweep_key)
+        model_type: Тип модели
+        model: Необученная модель с общими параметрами группы
+        values: Значения параметра SWEEP_PARAMS[kind] по экспериментам
+        X: Признаки обучающей выборки
+        y: Целевая переменная обучающей выборки
+
+    Returns:
+        Обученные модели в порядке values
+    """
+    if kind == "ensemble":
+        return fit_ensemble_prefixes(model, [int(v) for v in values], X, y)
+    if kind == "path":
+        return fit_regularization_path(
+            model_type, model, [float(v) for v in values], X, y
+        )
+    if kind == "neighbors":
+        return fit_neighbor_sweep(model, [int(v) for v in values], X, y)
+    raise ValueError(f"Unknown sweep kind: {kind}")
+
+
+def predict_sweep(
+    kind: str, models: list["BaseEstimator"], X: np.ndarray, y_train: np.ndarray
+) -> list[np.ndarray] | None:
+    """
+    Общие предсказания моделей группы, если вид группы их поддерживает.
+
+    Args:
+        kind: Вид группы (первый элемент sweep_key)
+        models: Модели из fit_sweep
+        X: Признаки, для которых нужны предсказания
+        y_train: Целевая переменная, на которой обучены модели
+
+    Returns:
+        Предсказания в порядке models или None - предсказывать каждой моделью
+    """
+    if kind == "neighbors":
+        return predict_neighbor_sweep(models, X, y_train)
+    return None
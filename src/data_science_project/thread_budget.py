@@ -0,0 +1,84 @@
+"""Распределение ядер между процессами-воркерами и потоками обучения."""
+
+import os
+import warnings
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from sklearn.base import BaseEstimator
+
+
+def available_cores() -> int:
+    """Количество ядер, доступных процессу (с учетом привязки к ядрам)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def plan_threads(
+    n_tasks: int, jobs: int | None = None, cores: int | None = None
+) -> dict[str, int]:
+    """
+    Разделить ядра между процессами и потоками одного обучения.
+
+    Процессов не больше, чем задач и ядер (явное jobs больше числа ядер
+    сокращается с предупреждением); каждому процессу достается равная доля
+    ядер для BLAS/OpenMP и n_jobs модели, поэтому суммарно потоков не больше,
+    чем ядер.
+
+    Args:
+        n_tasks: Количество независимых задач
+        jobs: Количество процессов (None - по числу ядер)
+        cores: Количество ядер (None - доступные процессу)
+
+    Returns:
+        Словарь cores, workers, threads_per_fit
+    """
+    cores = cores or available_cores()
+    if jobs is not None and jobs > cores:
+        warnings.warn(
+            f"jobs={jobs} больше числа ядер ({cores}), используется {cores}",
+            stacklevel=2,
+        )
+        jobs = cores
+    workers = max(1, min(jobs or cores, n_tasks))
+    return {
+        "cores": cores,
+        "workers": workers,
+        "threads_per_fit": max(1, cores // workers),
+    }
+
+
+def set_n_jobs(model: "BaseEstimator", threads: int) -> "BaseEstimator":
+    """
+    Задать n_jobs модели, если она его поддерживает.
+
+    Args:
+        model: Модель
+        threads: Количество потоков
+
+    Returns:
+        Та же модель
+    """
+    if "n_jobs" in model.get_params(deep=False):
+        model.set_params(n_jobs=threads)
+    return model
+
+
+def limit_threads(threads: int) -> Any:
+    """
+    Ограничить потоки BLAS и OpenMP текущего процесса.
+
+    Без with ограничение действует до конца процесса (для воркеров пула),
+    в with - до выхода из блока.
+
+    Args:
+        threads: Количество потоков
+
+    Returns:
+        Контекстный менеджер threadpoolctl
+    """
+    # threadpoolctl - обязательная зависимость scikit-learn
+    from threadpoolctl import threadpool_limits
+
+    return threadpool_limits(limits=threads)
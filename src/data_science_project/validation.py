@@ -0,0 +1,408 @@
+"""Векторизованная проверка декларативных правил валидации выборок."""
+
+import hashlib
+import json
+import tempfile
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .config_models import DataConfig
+from .dataset_cache import file_digest
+from .splitting import RowHashIndex, key_hashes, row_hashes
+
+# Версия формата отчета валидации: меняется вместе с логикой проверок
+VALIDATION_CACHE_VERSION = 1
+
+# Группы, по которым замеряется время: сборка матрицы и группы правил
+TIMING_GROUPS = ("matrix", "dtype", "nulls", "range", "allowed", "unique", "duplicates")
+# Построчные правила: нарушение видно сразу по строке, без остальных данных
+ROW_KINDS = ("dtype", "nulls", "range", "allowed")
+
+
+class RuleEngine:
+    """Проверка правил DataConfig.validation над выборкой.
+
+    Правила компилируются в массивы (индексы колонок, границы), и каждая
+    группа правил вычисляется одной векторизованной редукцией над общей
+    матрицей значений, поэтому стоимость почти не зависит от числа правил.
+    Состояние накапливается по вызовам update(), так что выборку можно
+    проверять как целиком, так и по чанкам. Повторы для правил уникальности
+    и доли дубликатов считаются по ходу проверки через индексы хешей на
+    диске (RowHashIndex), поэтому память не растет с числом строк.
+    """
+
+    def __init__(
+        self,
+        data_config: DataConfig,
+        max_offsets: int = 20,
+        hash_dir: Path | str | None = None,
+    ) -> None:
+        """
+        Инициализация и компиляция правил.
+
+        Args:
+            data_config: Конфигурация данных с правилами валидации
+            max_offsets: Сколько первых нарушивших строк запоминать на правило
+            hash_dir: Где создать временные индексы хешей (None - системная
+                временная директория)
+        """
+        rules = data_config.validation
+        self.target_column = data_config.target_column
+        self.allowed_target_values = rules.allowed_target_values
+        self.unique_columns = list(rules.unique_columns)
+        self.max_duplicate_ratio = rules.max_duplicate_ratio
+
+        column_rules = rules.columns
+        self.range_columns = [
+            col
+            for col, rule in column_rules.items()
+            if rule.min is not None or rule.max is not None
+        ]
+        self.range_min = np.array(
+            [_bound(column_rules[col].min, -np.inf) for col in self.range_columns]
+        )
+        self.range_max = np.array(
+            [_bound(column_rules[col].max, np.inf) for col in self.range_columns]
+        )
+        self.null_columns = [
+            col for col, rule in column_rules.items() if not rule.nullable
+        ]
+        self.dtype_columns = [
+            col for col, rule in column_rules.items() if rule.dtype is not None
+        ]
+        self.int_columns = [
+            col for col, rule in column_rules.items() if rule.dtype == "int"
+        ]
+
+        # Все колонки, участвующие в матричных правилах, читаются один раз
+        matrix_columns = [
+            *self.range_columns,
+            *self.null_columns,
+            *self.dtype_columns,
+        ]
+        if self.allowed_target_values is not None:
+            matrix_columns.append(self.target_column)
+        self.matrix_columns = list(dict.fromkeys(matrix_columns))
+
+        self.max_offsets = max_offsets
+        self.n_rows = 0
+        self.counts: dict[str, int] = {}
+        self.offsets: dict[str, list[int]] = {}
+        self.missing: set[str] = set()
+        self.timings = dict.fromkeys(TIMING_GROUPS, 0.0)
+        self._hash_dir = hash_dir
+        self._tmp_dir: tempfile.TemporaryDirectory[str] | None = None
+        self._hash_indexes: dict[str, RowHashIndex] = {}
+
+    def rule_names(self) -> list[tuple[str, str, str | None]]:
+        """
+        Список скомпилированных правил.
+
+        Returns:
+            Список (имя правила, группа, колонка)
+        """
+        rules: list[tuple[str, str, str | None]] = []
+        rules += [(f"dtype:{col}", "dtype", col) for col in self.dtype_columns]
+        rules += [(f"nulls:{col}", "nulls", col) for col in self.null_columns]
+        rules += [(f"range:{col}", "range", col) for col in self.range_columns]
+        if self.allowed_target_values is not None:
+            rules.append(
+                (f"allowed:{self.target_column}", "allowed", self.target_column)
+            )
+        rules += [(f"unique:{col}", "unique", col) for col in self.unique_columns]
+        if self.max_duplicate_ratio is not None:
+            rules.append(("duplicates", "duplicates", None))
+        return rules
+
+    def update(self, df: pd.DataFrame) -> dict[str, np.ndarray]:
+        """
+        Проверить очередную часть выборки и накопить счетчики нарушений.
+
+        Args:
+            df: Данные (вся выборка или чанк)
+
+        Returns:
+            Словарь {имя правила: маска нарушивших строк} для построчных правил
+        """
+        start = time.perf_counter()
+        present = [col for col in self.matrix_columns if col in df.columns]
+        self.missing.update(col for col in self.matrix_columns if col not in df.columns)
+        self.missing.update(col for col in self.unique_columns if col not in df.columns)
+        frame = df[present]
+        non_numeric = frame.select_dtypes(exclude="number").columns
+        if len(non_numeric):
+            frame = frame.assign(
+                **{
+                    col: pd.to_numeric(frame[col], errors="coerce")
+                    for col in non_numeric
+                }
+            )
+        values = frame.to_numpy(dtype=np.float64)
+        index = {col: j for j, col in enumerate(present)}
+        self._tick("matrix", start)
+
+        masks: dict[str, np.ndarray] = {}
+
+        start = time.perf_counter()
+        # Нечисловые значения после приведения стали NaN, хотя исходно не пусты
+        raw_nulls = df[present].isna().to_numpy() if len(non_numeric) else None
+        nan = np.isnan(values)
+        dtype_cols = [col for col in self.dtype_columns if col in index]
+        if dtype_cols:
+            idx = [index[col] for col in dtype_cols]
+            bad = nan[:, idx]
+            bad = (
+                bad & ~raw_nulls[:, idx]
+                if raw_nulls is not None
+                else np.zeros_like(bad)
+            )
+            int_idx = [index[col] for col in dtype_cols if col in self.int_columns]
+            if int_idx:
+                ints = values[:, int_idx]
+                fractional = np.isfinite(ints) & (ints != np.floor(ints))
+                is_int = np.isin(dtype_cols, self.int_columns)
+                bad[:, is_int] |= fractional
+            self._collect(masks, "dtype", dtype_cols, bad)
+        self._tick("dtype", start)
+
+        start = time.perf_counter()
+        null_cols = [col for col in self.null_columns if col in index]
+        if null_cols:
+            bad = nan[:, [index[col] for col in null_cols]]
+            if raw_nulls is not None:
+                bad = raw_nulls[:, [index[col] for col in null_cols]]
+            self._collect(masks, "nulls", null_cols, bad)
+        self._tick("nulls", start)
+
+        start = time.perf_counter()
+        range_pos = [j for j, col in enumerate(self.range_columns) if col in index]
+        if range_pos:
+            cols = [self.range_columns[j] for j in range_pos]
+            block = values[:, [index[col] for col in cols]]
+            bad = (block < self.range_min[range_pos]) | (
+                block > self.range_max[range_pos]
+            )
+            self._collect(masks, "range", cols, bad)
+        self._tick("range", start)
+
+        start = time.perf_counter()
+        if self.allowed_target_values is not None and self.target_column in index:
+            target = values[:, index[self.target_column]]
+            bad = ~np.isin(target, self.allowed_target_values) & ~np.isnan(target)
+            self._collect(masks, "allowed", [self.target_column], bad[:, None])
+        self._tick("allowed", start)
+
+        start = time.perf_counter()
+        for col in self.unique_columns:
+            if col in df.columns:
+                self._count_repeats(f"unique:{col}", key_hashes(df, col))
+        self._tick("unique", start)
+
+        start = time.perf_counter()
+        if self.max_duplicate_ratio is not None:
+            self._count_repeats("duplicates", row_hashes(df))
+        self._tick("duplicates", start)
+
+        # Смещения строк считаются от начала выборки (без заголовка)
+        for name, mask in masks.items():
+            offsets = self.offsets.setdefault(name, [])
+            room = self.max_offsets - len(offsets)
+            if room > 0:
+                offsets.extend((self.n_rows + np.flatnonzero(mask)[:room]).tolist())
+
+        self.n_rows += len(df)
+        return masks
+
+    def report(self) -> dict[str, Any]:
+        """
+        Завершить проверку и сформировать отчет.
+
+        Returns:
+            Словарь с результатами по правилам, итогами и временем групп
+        """
+        self._close_indexes()
+        duplicate_ratio = 0.0
+        if self.max_duplicate_ratio is not None and self.n_rows:
+            duplicate_ratio = self.counts.get("duplicates", 0) / self.n_rows
+
+        results: list[dict[str, Any]] = []
+        for name, kind, column in self.rule_names():
+            if column is not None and column in self.missing:
+                results.append(
+                    {
+                        "name": name,
+                        "kind": kind,
+                        "column": column,
+                        "violations": None,
+                        "passed": False,
+                        "error": "missing column",
+                    }
+                )
+                continue
+            violations = self.counts.get(name, 0)
+            passed = (
+                duplicate_ratio <= self.max_duplicate_ratio
+                if kind == "duplicates" and self.max_duplicate_ratio is not None
+                else violations == 0
+            )
+            result: dict[str, Any] = {
+                "name": name,
+                "kind": kind,
+                "column": column,
+                "violations": violations,
+                "passed": passed,
+            }
+            if kind in ROW_KINDS:
+                result["offsets"] = self.offsets.get(name, [])
+            results.append(result)
+
+        n_failed = sum(not result["passed"] for result in results)
+        return {
+            "passed": n_failed == 0,
+            "rows": self.n_rows,
+            "n_rules": len(results),
+            "n_passed": len(results) - n_failed,
+            "n_failed": n_failed,
+            "duplicate_ratio": duplicate_ratio,
+            "rules": results,
+            "timings": {group: round(sec, 6) for group, sec in self.timings.items()},
+        }
+
+    def _collect(
+        self,
+        masks: dict[str, np.ndarray],
+        kind: str,
+        columns: list[str],
+        bad: np.ndarray,
+    ) -> None:
+        """Добавить число нарушений группы правил (одна редукция по оси строк)."""
+        counts = bad.sum(axis=0)
+        for j, col in enumerate(columns):
+            name = f"{kind}:{col}"
+            self.counts[name] = self.counts.get(name, 0) + int(counts[j])
+            if counts[j]:
+                masks[name] = bad[:, j]
+
+    def _count_repeats(self, name: str, hashes: np.ndarray) -> None:
+        """Добавить к счетчику правила повторы хешей в части и с прошлыми частями."""
+        index = self._hash_indexes.get(name)
+        if index is None:
+            if self._tmp_dir is None:
+                self._tmp_dir = tempfile.TemporaryDirectory(dir=self._hash_dir)
+            path = Path(self._tmp_dir.name) / f"{len(self._hash_indexes)}.bin"
+            index = self._hash_indexes[name] = RowHashIndex.create(path)
+        distinct = np.unique(hashes)
+        new = distinct[~index.contains(distinct)]
+        index.add(new)
+        self.counts[name] = self.counts.get(name, 0) + len(hashes) - len(new)
+
+    def _close_indexes(self) -> None:
+        """Удалить временные индексы хешей (счетчики повторов уже накоплены)."""
+        self._hash_indexes = {}
+        if self._tmp_dir is not None:
+            self._tmp_dir.cleanup()
+            self._tmp_dir = None
+
+    def _tick(self, group: str, start: float) -> None:
+        """Добавить время с момента start к группе."""
+        self.timings[group] += time.perf_counter() - start
+
+
+def validate_frame(df: pd.DataFrame, data_config: DataConfig) -> dict[str, Any]:
+    """
+    Проверить правила валидации над выборкой целиком.
+
+    Args:
+        df: Данные выборки
+        data_config: Конфигурация данных с правилами
+
+    Returns:
+        Отчет RuleEngine.report()
+    """
+    engine = RuleEngine(data_config)
+    engine.update(df)
+    return engine.report()
+
+
+def validate_chunks(
+    chunks: Iterable[pd.DataFrame],
+    data_config: DataConfig,
+    fail_fast: bool = True,
+    hash_dir: Path | str | None = None,
+) -> dict[str, Any]:
+    """
+    Проверить правила валидации потоково, по чанкам.
+
+    При fail_fast чтение прекращается на первом чанке с нарушением
+    построчного правила или с отсутствующей колонкой. Правила уникальности и
+    доли дубликатов зависят от всей выборки, поэтому проверяются только по
+    прочитанной части и досрочную остановку не вызывают.
+
+    Args:
+        chunks: Чанки выборки (например, pd.read_csv(..., chunksize=...))
+        data_config: Конфигурация данных с правилами
+        fail_fast: Остановиться на первом жестком нарушении
+        hash_dir: Где создать временные индексы хешей (см. RuleEngine)
+
+    Returns:
+        Отчет RuleEngine.report() с полями stopped_early и first_violation
+    """
+    engine = RuleEngine(data_config, hash_dir=hash_dir)
+    first_violation: dict[str, Any] | None = None
+    for chunk in chunks:
+        masks = engine.update(chunk)
+        if not fail_fast:
+            continue
+        if engine.missing:
+            first_violation = {"missing_columns": sorted(engine.missing)}
+        elif masks:
+            rule = min(masks, key=lambda name: engine.offsets[name][0])
+            first_violation = {"rule": rule, "offsets": engine.offsets[rule]}
+        if first_violation is not None:
+            break
+
+    report = engine.report()
+    report["stopped_early"] = first_violation is not None
+    report["first_violation"] = first_violation
+    return report
+
+
+def validation_cache_key(
+    split_paths: list[Path],
+    data_config: DataConfig,
+    options: dict[str, Any] | None = None,
+) -> str:
+    """
+    Построить ключ кэша результатов валидации.
+
+    Ключ зависит от содержимого выборок, полной конфигурации данных (включая
+    правила), эталонного профиля сдвига и режима проверки.
+
+    Args:
+        split_paths: Пути к проверяемым выборкам
+        data_config: Конфигурация данных с правилами валидации
+        options: Параметры режима проверки (потоковый режим, размер чанка)
+
+    Returns:
+        Hex-строка ключа
+    """
+    reference = data_config.validation.drift.reference_profile
+    payload = {
+        "cache_version": VALIDATION_CACHE_VERSION,
+        "splits": [file_digest(path) for path in split_paths],
+        "data_config": data_config.model_dump(mode="json"),
+        "reference_digest": file_digest(reference) if reference else None,
+        "options": options or {},
+    }
+    serialized = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(serialized.encode(), digest_size=16).hexdigest()
+
+
+def _bound(value: float | None, default: float) -> float:
+    """Граница диапазона или бесконечность, если она не задана."""
+    return default if value is None else value
@@ -0,0 +1,108 @@
+"""Integration tests for running all experiments in a process pool."""
+
+import os
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+from scripts.experiments import run_all_experiments as run_all
+from src.data_science_project import thread_budget
+from src.data_science_project.run_manifest import RunManifest
+
+EXPERIMENTS = [
+    {"id": "ridge", "model": "ridge", "params": {"alpha": 1.0}},
+    {"id": "dt", "model": "dt", "params": {"max_depth": 3}},
+    {"id": "knn", "model": "knn", "params": {"n_neighbors": 5}},
+    {"id": "lasso", "model": "lasso", "params": {"alpha": 0.01}},
+]
+
+
+def _data() -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 4))
+    y = X @ np.array([1.0, -2.0, 0.5, 0.0]) + rng.normal(scale=0.3, size=300)
+    return X[:240], X[240:], y[:240], y[240:]
+
+
+@pytest.fixture
+def run(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Any:
+    """run_all_experiments on synthetic data with outputs under tmp_path.
+
+    Experiments with a "crash" parameter raise ("raise") or kill their
+    worker process ("exit") when the model is built.
+    """
+    monkeypatch.chdir(tmp_path)
+    for directory in ("models", "reports/metrics", "reports/experiments"):
+        (tmp_path / directory).mkdir(parents=True)
+    # Пул процессов создается и на машине с одним ядром
+    monkeypatch.setattr(thread_budget, "available_cores", lambda: 4)
+    monkeypatch.setattr(run_all, "load_data", _data)
+    build_model = run_all.build_model
+
+    def crashing_build_model(
+        name: str, params: dict[str, Any], n_jobs: int | None = None
+    ) -> Any:
+        crash = params.get("crash")
+        if crash == "raise":
+            raise RuntimeError("boom")
+        if crash == "exit":
+            os._exit(1)
+        return build_model(name, params, n_jobs)
+
+    monkeypatch.setattr(run_all, "build_model", crashing_build_model)
+
+    def run_experiments(
+        experiments: list[dict[str, Any]], jobs: int
+    ) -> list[dict[str, Any]]:
+        monkeypatch.setattr(run_all, "load_experiments", lambda: experiments)
+        return run_all.run_all_experiments(jobs=jobs, use_cache=False)
+
+    return run_experiments
+
+
+def _by_id(results: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    ids = [result["id"] for result in results]
+    assert len(ids) == len(set(ids))
+    return {result["id"]: result for result in results}
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_failing_experiment_does_not_stop_others(run: Any, jobs: int) -> None:
+    """An exception in one experiment is recorded; the rest complete."""
+    broken = {"id": "broken", "model": "ridge", "params": {"crash": "raise"}}
+
+    results = _by_id(run([*EXPERIMENTS, broken], jobs))
+
+    assert set(results) == {exp["id"] for exp in EXPERIMENTS} | {"broken"}
+    assert results["broken"]["status"] == "failed"
+    assert "boom" in results["broken"]["error"]
+    assert all(results[exp["id"]]["status"] == "completed" for exp in EXPERIMENTS)
+    latest = RunManifest(run_all.MANIFEST_PATH).latest()
+    assert {key: record["status"] for key, record in latest.items()} == {
+        key: result["status"] for key, result in results.items()
+    }
+
+
+def test_dead_worker_fails_its_group_without_raising(run: Any) -> None:
+    """A worker killed mid-run yields failed results instead of an exception."""
+    dead = {"id": "dead", "model": "ridge", "params": {"crash": "exit"}}
+
+    results = _by_id(run([dead, *EXPERIMENTS], jobs=2))
+
+    assert set(results) == {exp["id"] for exp in EXPERIMENTS} | {"dead"}
+    assert results["dead"]["status"] == "failed"
+    assert "BrokenProcessPool" in results["dead"]["error"]
+
+
+def test_pool_and_in_process_runs_agree(run: Any) -> None:
+    """--jobs 1 and --jobs N produce the same metrics for every experiment."""
+    serial = _by_id(run(EXPERIMENTS, jobs=1))
+    pooled = _by_id(run(EXPERIMENTS, jobs=2))
+
+    assert serial.keys() == pooled.keys()
+    for key, result in serial.items():
+        assert result["metrics"]["test_r2"] == pytest.approx(
+            pooled[key]["metrics"]["test_r2"]
+        )
@@ -0,0 +1,99 @@
+"""Integration tests for the successive halving experiment script."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+from scripts.experiments import run_experiment, successive_halving
+from scripts.experiments.successive_halving import rung_budgets
+
+EXPERIMENTS = [
+    *(
+        {"id": f"ridge_{a}", "model": "ridge", "params": {"alpha": a}}
+        for a in (0.1, 10.0, 1e4)
+    ),
+    *(
+        {"id": f"knn_{k}", "model": "knn", "params": {"n_neighbors": k}}
+        for k in (1, 5, 25)
+    ),
+    *({"id": f"dt_{d}", "model": "dt", "params": {"max_depth": d}} for d in (1, 2, 4)),
+]
+
+
+def _data(seed: int = 0) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(750, 4))
+    y = X @ np.array([1.0, -2.0, 0.5, 0.0]) + rng.normal(scale=0.3, size=750)
+    return X[:600], X[600:], y[:600], y[600:]
+
+
+@pytest.fixture
+def run_halving(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Any:
+    """successive_halving on synthetic data with artifacts in tmp_path."""
+    monkeypatch.setattr(run_experiment, "MODELS_DIR", tmp_path / "models")
+    monkeypatch.setattr(run_experiment, "REPORTS_DIR", tmp_path / "reports")
+    monkeypatch.setattr(successive_halving, "HALVING_DIR", tmp_path / "halving")
+    for directory in ("models", "reports/metrics", "reports/experiments"):
+        (tmp_path / directory).mkdir(parents=True)
+
+    def run(data: Any = None, **kwargs: Any) -> dict[str, Any]:
+        monkeypatch.setattr(
+            successive_halving, "load_data", lambda: data if data else _data()
+        )
+        return successive_halving.successive_halving(
+            EXPERIMENTS, jobs=1, use_cache=False, **kwargs
+        )
+
+    return run
+
+
+def test_rung_budgets_grow_by_eta_to_full_resource() -> None:
+    """Each rung gets eta times the previous budget and the last one is full."""
+    assert rung_budgets(3, 3.0) == pytest.approx([1 / 9, 1 / 3, 1.0])
+    assert rung_budgets(1, 2.0) == [1.0]
+    with pytest.raises(ValueError):
+        rung_budgets(2, 1.0)
+
+
+def test_top_fraction_is_promoted_and_winner_refit(
+    run_halving: Any, tmp_path: Path
+) -> None:
+    """Rungs keep the best 1/eta by validation score; only the winner is saved."""
+    summary = run_halving(rungs=3, eta=3.0, resource="rows")
+
+    assert [rung["configs"] for rung in summary["rungs"]] == [9, 3, 1]
+    assert [len(rung["promoted"]) for rung in summary["rungs"]] == [3, 1, 1]
+    for rung in summary["rungs"][:-1]:
+        with open(tmp_path / "halving" / f"rung_{rung['rung']}.json") as f:
+            results = json.load(f)["results"]
+        scores = {r["id"]: r["metrics"]["val_r2"] for r in results}
+        eliminated = set(scores) - set(rung["promoted"])
+        assert min(scores[i] for i in rung["promoted"]) >= max(
+            scores[i] for i in eliminated
+        )
+
+    best = summary["best"]
+    assert best == summary["rungs"][-1]["promoted"][0]
+    assert summary["best_result"]["id"] == best
+    assert "test_r2" in summary["best_result"]["metrics"]
+    assert [path.name for path in (tmp_path / "models").iterdir()] == [
+        f"{best}_model.pkl"
+    ]
+
+
+def test_selection_ignores_test_set(run_halving: Any) -> None:
+    """Scrambling the test targets leaves every promotion decision unchanged."""
+    X_train, X_test, y_train, y_test = _data()
+    scrambled = np.random.default_rng(1).permutation(y_test) * -5.0
+
+    clean = run_halving(rungs=2, eta=3.0)
+    noisy = run_halving((X_train, X_test, y_train, scrambled), rungs=2, eta=3.0)
+
+    assert [r["promoted"] for r in clean["rungs"]] == [
+        r["promoted"] for r in noisy["rungs"]
+    ]
+    with pytest.raises(ValueError, match="val_"):
+        run_halving(metric="test_r2")
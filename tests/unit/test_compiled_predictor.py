@@ -0,0 +1,76 @@
+"""Unit tests for compiled_predictor module."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.data_science_project import compiled_predictor
+from src.data_science_project.compiled_predictor import compile_model, load_predictor
+from src.data_science_project.model_registry import get_model
+
+COMPILED_MODELS = [
+    ("linear", {}),
+    ("ridge", {"alpha": 1.0}),
+    ("lasso", {"alpha": 0.01}),
+    ("elasticnet", {"alpha": 0.01}),
+    ("dt", {"max_depth": 8}),
+    ("rf", {"n_estimators": 20}),
+    ("gb", {"n_estimators": 30}),
+    ("ada", {"n_estimators": 20}),
+]
+
+
+def _data() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 5))
+    return X, X @ np.array([1.0, -1.0, 0.5, 2.0, 0.0]) + rng.normal(size=300)
+
+
+@pytest.mark.parametrize(("model_type", "params"), COMPILED_MODELS)
+def test_saved_predictor_matches_model(
+    tmp_path: Path, model_type: str, params: dict[str, float]
+) -> None:
+    """The predictor loaded from disk reproduces sklearn predictions."""
+    X, y = _data()
+    model = get_model(model_type, params).fit(X, y)
+
+    predictor = load_predictor(compile_model(model).save(tmp_path / "model.npz"))
+
+    np.testing.assert_allclose(predictor.predict(X), model.predict(X), rtol=1e-12)
+    np.testing.assert_allclose(
+        predictor.predict(X[0]), model.predict(X[:1]), rtol=1e-12
+    )
+
+
+@pytest.mark.parametrize("model_type", ["dt", "ada"])
+def test_scalar_and_vectorized_traversals_agree(
+    monkeypatch: pytest.MonkeyPatch, model_type: str
+) -> None:
+    """Small batches take the Python loop and give the same leaves."""
+    X, y = _data()
+    predictor = compile_model(get_model(model_type).fit(X, y))
+
+    monkeypatch.setattr(compiled_predictor, "SCALAR_MAX_PAIRS", 10**9)
+    scalar = predictor.predict(X[:50])
+    monkeypatch.setattr(compiled_predictor, "SCALAR_MAX_PAIRS", 0)
+    vectorized = predictor.predict(X[:50])
+
+    np.testing.assert_array_equal(scalar, vectorized)
+
+
+def test_unsupported_model_is_rejected() -> None:
+    """Models without a flat-array form raise ValueError."""
+    X, y = _data()
+
+    with pytest.raises(ValueError, match="Cannot compile KNeighborsRegressor"):
+        compile_model(get_model("knn").fit(X, y))
+
+
+def test_feature_count_is_checked() -> None:
+    """Inputs with the wrong number of features are refused."""
+    X, y = _data()
+    predictor = compile_model(get_model("ridge").fit(X, y))
+
+    with pytest.raises(ValueError, match="Expected 5 features"):
+        predictor.predict(X[:, :4])
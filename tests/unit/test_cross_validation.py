@@ -0,0 +1,63 @@
+"""Unit tests for cross_validation module."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.data_science_project.cross_validation import (
+    FoldCache,
+    fold_assignments,
+    fold_cache_key,
+    fold_split,
+    load_folds,
+    summarize_folds,
+)
+
+
+def test_fold_assignments_are_balanced_and_cover_every_row() -> None:
+    """Each row lands in exactly one fold; fold sizes differ by at most one."""
+    folds = fold_assignments(103, 5)
+
+    sizes = np.bincount(folds)
+    assert sizes.sum() == 103 and sizes.max() - sizes.min() <= 1
+    train_idx, test_idx = fold_split(folds, 2)
+    assert np.array_equal(
+        np.sort(np.concatenate([train_idx, test_idx])), np.arange(103)
+    )
+    with pytest.raises(ValueError):
+        fold_assignments(10, 1)
+
+
+def test_load_folds_keeps_existing_repeats_when_adding_more(tmp_path: Path) -> None:
+    """Stored repeats are reused; only the new ones are generated and saved."""
+    path = tmp_path / "folds.npz"
+
+    first = load_folds(path, 50, 5, repeats=1)
+    more = load_folds(path, 50, 5, repeats=3)
+
+    assert more.shape == (3, 50)
+    np.testing.assert_array_equal(more[0], first[0])
+    assert not np.array_equal(more[1], more[0])
+    with np.load(path) as f:
+        assert f["folds"].shape == (3, 50)
+
+
+def test_fold_cache_round_trip_and_key(tmp_path: Path) -> None:
+    """Keys differ by fold and params; stored metrics load back unchanged."""
+    cache = FoldCache(tmp_path)
+    key = fold_cache_key("data", np.array([0, 2]), "ridge", {"alpha": 1.0})
+
+    assert key != fold_cache_key("data", np.array([1, 2]), "ridge", {"alpha": 1.0})
+    assert key != fold_cache_key("data", np.array([0, 2]), "ridge", {"alpha": 2.0})
+    assert cache.load(key) is None
+    cache.store(key, {"test_r2": 0.5})
+    assert cache.load(key) == {"test_r2": 0.5}
+
+
+def test_summarize_folds_reports_mean_and_sample_std() -> None:
+    """Every metric gets a _mean and a ddof=1 _std."""
+    summary = summarize_folds([{"test_r2": 0.2}, {"test_r2": 0.4}])
+
+    assert summary["test_r2_mean"] == pytest.approx(0.3)
+    assert summary["test_r2_std"] == pytest.approx(np.std([0.2, 0.4], ddof=1))
@@ -0,0 +1,277 @@
+"""Unit tests for data_io module."""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_science_project.config_models import DataConfig
+from src.data_science_project.data_io import (
+    SplitWriter,
+    append_checkpoint,
+    binary_paths,
+    has_fresh_binary,
+    load_matrix,
+    load_split,
+    load_xy,
+    matrix_paths,
+    read_split,
+    rollback_append,
+    save_matrix,
+    save_split,
+)
+
+
+def test_binary_roundtrip(tmp_path: Path) -> None:
+    """Binary split loads back identical to the written frame."""
+    df = pd.DataFrame({"fixed acidity": [7.4, 7.8], "quality": [5, 6]})
+    csv_path = tmp_path / "train.csv"
+    save_split(df, csv_path)
+
+    assert has_fresh_binary(csv_path)
+    pd.testing.assert_frame_equal(load_split(csv_path), df)
+    assert list(load_split(csv_path, ["quality"]).columns) == ["quality"]
+
+
+def test_stale_binary_falls_back_to_csv(tmp_path: Path) -> None:
+    """Rewriting the CSV alone invalidates the binary copy."""
+    csv_path = tmp_path / "train.csv"
+    save_split(pd.DataFrame({"a": [1.0]}), csv_path)
+    pd.DataFrame({"a": [1.0, 2.0]}).to_csv(csv_path, index=False)
+
+    assert not has_fresh_binary(csv_path)
+    assert len(load_split(csv_path)) == 2
+
+
+def test_binary_survives_checkout_with_new_mtime(tmp_path: Path) -> None:
+    """A new mtime with the same content (dvc checkout, clone) keeps the binary."""
+    csv_path = tmp_path / "train.csv"
+    df = pd.DataFrame({"a": [1.0, 2.0], "y": [0, 1]})
+    save_split(df, csv_path)
+    config = DataConfig(target_column="y", feature_columns=["a"])
+    save_matrix(csv_path, config)
+    stat = csv_path.stat()
+
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert has_fresh_binary(csv_path)
+    assert isinstance(load_xy(csv_path, config)[0], np.memmap)
+
+    # Тот же размер, другое содержимое - формат устарел
+    csv_path.write_text(csv_path.read_text().replace("2.0", "3.0"))
+    assert not has_fresh_binary(csv_path)
+    assert load_xy(csv_path, config)[0].tolist() == [[1.0], [3.0]]
+
+
+def test_split_writer_matches_save_split(tmp_path: Path) -> None:
+    """Chunked writer produces the same CSV and binary data as save_split."""
+    df = pd.DataFrame({"x": [0.5, 1.5, 2.5, 3.5, 4.5], "quality": [5, 6, 5, 7, 6]})
+    save_split(df, tmp_path / "full.csv")
+
+    writer = SplitWriter(tmp_path / "chunked.csv")
+    for start in range(0, len(df), 2):
+        writer.append(df.iloc[start : start + 2])
+    writer.close()
+
+    assert (tmp_path / "full.csv").read_text() == (tmp_path / "chunked.csv").read_text()
+    assert has_fresh_binary(tmp_path / "chunked.csv")
+    pd.testing.assert_frame_equal(load_split(tmp_path / "chunked.csv"), df)
+
+
+def test_split_writer_appends_without_rewriting(tmp_path: Path) -> None:
+    """Appended rows land in a new .npz part and at the end of the matrix."""
+    df = pd.DataFrame({"x": np.arange(6) / 2, "quality": [5, 6, 5, 7, 6, 5]})
+    config = DataConfig(target_column="quality", feature_columns=["x"])
+    csv_path = tmp_path / "train.csv"
+    save_split(df.iloc[:4], csv_path)
+    save_matrix(csv_path, config)
+
+    writer = SplitWriter(csv_path, append=True, matrix_config=config)
+    writer.append(df.iloc[4:])
+    writer.close()
+
+    assert writer.matrix_updated
+    pd.testing.assert_frame_equal(load_split(csv_path), df)
+    pd.testing.assert_frame_equal(pd.read_csv(csv_path), df)
+    X, y = load_xy(csv_path, config)
+    assert isinstance(X, np.memmap)
+    assert X[:, 0].tolist() == df["x"].tolist()
+    assert y.tolist() == df["quality"].tolist()
+
+
+def test_rollback_restores_split_files_after_append(tmp_path: Path) -> None:
+    """Rolling back an append restores every split file byte for byte."""
+    df = pd.DataFrame({"x": np.arange(6) / 2, "quality": [5, 6, 5, 7, 6, 5]})
+    config = DataConfig(target_column="quality", feature_columns=["x"])
+    csv_path = tmp_path / "train.csv"
+    save_split(df.iloc[:4], csv_path)
+    save_matrix(csv_path, config)
+    paths = [csv_path, *binary_paths(csv_path), *matrix_paths(csv_path)]
+    before = {path: path.read_bytes() for path in paths}
+
+    checkpoint = append_checkpoint(csv_path)
+    for _ in range(2):
+        writer = SplitWriter(csv_path, append=True, matrix_config=config)
+        writer.append(df.iloc[4:])
+        writer.close()
+    rollback_append(csv_path, checkpoint)
+    rollback_append(csv_path, checkpoint)
+
+    assert {path: path.read_bytes() for path in paths} == before
+    pd.testing.assert_frame_equal(load_split(csv_path), df.iloc[:4])
+    assert load_xy(csv_path, config)[1].tolist() == [5, 6, 5, 7]
+
+
+def test_rollback_drops_matrix_removed_during_append(tmp_path: Path) -> None:
+    """A matrix deleted by the append is not half-restored by the rollback."""
+    config = DataConfig(target_column="quality", feature_columns=["x"])
+    csv_path = tmp_path / "train.csv"
+    save_split(pd.DataFrame({"x": [0.5], "quality": [5]}), csv_path)
+    save_matrix(csv_path, config)
+
+    checkpoint = append_checkpoint(csv_path)
+    writer = SplitWriter(csv_path, append=True, matrix_config=config)
+    writer.append(pd.DataFrame({"x": [1.5], "quality": [1000]}))
+    writer.close()
+    rollback_append(csv_path, checkpoint)
+
+    assert not any(path.exists() for path in matrix_paths(csv_path))
+    assert load_xy(csv_path, config)[1].tolist() == [5]
+
+
+def test_split_writer_drops_matrix_when_target_outgrows_dtype(
+    tmp_path: Path,
+) -> None:
+    """A target that no longer fits the stored int type removes the matrix."""
+    config = DataConfig(target_column="quality", feature_columns=["x"])
+    csv_path = tmp_path / "train.csv"
+    save_split(pd.DataFrame({"x": [0.5], "quality": [5]}), csv_path)
+    save_matrix(csv_path, config)
+
+    writer = SplitWriter(csv_path, append=True, matrix_config=config)
+    writer.append(pd.DataFrame({"x": [1.5], "quality": [1000]}))
+    writer.close()
+
+    assert not writer.matrix_updated
+    assert load_matrix(csv_path, config) is None
+    assert load_xy(csv_path, config)[1].tolist() == [5, 1000]
+
+
+def test_read_split_prunes_and_compacts(tmp_path: Path) -> None:
+    """Only configured columns are read, with compact dtypes."""
+    df = pd.DataFrame(
+        {
+            "alcohol": [9.4, 9.8],
+            "color": ["red", "white"],
+            "quality": [5, 6],
+            "Id": [0, 1],
+        }
+    )
+    csv_path = tmp_path / "train.csv"
+    df.to_csv(csv_path, index=False)
+    config = DataConfig(
+        target_column="quality",
+        feature_columns=["alcohol", "color"],
+        feature_dtype="float32",
+        categorical_columns=["color"],
+        category_levels={"color": ["red", "white"]},
+    )
+
+    result = read_split(csv_path, config)
+
+    assert list(result.columns) == ["alcohol", "color", "quality"]
+    assert result["alcohol"].dtype == "float32"
+    assert result["color"].tolist() == [0, 1]
+    assert result["quality"].dtype == "int8"
+
+
+def test_category_codes_agree_between_splits(tmp_path: Path) -> None:
+    """A category gets the same code in every split, whatever the split holds."""
+    config = DataConfig(
+        target_column="quality",
+        feature_columns=["color"],
+        categorical_columns=["color"],
+        category_levels={"color": ["red", "rose", "white"]},
+    )
+    splits = {
+        "train": ["white", "red", "rose"],
+        "test": ["white", "white", "orange"],
+    }
+    codes = {}
+    for name, colors in splits.items():
+        csv_path = tmp_path / f"{name}.csv"
+        pd.DataFrame({"color": colors, "quality": [5, 6, 7]}).to_csv(
+            csv_path, index=False
+        )
+        codes[name] = read_split(csv_path, config)["color"].tolist()
+
+    assert codes["train"] == [2, 0, 1]
+    # Неизвестная категория кодируется -1
+    assert codes["test"] == [2, 2, -1]
+
+
+def test_categorical_columns_require_levels() -> None:
+    """Without explicit levels, codes would depend on the split contents."""
+    with pytest.raises(ValueError, match="category_levels"):
+        DataConfig(
+            target_column="quality",
+            feature_columns=["color"],
+            categorical_columns=["color"],
+        )
+
+
+def test_matrix_is_read_only_memmap(tmp_path: Path) -> None:
+    """Saved feature matrix attaches as a read-only memmap."""
+    df = pd.DataFrame({"alcohol": [9.4, 9.8, 10.0], "pH": [3.5, 3.2, 3.3]})
+    df["quality"] = [5, 6, 7]
+    csv_path = tmp_path / "train.csv"
+    save_split(df, csv_path)
+    config = DataConfig(target_column="quality", feature_columns=["pH", "alcohol"])
+    save_matrix(csv_path, config)
+
+    X, y = load_xy(csv_path, config)
+
+    assert isinstance(X, np.memmap) and not X.flags.writeable
+    assert X.flags.c_contiguous and X.dtype == np.float32
+    np.testing.assert_allclose(X[:, 1], df["alcohol"], rtol=1e-6)
+    assert y.tolist() == [5, 6, 7]
+
+
+def test_matrix_is_rebuilt_for_new_target_dtype(tmp_path: Path) -> None:
+    """A matrix saved for another target_dtype is not reused."""
+    csv_path = tmp_path / "train.csv"
+    save_split(pd.DataFrame({"alcohol": [9.4, 9.8], "quality": [5, 6]}), csv_path)
+    config = DataConfig(target_column="quality", feature_columns=["alcohol"])
+    save_matrix(csv_path, config)
+
+    _, y = load_xy(csv_path, config.model_copy(update={"target_dtype": "float64"}))
+
+    assert not isinstance(y, np.memmap)
+    assert y.dtype == np.float64
+
+
+def test_matrix_from_csv_reads_file_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Without a fresh binary, the CSV is parsed once rather than per column."""
+    csv_path = tmp_path / "train.csv"
+    pd.DataFrame({"a": [1.0, 2.0], "b": [3.0, 4.0], "y": [0, 1]}).to_csv(
+        csv_path, index=False
+    )
+    config = DataConfig(target_column="y", feature_columns=["a", "b"])
+    reads = []
+    read_csv = pd.read_csv
+
+    def counting_read_csv(*args: object, **kwargs: object) -> pd.DataFrame:
+        reads.append(args)
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(pd, "read_csv", counting_read_csv)
+    save_matrix(csv_path, config)
+    monkeypatch.setattr(pd, "read_csv", read_csv)
+
+    X, y = load_xy(csv_path, config)
+    assert len(reads) == 1
+    np.testing.assert_array_equal(X, [[1.0, 3.0], [2.0, 4.0]])
+    assert y.tolist() == [0, 1]
@@ -0,0 +1,59 @@
+"""Unit tests for dataset_cache module."""
+
+from pathlib import Path
+
+import pytest
+
+from src.data_science_project import dataset_cache
+from src.data_science_project.config_models import DataConfig
+from src.data_science_project.dataset_cache import DatasetCache, dataset_cache_key
+
+
+def test_cache_key_depends_on_data_and_config(tmp_path: Path) -> None:
+    """Key changes with raw bytes and with DataConfig."""
+    raw = tmp_path / "raw.csv"
+    raw.write_text("a,b\n1,2\n")
+    config = DataConfig(target_column="b", feature_columns=["a"])
+
+    key = dataset_cache_key(raw, config)
+    assert key == dataset_cache_key(raw, config)
+    assert key != dataset_cache_key(raw, config.model_copy(update={"test_size": 0.3}))
+
+    raw.write_text("a,b\n1,3\n")
+    assert key != dataset_cache_key(raw, config)
+
+
+def test_output_format_change_misses_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Entries written before an output format change are not restored."""
+    raw = tmp_path / "raw.csv"
+    raw.write_text("a,b\n1,2\n")
+    config = DataConfig(target_column="b", feature_columns=["a"])
+    cache = DatasetCache(tmp_path / "cache")
+    stats = tmp_path / "data_stats.json"
+    stats.write_text("{}")
+    cache.store(dataset_cache_key(raw, config), {"data_stats.json": stats})
+
+    monkeypatch.setattr(dataset_cache, "CACHE_VERSION", dataset_cache.CACHE_VERSION + 1)
+
+    assert not cache.has(dataset_cache_key(raw, config))
+
+
+def test_restore_preserves_mtime_and_drops_stale(tmp_path: Path) -> None:
+    """Restored files keep mtime; targets absent from the entry are removed."""
+    cache = DatasetCache(tmp_path / "cache")
+    train = tmp_path / "train.csv"
+    train.write_text("a\n1\n")
+    stale = tmp_path / "train.npz"
+    cache.store("k", {"train.csv": train, "train.npz": stale})
+
+    mtime = train.stat().st_mtime_ns
+    train.write_text("changed\n")
+    stale.write_text("stale")
+
+    assert cache.restore("k", {"train.csv": train, "train.npz": stale})
+    assert train.read_text() == "a\n1\n"
+    assert train.stat().st_mtime_ns == mtime
+    assert not stale.exists()
+    assert not cache.restore("missing", {"train.csv": train})
@@ -0,0 +1,65 @@
+"""Unit tests for fit_cache module."""
+
+from pathlib import Path
+
+import numpy as np
+
+from src.data_science_project.fit_cache import FitCache, array_digest, fit_cache_key
+from src.data_science_project.model_registry import get_model
+
+
+def _data() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(50, 3))
+    return X, X @ np.array([1.0, -1.0, 0.5])
+
+
+def test_key_depends_on_data_and_effective_params() -> None:
+    """Explicit defaults and n_jobs do not change the key; data and params do."""
+    X, y = _data()
+    digest = array_digest(X, y)
+
+    key = fit_cache_key(digest, get_model("ridge"))
+    assert key == fit_cache_key(digest, get_model("ridge", {"alpha": 1.0}))
+    assert fit_cache_key(digest, get_model("rf")) == fit_cache_key(
+        digest, get_model("rf", {"n_jobs": 8})
+    )
+    assert key != fit_cache_key(digest, get_model("ridge", {"alpha": 2.0}))
+    assert key != fit_cache_key(digest, get_model("lasso"))
+    assert key != fit_cache_key(array_digest(X, y + 1), get_model("ridge"))
+
+
+def test_fit_hits_after_miss_and_counts_saved_time(tmp_path: Path) -> None:
+    """Second fit is served from disk; a corrupted entry is a miss."""
+    X, y = _data()
+    cache = FitCache(tmp_path)
+
+    fitted, hit = cache.fit(get_model("ridge"), X, y)
+    assert not hit
+    cached, hit = cache.fit(get_model("ridge"), X, y)
+    assert hit
+    np.testing.assert_array_equal(cached.predict(X), fitted.predict(X))
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    assert cache.saved_seconds > 0
+
+    for path in tmp_path.glob("*.pkl"):
+        path.write_bytes(b"broken")
+    _, hit = cache.fit(get_model("ridge"), X, y)
+    assert not hit
+
+
+def test_fit_group_shares_entries_with_single_fits(tmp_path: Path) -> None:
+    """A group is a hit only when every member is cached, under per-model keys."""
+    X, y = _data()
+    digest = array_digest(X, y)
+    cache = FitCache(tmp_path)
+    models = [get_model("ridge", {"alpha": alpha}) for alpha in (0.1, 1.0)]
+
+    cache.fit(get_model("ridge", {"alpha": 0.1}), X, y, digest)
+    _, hit = cache.fit_group(models, lambda: [m.fit(X, y) for m in models], digest)
+    assert not hit
+
+    _, hit = cache.fit_group(models, lambda: [], digest)
+    assert hit
+    _, hit = cache.fit(get_model("ridge", {"alpha": 1.0}), X, y, digest)
+    assert hit
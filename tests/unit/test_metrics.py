@@ -0,0 +1,91 @@
+"""Unit tests for metrics module."""
+
+import numpy as np
+import pytest
+from sklearn.metrics import (
+    max_error,
+    mean_absolute_error,
+    mean_squared_error,
+    r2_score,
+)
+
+from src.data_science_project.metrics import (
+    REGRESSION_METRICS,
+    regression_metrics,
+    regression_metrics_batch,
+)
+
+
+@pytest.fixture
+def targets() -> np.ndarray:
+    """Regression targets."""
+    return np.random.default_rng(0).normal(5.0, 2.0, size=200)
+
+
+def test_regression_metrics_match_sklearn(targets: np.ndarray) -> None:
+    """Each metric agrees with its scikit-learn counterpart."""
+    y_pred = targets + np.random.default_rng(1).normal(0.0, 0.5, size=len(targets))
+
+    metrics = regression_metrics(targets, y_pred)
+
+    assert tuple(metrics) == REGRESSION_METRICS
+    assert metrics["mse"] == pytest.approx(mean_squared_error(targets, y_pred))
+    assert metrics["rmse"] == pytest.approx(mean_squared_error(targets, y_pred) ** 0.5)
+    assert metrics["mae"] == pytest.approx(mean_absolute_error(targets, y_pred))
+    assert metrics["r2"] == pytest.approx(r2_score(targets, y_pred))
+    assert metrics["max_error"] == pytest.approx(max_error(targets, y_pred))
+    assert all(isinstance(value, float) for value in metrics.values())
+
+
+def test_batch_matches_per_model_calls(targets: np.ndarray) -> None:
+    """A models x rows matrix gives the same metrics as one call per model."""
+    noise = np.random.default_rng(2).normal(size=(8, len(targets)))
+    y_pred = targets + noise * np.linspace(0.1, 3.0, 8)[:, None]
+
+    batch = regression_metrics_batch(targets, y_pred)
+
+    for i, row in enumerate(y_pred):
+        single = regression_metrics(targets, row)
+        for name in REGRESSION_METRICS:
+            assert batch[name].shape == (8,)
+            assert batch[name][i] == pytest.approx(single[name])
+
+
+def test_batch_broadcasts_bootstrap_targets(targets: np.ndarray) -> None:
+    """Resampled targets and predictions are scored sample by sample."""
+    y_pred = targets + 0.3
+    resamples = np.random.default_rng(3).integers(0, len(targets), size=(5, 50))
+
+    batch = regression_metrics_batch(targets[resamples], y_pred[resamples])
+
+    expected = [r2_score(targets[idx], y_pred[idx]) for idx in resamples]
+    np.testing.assert_allclose(batch["r2"], expected)
+
+
+def test_constant_target_r2_follows_sklearn() -> None:
+    """Constant targets give R² 1 for an exact fit and 0 otherwise."""
+    y_true = np.full(10, 3.0)
+
+    batch = regression_metrics_batch(y_true, np.vstack([y_true, y_true + 1.0]))
+
+    np.testing.assert_array_equal(batch["r2"], [1.0, 0.0])
+
+
+@pytest.mark.parametrize(
+    ("y_true", "y_pred"),
+    [
+        (np.zeros(10), np.zeros(9)),
+        (np.zeros(10), np.zeros((3, 9))),
+        (np.zeros(0), np.zeros(0)),
+    ],
+)
+def test_incompatible_shapes_raise(y_true: np.ndarray, y_pred: np.ndarray) -> None:
+    """Row counts must agree and be non-empty."""
+    with pytest.raises(ValueError, match="Incompatible shapes"):
+        regression_metrics_batch(y_true, y_pred)
+
+
+def test_single_model_requires_1d_predictions(targets: np.ndarray) -> None:
+    """The scalar form refuses a prediction matrix."""
+    with pytest.raises(ValueError, match="1-D"):
+        regression_metrics(targets, np.vstack([targets, targets]))
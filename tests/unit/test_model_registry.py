@@ -0,0 +1,25 @@
+"""Unit tests for model_registry module."""
+
+import pytest
+from pydantic import ValidationError
+
+from src.data_science_project.config_models import ModelConfig
+from src.data_science_project.model_registry import MODEL_TYPES, get_model
+
+
+def test_registry_covers_model_config_types() -> None:
+    """Every ModelConfig.model_type has a registered estimator."""
+    literal = ModelConfig.model_fields["model_type"].annotation
+    assert set(MODEL_TYPES) == set(literal.__args__)
+
+
+def test_get_model_validates_and_coerces_params() -> None:
+    """Params go through the pydantic models; random_state defaults to 42."""
+    model = get_model("rf", {"n_estimators": "10", "max_depth": 3})
+
+    assert model.get_params()["n_estimators"] == 10
+    assert model.get_params()["random_state"] == 42
+    with pytest.raises(ValidationError):
+        get_model("ridge", {"alpha": -1.0})
+    with pytest.raises(ValueError, match="Unknown model type"):
+        get_model("xgb")
@@ -0,0 +1,93 @@
+"""Unit tests for model_store module."""
+
+import pickle  # nosec B403
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.data_science_project.model_registry import get_model
+from src.data_science_project.model_store import (
+    MODEL_CODECS,
+    MODEL_FORMAT_VERSION,
+    load_model,
+    save_model,
+)
+
+
+def _data() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 4))
+    return X, X @ np.array([1.0, -1.0, 0.5, 2.0])
+
+
+@pytest.mark.parametrize("codec", MODEL_CODECS)
+@pytest.mark.parametrize("model_type", ["ridge", "rf"])
+def test_round_trip_preserves_predictions_and_format(
+    tmp_path: Path, codec: str, model_type: str
+) -> None:
+    """Every codec restores the model and the recorded format metadata."""
+    X, y = _data()
+    model = get_model(model_type, {"n_estimators": 5} if model_type == "rf" else {})
+    model.fit(X, y)
+    path = tmp_path / "model.pkl"
+
+    saved = save_model(model, path, codec)
+    loaded, meta = load_model(path)
+
+    np.testing.assert_array_equal(loaded.predict(X), model.predict(X))
+    assert saved["size_bytes"] == path.stat().st_size
+    assert meta == {key: value for key, value in saved.items() if key != "size_bytes"}
+    assert meta["codec"] == codec
+    assert meta["format_version"] == MODEL_FORMAT_VERSION
+    assert meta["model_class"].endswith(type(model).__name__)
+
+
+def test_joblib_memory_maps_arrays_read_only(tmp_path: Path) -> None:
+    """With mmap the fitted arrays stay on disk; without it they are copied."""
+    X, y = _data()
+    path = tmp_path / "model.pkl"
+    save_model(get_model("ridge").fit(X, y), path, "joblib")
+
+    mapped, _ = load_model(path)
+    copied, _ = load_model(path, mmap=False)
+
+    assert isinstance(mapped.coef_, np.memmap)
+    assert not mapped.coef_.flags.writeable
+    assert not isinstance(copied.coef_, np.memmap)
+
+
+def test_compression_shrinks_forest(tmp_path: Path) -> None:
+    """Compressed codecs write smaller files than raw pickle for a forest."""
+    X, y = _data()
+    model = get_model("rf", {"n_estimators": 10}).fit(X, y)
+
+    sizes = {
+        codec: save_model(model, tmp_path / f"{codec}.pkl", codec)["size_bytes"]
+        for codec in ("raw", "zlib", "lzma")
+    }
+
+    assert sizes["zlib"] < sizes["raw"]
+    assert sizes["lzma"] < sizes["raw"]
+
+
+def test_loads_plain_pickle(tmp_path: Path) -> None:
+    """Models written with pickle.dump before the store still load."""
+    X, y = _data()
+    model = get_model("ridge").fit(X, y)
+    path = tmp_path / "model.pkl"
+    with open(path, "wb") as f:
+        pickle.dump(model, f)  # nosec B301
+
+    loaded, meta = load_model(path)
+
+    np.testing.assert_array_equal(loaded.predict(X), model.predict(X))
+    assert meta == {"codec": "pickle"}
+
+
+def test_unknown_codec_is_rejected(tmp_path: Path) -> None:
+    """Codecs outside MODEL_CODECS raise before anything is written."""
+    with pytest.raises(ValueError, match="Unknown codec"):
+        save_model(get_model("ridge"), tmp_path / "model.pkl", "bz2")
+
+    assert not (tmp_path / "model.pkl").exists()
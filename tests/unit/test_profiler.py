@@ -0,0 +1,61 @@
+"""Unit tests for profiler module."""
+
+import numpy as np
+import pandas as pd
+
+from src.data_science_project.profiler import ColumnProfiler
+
+
+def test_chunked_profile_matches_single_pass() -> None:
+    """Merging chunk profiles gives the same report as one pass over all rows."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"x": rng.normal(10.0, 2.0, 5000), "y": rng.integers(3, 9, 5000)})
+    df.loc[::50, "x"] = np.nan
+
+    full = ColumnProfiler(["x", "y"])
+    full.update_frame(df)
+    chunked = ColumnProfiler(["x", "y"])
+    for start in range(0, len(df), 700):
+        part = ColumnProfiler(["x", "y"])
+        part.update_frame(df.iloc[start : start + 700])
+        chunked.merge(ColumnProfiler.from_state_dict(part.state_dict()))
+
+    report = full.to_dict()
+    assert chunked.to_dict() == report
+    assert report["x"]["nulls"] == 100
+    assert abs(report["x"]["mean"] - df["x"].mean()) < 1e-8
+    assert abs(report["x"]["quantiles"]["0.5"] - df["x"].median()) < 0.02
+    assert sum(report["y"]["histogram"]["counts"]) == len(df)
+
+
+def test_single_row_and_constant_chunks() -> None:
+    """A one-row chunk and a constant column get finite bins and exact stats."""
+    df = pd.DataFrame({"x": [5.0, 5.0, 5.0], "y": [0.0, 0.0, 0.0], "z": [1e12] * 3})
+
+    single = ColumnProfiler(["x", "y", "z"])
+    single.update_frame(df.iloc[:1])
+    constant = ColumnProfiler(["x", "y", "z"])
+    constant.update_frame(df)
+
+    for profiler, rows in ((single, 1), (constant, 3)):
+        report = profiler.to_dict()
+        for column, value in (("x", 5.0), ("y", 0.0), ("z", 1e12)):
+            assert report[column]["count"] == rows
+            assert report[column]["min"] == report[column]["max"] == value
+            assert set(report[column]["quantiles"].values()) == {value}
+            assert sum(report[column]["histogram"]["counts"]) == rows
+
+
+def test_constant_chunk_merges_with_varying_chunk() -> None:
+    """Merging a constant chunk into a varying one matches a single pass."""
+    rng = np.random.default_rng(1)
+    varying = pd.DataFrame({"x": rng.normal(10.0, 2.0, 500), "y": rng.normal(size=500)})
+    constant = pd.DataFrame({"x": [10.0] * 20, "y": [0.0] * 20})
+
+    full = ColumnProfiler(["x", "y"])
+    full.update_frame(pd.concat([varying, constant]))
+    chunked = ColumnProfiler(["x", "y"])
+    for part in (constant, varying):
+        chunked.update_frame(part)
+
+    assert chunked.to_dict() == full.to_dict()
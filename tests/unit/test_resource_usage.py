@@ -0,0 +1,49 @@
+"""Unit tests for resource_usage module."""
+
+import time
+
+import pytest
+
+from src.data_science_project.resource_usage import UsageMeter, peak_rss_mb
+
+
+def test_phases_accumulate_wall_and_cpu_time() -> None:
+    """Repeated phases add up; busy work shows up as CPU time."""
+    usage = UsageMeter()
+
+    with usage.phase("fit"):
+        sum(i * i for i in range(200_000))
+    with usage.phase("predict"):
+        time.sleep(0.01)
+    with usage.phase("predict"):
+        time.sleep(0.01)
+
+    assert usage.wall["predict"] >= 0.02
+    assert usage.cpu_seconds > 0
+
+
+def test_summary_reports_latency_size_and_peak_memory() -> None:
+    """Per-row latency is predict time over rows; absent phases are omitted."""
+    usage = UsageMeter()
+    usage.wall["predict"] = 0.5
+
+    summary = usage.summary(predict_rows=1000, model_size=123)
+
+    assert "fit_seconds" not in summary
+    assert summary["predict_latency_us"] == pytest.approx(500.0)
+    assert summary["model_size_bytes"] == 123
+    if peak_rss_mb() is not None:
+        assert summary["peak_rss_mb"] > 0
+
+
+def test_split_shares_joint_cost_between_models() -> None:
+    """A jointly fitted group charges each model an equal share."""
+    usage = UsageMeter()
+    usage.wall["fit"] = 3.0
+    usage.cpu_seconds = 6.0
+
+    share = usage.split(3)
+
+    assert share.wall == {"fit": 1.0}
+    assert share.cpu_seconds == 2.0
+    assert usage.wall == {"fit": 3.0}
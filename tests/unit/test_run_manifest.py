@@ -0,0 +1,45 @@
+"""Unit tests for run_manifest module."""
+
+from pathlib import Path
+
+from src.data_science_project.run_manifest import RunManifest, config_hash
+
+
+def test_config_hash_depends_on_params_and_data_not_key_order() -> None:
+    """Reordered params give the same hash; other params or data do not."""
+    exp = {"id": "a", "model": "rf", "params": {"n_estimators": 10, "max_depth": 3}}
+    reordered = {**exp, "params": {"max_depth": 3, "n_estimators": 10}}
+
+    assert config_hash(exp, "d1") == config_hash(reordered, "d1")
+    assert config_hash(exp, "d1") != config_hash(exp, "d2")
+    assert config_hash(exp, "d1") != config_hash(
+        {**exp, "params": {"n_estimators": 20, "max_depth": 3}}, "d1"
+    )
+
+
+def test_torn_last_line_is_skipped_and_next_append_survives(tmp_path: Path) -> None:
+    """A record cut short by a crash does not corrupt records appended later."""
+    manifest = RunManifest(tmp_path / "manifest.jsonl")
+    manifest.record("a", "completed", "h1")
+    with open(manifest.path, "a") as f:
+        f.write('{"id": "b", "stat')
+
+    manifest.record("c", "failed", "h3")
+
+    assert [record["id"] for record in manifest.records()] == ["a", "c"]
+
+
+def test_completed_requires_same_config_and_intact_artifacts(tmp_path: Path) -> None:
+    """Only the latest completed record with unchanged artifacts counts."""
+    manifest = RunManifest(tmp_path / "manifest.jsonl")
+    artifacts = {}
+    for exp_id in ("a", "b", "c", "d"):
+        artifacts[exp_id] = tmp_path / f"{exp_id}_metrics.json"
+        artifacts[exp_id].write_text("{}")
+        manifest.record(exp_id, "completed", "h", [artifacts[exp_id]])
+    manifest.record("d", "failed", "h")
+    artifacts["c"].write_text('{"test_r2": 0.1}')
+
+    done = manifest.completed({"a": "h", "b": "other", "c": "h", "d": "h", "e": "h"})
+
+    assert done == {"a"}
@@ -0,0 +1,64 @@
+"""Unit tests for splitting module."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data_science_project.splitting import (
+    RowHashIndex,
+    hash_test_mask,
+    key_hashes,
+)
+
+
+def test_hash_split_is_stable_under_appends() -> None:
+    """A row's side depends only on its key, not on the other rows."""
+    df = pd.DataFrame({"Id": np.arange(1000), "x": np.linspace(0.0, 1.0, 1000)})
+    mask_full = hash_test_mask(key_hashes(df, "Id"), 0.2, 42)
+    mask_head = hash_test_mask(key_hashes(df.iloc[:600], "Id"), 0.2, 42)
+
+    assert np.array_equal(mask_full[:600], mask_head)
+    assert 0.15 < mask_full.mean() < 0.25
+
+
+def test_key_hash_ignores_inferred_dtype() -> None:
+    """Int and float representations of the same key hash identically."""
+    ints = pd.DataFrame({"Id": [1, 2, 3]})
+    floats = pd.DataFrame({"Id": [1.0, 2.0, 3.0]})
+
+    assert np.array_equal(key_hashes(ints, "Id"), key_hashes(floats, "Id"))
+
+
+def test_row_hash_index_grows_and_persists(tmp_path: Path) -> None:
+    """The on-disk set keeps every hash through growth and reopening."""
+    rng = np.random.default_rng(0)
+    hashes = rng.integers(0, 2**63, size=5000, dtype=np.uint64)
+    hashes[0] = 0
+    path = tmp_path / "row_hashes.bin"
+
+    index = RowHashIndex.create(path, hashes[:100])
+    for start in range(100, 4000, 650):
+        index.add(hashes[start : start + 650])
+    index.add(hashes[:50])
+    index.flush()
+    reopened = RowHashIndex(path)
+
+    assert len(reopened) == 4000
+    assert reopened.contains(hashes[:4000]).all()
+    assert not reopened.contains(hashes[4000:]).any()
+
+
+def test_row_hash_index_discard_keeps_other_hashes(tmp_path: Path) -> None:
+    """Discarded hashes leave the set; the rest stay findable."""
+    rng = np.random.default_rng(1)
+    hashes = rng.integers(0, 2**63, size=3000, dtype=np.uint64)
+    index = RowHashIndex.create(tmp_path / "row_hashes.bin", hashes[:1000])
+    index.add(hashes[1000:])
+
+    index.discard(hashes[1000:])
+    reopened = RowHashIndex(tmp_path / "row_hashes.bin")
+
+    assert len(reopened) == 1000
+    assert reopened.contains(hashes[:1000]).all()
+    assert not reopened.contains(hashes[1000:]).any()
@@ -0,0 +1,123 @@
+"""Unit tests for sweeps module."""
+
+import numpy as np
+import pytest
+
+from src.data_science_project.model_registry import get_model
+from src.data_science_project.sweeps import (
+    fit_ensemble_prefixes,
+    fit_neighbor_sweep,
+    fit_regularization_path,
+    plan_sweeps,
+    predict_neighbor_sweep,
+)
+
+
+def test_plan_sweeps_groups_by_params_except_swept_one() -> None:
+    """Only experiments differing solely in the swept parameter share a group."""
+    experiments = [
+        {"id": "a", "model": "rf", "params": {"n_estimators": 50, "max_depth": 10}},
+        {"id": "b", "model": "ridge", "params": {"alpha": 1.0}},
+        {"id": "c", "model": "rf", "params": {"max_depth": 10, "n_estimators": 100}},
+        {"id": "d", "model": "rf", "params": {"n_estimators": 100, "max_depth": 5}},
+        {"id": "e", "model": "ridge", "params": {"alpha": 10.0}},
+    ]
+
+    groups = [[exp["id"] for exp in group] for group in plan_sweeps(experiments)]
+
+    assert groups == [["a", "c"], ["b", "e"], ["d"]]
+
+
+def _regression_data() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)
+    X = rng.normal(loc=3.0, size=(200, 4))
+    y = X @ np.array([1.0, -2.0, 0.5, 0.0]) + rng.normal(scale=0.1, size=200)
+    return X, y
+
+
+@pytest.mark.parametrize("model_type", ["rf", "ada", "gb"])
+def test_ensemble_prefixes_match_independent_fits(model_type: str) -> None:
+    """A prefix of the largest ensemble predicts exactly like a fresh fit."""
+    X, y = _regression_data()
+    sizes = [5, 20, 10]
+
+    models = fit_ensemble_prefixes(get_model(model_type), sizes, X, y)
+
+    for size, model in zip(sizes, models, strict=True):
+        fresh = get_model(model_type, {"n_estimators": size}).fit(X, y)
+        assert model.get_params()["n_estimators"] == size
+        np.testing.assert_array_equal(model.predict(X), fresh.predict(X))
+
+
+def test_ensemble_prefixes_keep_early_stopped_boosting() -> None:
+    """AdaBoost that stopped early serves larger sizes like a fresh fit does."""
+    X, _ = _regression_data()
+    y = (X[:, 0] > 3.0).astype(float)
+    sizes = [1, 5, 10]
+
+    models = fit_ensemble_prefixes(get_model("ada"), sizes, X, y)
+
+    assert len(models[-1].estimators_) < 5
+    for size, model in zip(sizes, models, strict=True):
+        fresh = get_model("ada", {"n_estimators": size}).fit(X, y)
+        assert len(model.estimators_) == len(fresh.estimators_)
+        np.testing.assert_array_equal(
+            model.estimator_weights_, fresh.estimator_weights_
+        )
+        np.testing.assert_array_equal(model.predict(X), fresh.predict(X))
+
+
+@pytest.mark.parametrize(
+    ("model_type", "params"),
+    [("ridge", {}), ("lasso", {"tol": 1e-10}), ("elasticnet", {"tol": 1e-10})],
+)
+def test_regularization_path_matches_independent_fits(
+    model_type: str, params: dict[str, float]
+) -> None:
+    """Every alpha on the path matches a fresh fit of the same estimator."""
+    X, y = _regression_data()
+    alphas = [1.0, 0.01, 10.0, 0.1]
+
+    models = fit_regularization_path(
+        model_type, get_model(model_type, params), alphas, X, y
+    )
+
+    for alpha, model in zip(alphas, models, strict=True):
+        fresh = get_model(model_type, {**params, "alpha": alpha}).fit(X, y)
+        assert model.get_params()["alpha"] == alpha
+        np.testing.assert_allclose(model.coef_, fresh.coef_, atol=1e-6)
+        np.testing.assert_allclose(model.predict(X), fresh.predict(X), atol=1e-6)
+
+
+@pytest.mark.parametrize("weights", ["uniform", "distance"])
+def test_neighbor_sweep_matches_independent_predictions(weights: str) -> None:
+    """One k_max query reproduces predict of every k, exact matches included."""
+    X, y = _regression_data()
+    X_query = np.vstack([X[:10], X[:10] + 0.05])
+    ks = [1, 7, 3]
+
+    models = fit_neighbor_sweep(get_model("knn", {"weights": weights}), ks, X, y)
+    predictions = predict_neighbor_sweep(models, X_query, y)
+
+    for k, model, predicted in zip(ks, models, predictions, strict=True):
+        fresh = get_model("knn", {"n_neighbors": k, "weights": weights}).fit(X, y)
+        assert model.get_params()["n_neighbors"] == k
+        np.testing.assert_allclose(predicted, fresh.predict(X_query), rtol=1e-12)
+
+
+def test_neighbor_sweep_predicts_callable_weights_per_model() -> None:
+    """A custom weight function is not mistaken for distance weighting."""
+    from sklearn.neighbors import KNeighborsRegressor
+
+    X, y = _regression_data()
+    ks = [2, 6]
+
+    def weights(distances: np.ndarray) -> np.ndarray:
+        return np.exp(-distances)
+
+    models = fit_neighbor_sweep(KNeighborsRegressor(weights=weights), ks, X, y)
+    predictions = predict_neighbor_sweep(models, X[:20], y)
+
+    for k, predicted in zip(ks, predictions, strict=True):
+        fresh = KNeighborsRegressor(n_neighbors=k, weights=weights).fit(X, y)
+        np.testing.assert_allclose(predicted, fresh.predict(X[:20]), rtol=1e-12)
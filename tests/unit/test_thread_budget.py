@@ -0,0 +1,52 @@
+"""Unit tests for thread_budget module."""
+
+import pytest
+
+from src.data_science_project.model_registry import get_model
+from src.data_science_project.thread_budget import (
+    limit_threads,
+    plan_threads,
+    set_n_jobs,
+)
+
+
+@pytest.mark.parametrize(
+    ("n_tasks", "jobs", "expected"),
+    [
+        (26, None, {"cores": 32, "workers": 26, "threads_per_fit": 1}),
+        (8, None, {"cores": 32, "workers": 8, "threads_per_fit": 4}),
+        (26, 4, {"cores": 32, "workers": 4, "threads_per_fit": 8}),
+        (1, None, {"cores": 32, "workers": 1, "threads_per_fit": 32}),
+        (0, None, {"cores": 32, "workers": 1, "threads_per_fit": 32}),
+    ],
+)
+def test_plan_threads_never_oversubscribes(
+    n_tasks: int, jobs: int | None, expected: dict[str, int]
+) -> None:
+    """Workers times threads per fit stays within the core count."""
+    budget = plan_threads(n_tasks, jobs, cores=32)
+
+    assert budget == expected
+    assert budget["workers"] * budget["threads_per_fit"] <= 32
+
+
+def test_plan_threads_clamps_explicit_jobs_to_cores() -> None:
+    """More processes than cores are not started; the caller is warned."""
+    with pytest.warns(UserWarning, match="jobs=64"):
+        budget = plan_threads(100, 64, cores=32)
+
+    assert budget == {"cores": 32, "workers": 32, "threads_per_fit": 1}
+
+
+def test_set_n_jobs_only_touches_models_with_n_jobs() -> None:
+    """Models without n_jobs are left unchanged."""
+    assert set_n_jobs(get_model("rf"), 4).get_params()["n_jobs"] == 4
+    assert "n_jobs" not in set_n_jobs(get_model("ridge"), 4).get_params()
+
+
+def test_limit_threads_caps_blas_pools_inside_context() -> None:
+    """Every detected BLAS/OpenMP pool is capped inside the block."""
+    from threadpoolctl import threadpool_info
+
+    with limit_threads(1):
+        assert all(pool["num_threads"] == 1 for pool in threadpool_info())
@@ -0,0 +1,138 @@
+"""Unit tests for validation module."""
+
+from pathlib import Path
+
+import pandas as pd
+
+from src.data_science_project.config_models import DataConfig
+from src.data_science_project.validation import (
+    RuleEngine,
+    validate_chunks,
+    validate_frame,
+    validation_cache_key,
+)
+
+
+def _config() -> DataConfig:
+    return DataConfig(
+        target_column="quality",
+        feature_columns=["pH", "alcohol"],
+        validation={
+            "columns": {
+                "pH": {"min": 0, "max": 14, "nullable": False},
+                "alcohol": {"dtype": "float"},
+                "quality": {"dtype": "int"},
+            },
+            "allowed_target_values": [5, 6, 7],
+            "unique_columns": ["Id"],
+            "max_duplicate_ratio": 0.2,
+        },
+    )
+
+
+def test_rules_report_violation_counts() -> None:
+    """Each rule reports how many rows violate it."""
+    df = pd.DataFrame(
+        {
+            "Id": [0, 1, 1, 3, 0],
+            "pH": [3.2, 15.0, None, 3.3, 3.2],
+            "alcohol": ["9.4", "x", "10.1", "9.8", "9.4"],
+            "quality": [5, 6.5, 9, 6, 5],
+        }
+    )
+
+    report = validate_frame(df, _config())
+    violations = {rule["name"]: rule["violations"] for rule in report["rules"]}
+
+    assert violations == {
+        "dtype:alcohol": 1,
+        "dtype:quality": 1,
+        "nulls:pH": 1,
+        "range:pH": 1,
+        "allowed:quality": 2,
+        "unique:Id": 2,
+        "duplicates": 1,
+    }
+    assert report["n_failed"] == 6 and not report["passed"]
+
+
+def test_chunked_updates_match_single_pass() -> None:
+    """Feeding chunks accumulates the same counts, including cross-chunk keys."""
+    df = pd.DataFrame(
+        {
+            "Id": [0, 1, 2, 0],
+            "pH": [3.2, 20.0, 3.1, 3.2],
+            "alcohol": [9.4, 9.5, 9.6, 9.4],
+            "quality": [5, 6, 7, 5],
+        }
+    )
+    engine = RuleEngine(_config())
+    engine.update(df.iloc[:2])
+    engine.update(df.iloc[2:])
+
+    assert engine.report()["rules"] == validate_frame(df, _config())["rules"]
+
+
+def test_repeats_are_counted_on_disk_and_cleaned_up(tmp_path: Path) -> None:
+    """Repeats within and across chunks are counted; temp indexes are removed."""
+    df = pd.DataFrame(
+        {
+            "Id": [0, 0, 1, 2, 1, 0],
+            "pH": [3.2, 3.2, 3.1, 3.0, 3.1, 3.2],
+            "alcohol": [9.4] * 6,
+            "quality": [5] * 6,
+        }
+    )
+
+    report = validate_chunks(
+        (df.iloc[start : start + 2] for start in range(0, 6, 2)),
+        _config(),
+        hash_dir=tmp_path,
+    )
+
+    rules = {rule["name"]: rule for rule in report["rules"]}
+    assert rules["unique:Id"]["violations"] == 3
+    assert rules["duplicates"]["violations"] == 3
+    assert report["duplicate_ratio"] == 0.5
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_streaming_stops_at_first_hard_violation() -> None:
+    """Fail-fast mode stops reading and reports offending row offsets."""
+    df = pd.DataFrame(
+        {
+            "Id": range(6),
+            "pH": [3.2, 3.3, 3.1, -1.0, 3.0, 99.0],
+            "alcohol": [9.4] * 6,
+            "quality": [5] * 6,
+        }
+    )
+    read = []
+
+    def chunks():
+        for start in range(0, len(df), 2):
+            read.append(start)
+            yield df.iloc[start : start + 2]
+
+    report = validate_chunks(chunks(), _config())
+
+    assert report["stopped_early"]
+    assert report["first_violation"] == {"rule": "range:pH", "offsets": [3]}
+    assert read == [0, 2] and report["rows"] == 4
+
+
+def test_validation_cache_key_tracks_data_and_rules(tmp_path: Path) -> None:
+    """The key changes with split content and with the rules, not with mtime."""
+    split = tmp_path / "train.csv"
+    split.write_text("pH\n3.2\n")
+    key = validation_cache_key([split], _config())
+
+    split.touch()
+    assert validation_cache_key([split], _config()) == key
+
+    stricter = _config()
+    stricter.validation.columns["pH"].max = 7
+    assert validation_cache_key([split], stricter) != key
+
+    split.write_text("pH\n3.3\n")
+    assert validation_cache_key([split], _config()) != key